@@ -10,6 +10,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
 from app.db.base import Base
 from app.core.config import settings
+from app.db.partitions import PARTITIONED_TABLES, default_partition_name, partition_month
 # Import all models so Alembic can detect them
 from app.models import *
 
@@ -24,6 +25,17 @@ if config.config_file_name is not None:
 target_metadata = Base.metadata
 
 
+def include_object(object, name, type_, reflected, compare_to):
+    """Leave partitions of partitioned tables out of autogenerate; maintain_partitions owns them"""
+    if type_ == "table" and reflected and compare_to is None:
+        for table in PARTITIONED_TABLES:
+            if name == default_partition_name(table) or (
+                name.startswith(f"{table}_") and partition_month(name) is not None
+            ):
+                return False
+    return True
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode."""
     url = config.get_main_option("sqlalchemy.url")
@@ -32,6 +44,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -48,7 +61,7 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata, include_object=include_object
         )
 
         with context.begin_transaction():
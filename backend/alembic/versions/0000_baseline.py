@@ -0,0 +1,456 @@
+"""baseline schema
+
+Revision ID: 0000_baseline
+Revises:
+Create Date: 2026-10-17 08:00:00.000000
+
+The schema as it stood before the first tracked migration, so a fresh database can
+be built with `alembic upgrade head`. Databases created before this revision already
+have these tables and are upgraded from 0001 as before.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0000_baseline'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+ENUM_TYPES = [
+    'bookingstatus',
+    'checkinmethod',
+    'classstatus',
+    'difficultylevel',
+    'durationtype',
+    'equipmentstatus',
+    'gender',
+    'invoicestatus',
+    'leadsource',
+    'leadstatus',
+    'membershipstatus',
+    'memberstatus',
+    'notificationstatus',
+    'notificationtype',
+    'paymentmethod',
+    'paymentstatus',
+    'subscriptionstatus',
+    'userrole',
+]
+
+
+def upgrade() -> None:
+    op.create_table(
+        'organizations',
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('slug', sa.String(length=100), nullable=False),
+        sa.Column('logo_url', sa.String(length=500), nullable=True),
+        sa.Column('primary_color', sa.String(length=7), nullable=True),
+        sa.Column('contact_email', sa.String(length=255), nullable=False),
+        sa.Column('contact_phone', sa.String(length=20), nullable=True),
+        sa.Column('address', sa.JSON(), nullable=True),
+        sa.Column('timezone', sa.String(length=50), nullable=True),
+        sa.Column('currency', sa.String(length=3), nullable=True),
+        sa.Column('settings', sa.JSON(), nullable=True),
+        sa.Column('subscription_plan', sa.String(length=50), nullable=True),
+        sa.Column('subscription_status', sa.Enum('TRIAL', 'ACTIVE', 'PAST_DUE', 'CANCELLED', 'EXPIRED', name='subscriptionstatus'), nullable=True),
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_organizations_id', 'organizations', ['id'])
+    op.create_index('ix_organizations_slug', 'organizations', ['slug'], unique=True)
+    op.create_table(
+        'equipment',
+        sa.Column('organization_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('category', sa.String(length=50), nullable=True),
+        sa.Column('purchase_date', sa.Date(), nullable=True),
+        sa.Column('warranty_expiry', sa.Date(), nullable=True),
+        sa.Column('status', sa.Enum('ACTIVE', 'MAINTENANCE', 'OUT_OF_ORDER', name='equipmentstatus'), nullable=True),
+        sa.Column('last_maintenance_date', sa.Date(), nullable=True),
+        sa.Column('next_maintenance_date', sa.Date(), nullable=True),
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['organization_id'], ['organizations.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_equipment_id', 'equipment', ['id'])
+    op.create_index('ix_equipment_organization_id', 'equipment', ['organization_id'])
+    op.create_table(
+        'membership_plans',
+        sa.Column('organization_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('description', sa.String(length=1000), nullable=True),
+        sa.Column('price', sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column('duration_days', sa.Integer(), nullable=False),
+        sa.Column('duration_type', sa.Enum('DAILY', 'WEEKLY', 'MONTHLY', 'QUARTERLY', 'ANNUAL', 'LIFETIME', name='durationtype'), nullable=False),
+        sa.Column('setup_fee', sa.Numeric(precision=10, scale=2), nullable=True),
+        sa.Column('features', sa.JSON(), nullable=True),
+        sa.Column('access_hours', sa.JSON(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['organization_id'], ['organizations.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_membership_plans_id', 'membership_plans', ['id'])
+    op.create_index('ix_membership_plans_organization_id', 'membership_plans', ['organization_id'])
+    op.create_table(
+        'users',
+        sa.Column('organization_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('email', sa.String(length=255), nullable=False),
+        sa.Column('password_hash', sa.String(length=255), nullable=False),
+        sa.Column('first_name', sa.String(length=100), nullable=False),
+        sa.Column('last_name', sa.String(length=100), nullable=False),
+        sa.Column('phone', sa.String(length=20), nullable=True),
+        sa.Column('role', sa.Enum('SUPER_ADMIN', 'GYM_OWNER', 'ADMIN', 'TRAINER', 'RECEPTIONIST', 'MEMBER', name='userrole'), nullable=False),
+        sa.Column('profile_photo_url', sa.String(length=500), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('is_verified', sa.Boolean(), nullable=True),
+        sa.Column('last_login_at', sa.DateTime(), nullable=True),
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['organization_id'], ['organizations.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+    op.create_index('ix_users_id', 'users', ['id'])
+    op.create_index('ix_users_organization_id', 'users', ['organization_id'])
+    op.create_table(
+        'leads',
+        sa.Column('organization_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('email', sa.String(length=255), nullable=True),
+        sa.Column('phone', sa.String(length=20), nullable=True),
+        sa.Column('source', sa.Enum('WEBSITE', 'WALK_IN', 'PHONE', 'SOCIAL_MEDIA', 'REFERRAL', 'EVENT', 'OTHER', name='leadsource'), nullable=False),
+        sa.Column('status', sa.Enum('NEW', 'CONTACTED', 'VISITED', 'CONVERTED', 'LOST', name='leadstatus'), nullable=True),
+        sa.Column('assigned_to', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('notes', sa.String(length=1000), nullable=True),
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['assigned_to'], ['users.id']),
+        sa.ForeignKeyConstraint(['organization_id'], ['organizations.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_leads_id', 'leads', ['id'])
+    op.create_index('ix_leads_organization_id', 'leads', ['organization_id'])
+    op.create_table(
+        'members',
+        sa.Column('organization_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('member_id', sa.String(length=50), nullable=False),
+        sa.Column('date_of_birth', sa.Date(), nullable=True),
+        sa.Column('gender', sa.Enum('MALE', 'FEMALE', 'OTHER', 'PREFER_NOT_TO_SAY', name='gender'), nullable=True),
+        sa.Column('address', sa.JSON(), nullable=True),
+        sa.Column('emergency_contact_name', sa.String(length=100), nullable=True),
+        sa.Column('emergency_contact_phone', sa.String(length=20), nullable=True),
+        sa.Column('medical_notes', sa.String(length=1000), nullable=True),
+        sa.Column('fitness_goals', sa.JSON(), nullable=True),
+        sa.Column('tags', sa.ARRAY(sa.String()), nullable=True),
+        sa.Column('profile_photo_url', sa.String(length=500), nullable=True),
+        sa.Column('qr_code', sa.String(length=255), nullable=True),
+        sa.Column('status', sa.Enum('ACTIVE', 'FROZEN', 'EXPIRED', 'CANCELLED', name='memberstatus'), nullable=True),
+        sa.Column('joined_at', sa.Date(), nullable=False),
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['organization_id'], ['organizations.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('qr_code'),
+        sa.UniqueConstraint('user_id')
+    )
+    op.create_index('ix_members_id', 'members', ['id'])
+    op.create_index('ix_members_organization_id', 'members', ['organization_id'])
+    op.create_table(
+        'notifications',
+        sa.Column('organization_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('type', sa.Enum('EMAIL', 'SMS', 'PUSH', 'WHATSAPP', name='notificationtype'), nullable=False),
+        sa.Column('title', sa.String(length=200), nullable=False),
+        sa.Column('body', sa.String(length=1000), nullable=False),
+        sa.Column('status', sa.Enum('PENDING', 'SENT', 'FAILED', name='notificationstatus'), nullable=True),
+        sa.Column('sent_at', sa.DateTime(), nullable=True),
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['organization_id'], ['organizations.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_notifications_id', 'notifications', ['id'])
+    op.create_index('ix_notifications_organization_id', 'notifications', ['organization_id'])
+    op.create_index('ix_notifications_user_id', 'notifications', ['user_id'])
+    op.create_table(
+        'staff',
+        sa.Column('organization_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('position', sa.String(length=100), nullable=True),
+        sa.Column('salary', sa.Numeric(precision=10, scale=2), nullable=True),
+        sa.Column('hire_date', sa.Date(), nullable=False),
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['organization_id'], ['organizations.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id')
+    )
+    op.create_index('ix_staff_id', 'staff', ['id'])
+    op.create_index('ix_staff_organization_id', 'staff', ['organization_id'])
+    op.create_table(
+        'trainers',
+        sa.Column('organization_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('specializations', sa.ARRAY(sa.String()), nullable=True),
+        sa.Column('certifications', sa.JSON(), nullable=True),
+        sa.Column('bio', sa.String(length=1000), nullable=True),
+        sa.Column('hourly_rate', sa.Numeric(precision=10, scale=2), nullable=True),
+        sa.Column('commission_percentage', sa.Numeric(precision=5, scale=2), nullable=True),
+        sa.Column('rating', sa.Numeric(precision=3, scale=2), nullable=True),
+        sa.Column('total_sessions', sa.Integer(), nullable=True),
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['organization_id'], ['organizations.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id')
+    )
+    op.create_index('ix_trainers_id', 'trainers', ['id'])
+    op.create_index('ix_trainers_organization_id', 'trainers', ['organization_id'])
+    op.create_table(
+        'check_ins',
+        sa.Column('organization_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('member_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('check_in_time', sa.DateTime(), nullable=False),
+        sa.Column('check_out_time', sa.DateTime(), nullable=True),
+        sa.Column('method', sa.Enum('QR', 'NFC', 'MANUAL', 'BIOMETRIC', 'APP', name='checkinmethod'), nullable=False),
+        sa.Column('location_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['member_id'], ['members.id']),
+        sa.ForeignKeyConstraint(['organization_id'], ['organizations.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_check_ins_check_in_time', 'check_ins', ['check_in_time'])
+    op.create_index('ix_check_ins_id', 'check_ins', ['id'])
+    op.create_index('ix_check_ins_member_id', 'check_ins', ['member_id'])
+    op.create_index('ix_check_ins_organization_id', 'check_ins', ['organization_id'])
+    op.create_table(
+        'classes',
+        sa.Column('organization_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('description', sa.String(length=1000), nullable=True),
+        sa.Column('category', sa.String(length=50), nullable=False),
+        sa.Column('duration_minutes', sa.Integer(), nullable=False),
+        sa.Column('capacity', sa.Integer(), nullable=False),
+        sa.Column('instructor_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('room', sa.String(length=100), nullable=True),
+        sa.Column('difficulty_level', sa.Enum('BEGINNER', 'INTERMEDIATE', 'ADVANCED', name='difficultylevel'), nullable=True),
+        sa.Column('is_recurring', sa.Boolean(), nullable=True),
+        sa.Column('recurrence_rule', sa.JSON(), nullable=True),
+        sa.Column('image_url', sa.String(length=500), nullable=True),
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['instructor_id'], ['trainers.id']),
+        sa.ForeignKeyConstraint(['organization_id'], ['organizations.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_classes_id', 'classes', ['id'])
+    op.create_index('ix_classes_organization_id', 'classes', ['organization_id'])
+    op.create_table(
+        'memberships',
+        sa.Column('organization_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('member_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('plan_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('start_date', sa.Date(), nullable=False),
+        sa.Column('end_date', sa.Date(), nullable=False),
+        sa.Column('auto_renew', sa.Boolean(), nullable=True),
+        sa.Column('status', sa.Enum('ACTIVE', 'FROZEN', 'EXPIRED', 'CANCELLED', name='membershipstatus'), nullable=True),
+        sa.Column('freeze_start_date', sa.Date(), nullable=True),
+        sa.Column('freeze_end_date', sa.Date(), nullable=True),
+        sa.Column('cancellation_date', sa.Date(), nullable=True),
+        sa.Column('cancellation_reason', sa.String(length=500), nullable=True),
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['member_id'], ['members.id']),
+        sa.ForeignKeyConstraint(['organization_id'], ['organizations.id']),
+        sa.ForeignKeyConstraint(['plan_id'], ['membership_plans.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_memberships_id', 'memberships', ['id'])
+    op.create_index('ix_memberships_member_id', 'memberships', ['member_id'])
+    op.create_index('ix_memberships_organization_id', 'memberships', ['organization_id'])
+    op.create_table(
+        'class_schedules',
+        sa.Column('organization_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('class_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('instructor_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('scheduled_date', sa.Date(), nullable=False),
+        sa.Column('start_time', sa.Time(), nullable=False),
+        sa.Column('end_time', sa.Time(), nullable=False),
+        sa.Column('status', sa.Enum('SCHEDULED', 'ONGOING', 'COMPLETED', 'CANCELLED', name='classstatus'), nullable=True),
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['class_id'], ['classes.id']),
+        sa.ForeignKeyConstraint(['instructor_id'], ['trainers.id']),
+        sa.ForeignKeyConstraint(['organization_id'], ['organizations.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_class_schedules_class_id', 'class_schedules', ['class_id'])
+    op.create_index('ix_class_schedules_id', 'class_schedules', ['id'])
+    op.create_index('ix_class_schedules_organization_id', 'class_schedules', ['organization_id'])
+    op.create_index('ix_class_schedules_scheduled_date', 'class_schedules', ['scheduled_date'])
+    op.create_table(
+        'payments',
+        sa.Column('organization_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('member_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('membership_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('amount', sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column('currency', sa.String(length=3), nullable=True),
+        sa.Column('payment_method', sa.Enum('CARD', 'UPI', 'CASH', 'BANK_TRANSFER', name='paymentmethod'), nullable=False),
+        sa.Column('payment_gateway', sa.String(length=50), nullable=True),
+        sa.Column('transaction_id', sa.String(length=255), nullable=True),
+        sa.Column('status', sa.Enum('PENDING', 'PROCESSING', 'COMPLETED', 'FAILED', 'REFUNDED', name='paymentstatus'), nullable=True),
+        sa.Column('payment_date', sa.Date(), nullable=False),
+        sa.Column('due_date', sa.Date(), nullable=True),
+        sa.Column('retry_count', sa.Integer(), nullable=True),
+        sa.Column('metadata', sa.JSON(), nullable=True),
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['member_id'], ['members.id']),
+        sa.ForeignKeyConstraint(['membership_id'], ['memberships.id']),
+        sa.ForeignKeyConstraint(['organization_id'], ['organizations.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('transaction_id')
+    )
+    op.create_index('ix_payments_id', 'payments', ['id'])
+    op.create_index('ix_payments_member_id', 'payments', ['member_id'])
+    op.create_index('ix_payments_organization_id', 'payments', ['organization_id'])
+    op.create_table(
+        'class_bookings',
+        sa.Column('organization_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('schedule_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('member_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('status', sa.Enum('BOOKED', 'ATTENDED', 'NO_SHOW', 'CANCELLED', 'WAITLISTED', name='bookingstatus'), nullable=True),
+        sa.Column('booked_at', sa.DateTime(), nullable=False),
+        sa.Column('cancelled_at', sa.DateTime(), nullable=True),
+        sa.Column('attended_at', sa.DateTime(), nullable=True),
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['member_id'], ['members.id']),
+        sa.ForeignKeyConstraint(['organization_id'], ['organizations.id']),
+        sa.ForeignKeyConstraint(['schedule_id'], ['class_schedules.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_class_bookings_id', 'class_bookings', ['id'])
+    op.create_index('ix_class_bookings_member_id', 'class_bookings', ['member_id'])
+    op.create_index('ix_class_bookings_organization_id', 'class_bookings', ['organization_id'])
+    op.create_index('ix_class_bookings_schedule_id', 'class_bookings', ['schedule_id'])
+    op.create_table(
+        'invoices',
+        sa.Column('organization_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('member_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('payment_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('invoice_number', sa.String(length=50), nullable=False),
+        sa.Column('amount', sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column('tax_amount', sa.Numeric(precision=10, scale=2), nullable=True),
+        sa.Column('total_amount', sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column('status', sa.Enum('DRAFT', 'SENT', 'PAID', 'OVERDUE', 'CANCELLED', name='invoicestatus'), nullable=True),
+        sa.Column('issue_date', sa.Date(), nullable=False),
+        sa.Column('due_date', sa.Date(), nullable=False),
+        sa.Column('paid_date', sa.Date(), nullable=True),
+        sa.Column('line_items', sa.JSON(), nullable=True),
+        sa.Column('pdf_url', sa.String(length=500), nullable=True),
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['member_id'], ['members.id']),
+        sa.ForeignKeyConstraint(['organization_id'], ['organizations.id']),
+        sa.ForeignKeyConstraint(['payment_id'], ['payments.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('invoice_number'),
+        sa.UniqueConstraint('payment_id')
+    )
+    op.create_index('ix_invoices_id', 'invoices', ['id'])
+    op.create_index('ix_invoices_member_id', 'invoices', ['member_id'])
+    op.create_index('ix_invoices_organization_id', 'invoices', ['organization_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_invoices_organization_id', table_name='invoices')
+    op.drop_index('ix_invoices_member_id', table_name='invoices')
+    op.drop_index('ix_invoices_id', table_name='invoices')
+    op.drop_table('invoices')
+    op.drop_index('ix_class_bookings_schedule_id', table_name='class_bookings')
+    op.drop_index('ix_class_bookings_organization_id', table_name='class_bookings')
+    op.drop_index('ix_class_bookings_member_id', table_name='class_bookings')
+    op.drop_index('ix_class_bookings_id', table_name='class_bookings')
+    op.drop_table('class_bookings')
+    op.drop_index('ix_payments_organization_id', table_name='payments')
+    op.drop_index('ix_payments_member_id', table_name='payments')
+    op.drop_index('ix_payments_id', table_name='payments')
+    op.drop_table('payments')
+    op.drop_index('ix_class_schedules_scheduled_date', table_name='class_schedules')
+    op.drop_index('ix_class_schedules_organization_id', table_name='class_schedules')
+    op.drop_index('ix_class_schedules_id', table_name='class_schedules')
+    op.drop_index('ix_class_schedules_class_id', table_name='class_schedules')
+    op.drop_table('class_schedules')
+    op.drop_index('ix_memberships_organization_id', table_name='memberships')
+    op.drop_index('ix_memberships_member_id', table_name='memberships')
+    op.drop_index('ix_memberships_id', table_name='memberships')
+    op.drop_table('memberships')
+    op.drop_index('ix_classes_organization_id', table_name='classes')
+    op.drop_index('ix_classes_id', table_name='classes')
+    op.drop_table('classes')
+    op.drop_index('ix_check_ins_organization_id', table_name='check_ins')
+    op.drop_index('ix_check_ins_member_id', table_name='check_ins')
+    op.drop_index('ix_check_ins_id', table_name='check_ins')
+    op.drop_index('ix_check_ins_check_in_time', table_name='check_ins')
+    op.drop_table('check_ins')
+    op.drop_index('ix_trainers_organization_id', table_name='trainers')
+    op.drop_index('ix_trainers_id', table_name='trainers')
+    op.drop_table('trainers')
+    op.drop_index('ix_staff_organization_id', table_name='staff')
+    op.drop_index('ix_staff_id', table_name='staff')
+    op.drop_table('staff')
+    op.drop_index('ix_notifications_user_id', table_name='notifications')
+    op.drop_index('ix_notifications_organization_id', table_name='notifications')
+    op.drop_index('ix_notifications_id', table_name='notifications')
+    op.drop_table('notifications')
+    op.drop_index('ix_members_organization_id', table_name='members')
+    op.drop_index('ix_members_id', table_name='members')
+    op.drop_table('members')
+    op.drop_index('ix_leads_organization_id', table_name='leads')
+    op.drop_index('ix_leads_id', table_name='leads')
+    op.drop_table('leads')
+    op.drop_index('ix_users_organization_id', table_name='users')
+    op.drop_index('ix_users_id', table_name='users')
+    op.drop_index('ix_users_email', table_name='users')
+    op.drop_table('users')
+    op.drop_index('ix_membership_plans_organization_id', table_name='membership_plans')
+    op.drop_index('ix_membership_plans_id', table_name='membership_plans')
+    op.drop_table('membership_plans')
+    op.drop_index('ix_equipment_organization_id', table_name='equipment')
+    op.drop_index('ix_equipment_id', table_name='equipment')
+    op.drop_table('equipment')
+    op.drop_index('ix_organizations_slug', table_name='organizations')
+    op.drop_index('ix_organizations_id', table_name='organizations')
+    op.drop_table('organizations')
+    for name in ENUM_TYPES:
+        op.execute(f"DROP TYPE IF EXISTS {name}")
@@ -0,0 +1,85 @@
+"""partition check_ins by month
+
+Revision ID: 0001_partition_check_ins
+Revises: 0000_baseline
+Create Date: 2026-10-17 09:00:00.000000
+
+Rebuilds check_ins as a table range-partitioned on check_in_time with one partition
+per UTC month (from the oldest check-in through PARTITION_MONTHS_AHEAD months ahead)
+plus a default partition. Rows are copied across, so run it in a maintenance window;
+maintain_partitions creates later months from then on.
+"""
+from datetime import datetime
+from alembic import op
+import sqlalchemy as sa
+from app.core.config import settings
+from app.db.partitions import add_months, create_partition_sql, default_partition_name, month_start
+
+
+# revision identifiers, used by Alembic.
+revision = '0001_partition_check_ins'
+down_revision = '0000_baseline'
+branch_labels = None
+depends_on = None
+
+COLUMNS = "id, created_at, updated_at, organization_id, member_id, check_in_time, check_out_time, method, location_id, idempotency_key"
+
+
+def _create_indexes() -> None:
+    op.create_index("ix_check_ins_id", "check_ins", ["id"])
+    op.create_index("ix_check_ins_organization_id", "check_ins", ["organization_id"])
+    op.create_index("ix_check_ins_member_id", "check_ins", ["member_id"])
+    op.create_index("ix_check_ins_check_in_time", "check_ins", ["check_in_time"])
+    op.create_index(
+        "ix_check_ins_open", "check_ins", ["organization_id", "check_in_time"],
+        postgresql_where=sa.text("check_out_time IS NULL")
+    )
+
+
+def _create_foreign_keys() -> None:
+    op.create_foreign_key("check_ins_organization_id_fkey", "check_ins", "organizations", ["organization_id"], ["id"])
+    op.create_foreign_key("check_ins_member_id_fkey", "check_ins", "members", ["member_id"], ["id"])
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE check_ins ADD COLUMN IF NOT EXISTS idempotency_key VARCHAR(64)")
+    op.execute("ALTER TABLE check_ins RENAME TO check_ins_unpartitioned")
+    op.execute(
+        "CREATE TABLE check_ins (LIKE check_ins_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+        "PARTITION BY RANGE (check_in_time)"
+    )
+
+    oldest = op.get_bind().execute(sa.text("SELECT min(check_in_time) FROM check_ins_unpartitioned")).scalar()
+    month = month_start(oldest or datetime.utcnow())
+    last = add_months(month_start(datetime.utcnow()), settings.PARTITION_MONTHS_AHEAD)
+    while month <= last:
+        op.execute(create_partition_sql("check_ins", month))
+        month = add_months(month, 1)
+    op.execute(f"CREATE TABLE {default_partition_name('check_ins')} PARTITION OF check_ins DEFAULT")
+
+    op.execute(f"INSERT INTO check_ins ({COLUMNS}) SELECT {COLUMNS} FROM check_ins_unpartitioned")
+    op.execute("DROP TABLE check_ins_unpartitioned")
+
+    # Keys and indexes are built after the copy; the parent's propagate to every partition
+    op.create_primary_key("check_ins_pkey", "check_ins", ["id", "check_in_time"])
+    op.create_unique_constraint(
+        "uq_check_ins_org_idempotency_key", "check_ins", ["organization_id", "idempotency_key", "check_in_time"]
+    )
+    _create_foreign_keys()
+    _create_indexes()
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE check_ins RENAME TO check_ins_partitioned")
+    op.execute(
+        "CREATE TABLE check_ins (LIKE check_ins_partitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+    )
+    op.execute(f"INSERT INTO check_ins ({COLUMNS}) SELECT {COLUMNS} FROM check_ins_partitioned")
+    op.execute("DROP TABLE check_ins_partitioned")
+
+    op.create_primary_key("check_ins_pkey", "check_ins", ["id"])
+    op.create_unique_constraint(
+        "uq_check_ins_org_idempotency_key", "check_ins", ["organization_id", "idempotency_key"]
+    )
+    _create_foreign_keys()
+    _create_indexes()
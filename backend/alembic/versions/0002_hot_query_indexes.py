@@ -0,0 +1,48 @@
+"""composite and partial indexes for hot queries
+
+Revision ID: 0002_hot_query_indexes
+Revises: 0001_partition_check_ins
+Create Date: 2026-10-17 10:00:00.000000
+
+Indexes are built CONCURRENTLY so the tables stay writable while they build.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002_hot_query_indexes'
+down_revision = '0001_partition_check_ins'
+branch_labels = None
+depends_on = None
+
+# (name, table, columns, partial index predicate)
+INDEXES = [
+    ("ix_memberships_org_status", "memberships", ["organization_id", "status"], None),
+    ("ix_memberships_status_end_date", "memberships", ["status", "end_date"], None),
+    ("ix_memberships_member_active", "memberships", ["member_id", "end_date"], "status = 'ACTIVE'"),
+    ("ix_payments_org_status_payment_date", "payments", ["organization_id", "status", "payment_date"], None),
+    ("ix_payments_status_due_date", "payments", ["status", "due_date"], None),
+    ("ix_payments_membership_status_due_date", "payments", ["membership_id", "status", "due_date"], None),
+    ("ix_payments_org_pending_due_date", "payments", ["organization_id", "due_date"], "status = 'PENDING'"),
+    ("ix_class_bookings_schedule_status", "class_bookings", ["schedule_id", "status"], None),
+    ("ix_notifications_org_status_sent_at", "notifications", ["organization_id", "status", "sent_at"], None),
+    ("ix_members_org_member_id", "members", ["organization_id", "member_id"], None),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name, table, columns,
+                postgresql_where=sa.text(where) if where else None,
+                postgresql_concurrently=True,
+                if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
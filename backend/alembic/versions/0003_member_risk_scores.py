@@ -0,0 +1,52 @@
+"""member risk scores
+
+Revision ID: 0003_member_risk_scores
+Revises: 0002_hot_query_indexes
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0003_member_risk_scores'
+down_revision = '0002_hot_query_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'member_risk_scores',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('organization_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('member_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('scored_on', sa.Date(), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.Column('at_risk', sa.Boolean(), nullable=False),
+        sa.Column('factors', sa.JSON(), nullable=False),
+        sa.Column('visits_per_week', sa.Float(), nullable=False),
+        sa.Column('last_visit', sa.DateTime(), nullable=True),
+        sa.Column('membership_end_date', sa.Date(), nullable=True),
+        sa.Column('attendance_trend', sa.String(length=20), nullable=False),
+        sa.ForeignKeyConstraint(['member_id'], ['members.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['organization_id'], ['organizations.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('member_id', 'scored_on', name='uq_member_risk_scores_member_scored_on')
+    )
+    op.create_index('ix_member_risk_scores_id', 'member_risk_scores', ['id'])
+    op.create_index('ix_member_risk_scores_organization_id', 'member_risk_scores', ['organization_id'])
+    op.create_index(
+        'ix_member_risk_scores_org_scored_on_score', 'member_risk_scores', ['organization_id', 'scored_on', 'score']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_member_risk_scores_org_scored_on_score', table_name='member_risk_scores')
+    op.drop_index('ix_member_risk_scores_organization_id', table_name='member_risk_scores')
+    op.drop_index('ix_member_risk_scores_id', table_name='member_risk_scores')
+    op.drop_table('member_risk_scores')
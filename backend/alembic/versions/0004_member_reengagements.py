@@ -0,0 +1,51 @@
+"""member re-engagements
+
+Revision ID: 0004_member_reengagements
+Revises: 0003_member_risk_scores
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0004_member_reengagements'
+down_revision = '0003_member_risk_scores'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'member_reengagements',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('organization_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('member_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column(
+            'status',
+            postgresql.ENUM('PENDING', 'SENT', 'FAILED', name='notificationstatus', create_type=False),
+            nullable=False
+        ),
+        sa.Column('sent_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['member_id'], ['members.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['organization_id'], ['organizations.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_member_reengagements_id', 'member_reengagements', ['id'])
+    op.create_index('ix_member_reengagements_organization_id', 'member_reengagements', ['organization_id'])
+    op.create_index(
+        'ix_member_reengagements_member_created_at', 'member_reengagements', ['member_id', 'created_at']
+    )
+    op.create_index('ix_member_reengagements_status', 'member_reengagements', ['status'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_member_reengagements_status', table_name='member_reengagements')
+    op.drop_index('ix_member_reengagements_member_created_at', table_name='member_reengagements')
+    op.drop_index('ix_member_reengagements_organization_id', table_name='member_reengagements')
+    op.drop_index('ix_member_reengagements_id', table_name='member_reengagements')
+    op.drop_table('member_reengagements')
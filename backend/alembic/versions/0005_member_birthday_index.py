@@ -0,0 +1,32 @@
+"""member birthday index
+
+Revision ID: 0005_member_birthday_index
+Revises: 0004_member_reengagements
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005_member_birthday_index'
+down_revision = '0004_member_reengagements'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_members_birthday', 'members',
+            [sa.text('EXTRACT(month FROM date_of_birth)'), sa.text('EXTRACT(day FROM date_of_birth)')],
+            postgresql_where=sa.text('date_of_birth IS NOT NULL'),
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_members_birthday', table_name='members', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,35 @@
+"""class reminder tracking
+
+Revision ID: 0006_class_reminder_tracking
+Revises: 0005_member_birthday_index
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006_class_reminder_tracking'
+down_revision = '0005_member_birthday_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('class_bookings', sa.Column('reminder_sent_at', sa.DateTime(), nullable=True))
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_class_schedules_date_start_time', 'class_schedules', ['scheduled_date', 'start_time'],
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_class_schedules_date_start_time', table_name='class_schedules',
+            postgresql_concurrently=True, if_exists=True
+        )
+    op.drop_column('class_bookings', 'reminder_sent_at')
@@ -0,0 +1,82 @@
+"""analytics rollups
+
+Revision ID: 0007_analytics_rollups
+Revises: 0006_class_reminder_tracking
+Create Date: 2026-10-17 16:00:00.000000
+
+Rollup tables read by the analytics endpoints for closed days. They start empty;
+update_daily_rollups fills the recent days and backfill_rollups the history.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0007_analytics_rollups'
+down_revision = '0006_class_reminder_tracking'
+branch_labels = None
+depends_on = None
+
+ROLLUP_TABLES = ['checkin_hourly_rollups', 'revenue_daily_rollups', 'membership_daily_rollups']
+
+
+def _base_columns() -> list:
+    return [
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('organization_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+    ]
+
+
+def upgrade() -> None:
+    op.create_table(
+        'checkin_hourly_rollups',
+        *_base_columns(),
+        sa.Column('hour', sa.Integer(), nullable=False),
+        sa.Column('check_ins', sa.Integer(), nullable=False),
+        sa.Column('completed_sessions', sa.Integer(), nullable=False),
+        sa.Column('session_seconds', sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(['organization_id'], ['organizations.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('organization_id', 'day', 'hour', name='uq_checkin_hourly_rollups_org_day_hour')
+    )
+    op.create_table(
+        'revenue_daily_rollups',
+        *_base_columns(),
+        sa.Column(
+            'payment_method',
+            postgresql.ENUM('CARD', 'UPI', 'CASH', 'BANK_TRANSFER', name='paymentmethod', create_type=False),
+            nullable=False
+        ),
+        sa.Column('total_amount', sa.Numeric(precision=12, scale=2), nullable=False),
+        sa.Column('payment_count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['organization_id'], ['organizations.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('organization_id', 'day', 'payment_method', name='uq_revenue_daily_rollups_org_day_method')
+    )
+    op.create_table(
+        'membership_daily_rollups',
+        *_base_columns(),
+        sa.Column('started', sa.Integer(), nullable=False),
+        sa.Column('frozen', sa.Integer(), nullable=False),
+        sa.Column('expired', sa.Integer(), nullable=False),
+        sa.Column('cancelled', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['organization_id'], ['organizations.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('organization_id', 'day', name='uq_membership_daily_rollups_org_day')
+    )
+    for table in ROLLUP_TABLES:
+        op.create_index(f'ix_{table}_id', table, ['id'])
+        op.create_index(f'ix_{table}_organization_id', table, ['organization_id'])
+        op.create_index(f'ix_{table}_day', table, ['day'])
+
+
+def downgrade() -> None:
+    for table in reversed(ROLLUP_TABLES):
+        op.drop_index(f'ix_{table}_day', table_name=table)
+        op.drop_index(f'ix_{table}_organization_id', table_name=table)
+        op.drop_index(f'ix_{table}_id', table_name=table)
+        op.drop_table(table)
@@ -0,0 +1,41 @@
+"""keyset pagination indexes
+
+Revision ID: 0008_keyset_pagination_indexes
+Revises: 0007_analytics_rollups
+Create Date: 2026-10-17 17:00:00.000000
+
+(organization_id, sort key, id) indexes matching the order paginate() walks each
+list in, so a cursor page is an index range scan instead of a sort over the tenant.
+check_ins pages on the existing check_in_time index within each monthly partition.
+Indexes are built CONCURRENTLY so the tables stay writable while they build.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0008_keyset_pagination_indexes'
+down_revision = '0007_analytics_rollups'
+branch_labels = None
+depends_on = None
+
+# (name, table, columns)
+INDEXES = [
+    ("ix_members_org_created_at_id", "members", ["organization_id", "created_at", "id"]),
+    ("ix_memberships_org_created_at_id", "memberships", ["organization_id", "created_at", "id"]),
+    ("ix_payments_org_payment_date_id", "payments", ["organization_id", "payment_date", "id"]),
+    ("ix_invoices_org_created_at_id", "invoices", ["organization_id", "created_at", "id"]),
+    ("ix_notifications_org_created_at_id", "notifications", ["organization_id", "created_at", "id"]),
+    ("ix_leads_org_created_at_id", "leads", ["organization_id", "created_at", "id"]),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,62 @@
+"""report jobs
+
+Revision ID: 0009_reports
+Revises: 0008_keyset_pagination_indexes
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0009_reports'
+down_revision = '0008_keyset_pagination_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'reports',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('organization_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('requested_by', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('report_type', sa.String(length=50), nullable=False),
+        sa.Column('format', sa.String(length=10), nullable=False),
+        sa.Column('compress', sa.Boolean(), nullable=False),
+        sa.Column('start_date', sa.DateTime(), nullable=False),
+        sa.Column('end_date', sa.DateTime(), nullable=False),
+        sa.Column('params_hash', sa.String(length=64), nullable=False),
+        sa.Column('generations', sa.JSON(), nullable=True),
+        sa.Column('status', sa.Enum('PENDING', 'RUNNING', 'COMPLETED', 'FAILED', name='reportstatus'), nullable=False),
+        sa.Column('progress', sa.Integer(), nullable=False),
+        sa.Column('row_count', sa.Integer(), nullable=True),
+        sa.Column('file_url', sa.String(length=500), nullable=True),
+        sa.Column('file_name', sa.String(length=255), nullable=True),
+        sa.Column('file_size', sa.BigInteger(), nullable=True),
+        sa.Column('content_type', sa.String(length=100), nullable=True),
+        sa.Column('error', sa.String(length=1000), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('completed_at', sa.DateTime(), nullable=True),
+        sa.Column('expires_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['organization_id'], ['organizations.id']),
+        sa.ForeignKeyConstraint(['requested_by'], ['users.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_reports_id', 'reports', ['id'])
+    op.create_index('ix_reports_organization_id', 'reports', ['organization_id'])
+    op.create_index('ix_reports_org_params_hash', 'reports', ['organization_id', 'params_hash'])
+    op.create_index('ix_reports_expires_at', 'reports', ['expires_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_reports_expires_at', table_name='reports')
+    op.drop_index('ix_reports_org_params_hash', table_name='reports')
+    op.drop_index('ix_reports_organization_id', table_name='reports')
+    op.drop_index('ix_reports_id', table_name='reports')
+    op.drop_table('reports')
+    op.execute('DROP TYPE IF EXISTS reportstatus')
@@ -0,0 +1,56 @@
+"""scheduled reports
+
+Revision ID: 0010_scheduled_reports
+Revises: 0009_reports
+Create Date: 2026-10-17 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0010_scheduled_reports'
+down_revision = '0009_reports'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'scheduled_reports',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('organization_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_by', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('name', sa.String(length=200), nullable=False),
+        sa.Column('report_type', sa.String(length=50), nullable=False),
+        sa.Column('format', sa.String(length=10), nullable=False),
+        sa.Column('compress', sa.Boolean(), nullable=False),
+        sa.Column('cron', sa.String(length=100), nullable=False),
+        sa.Column('lookback_days', sa.Integer(), nullable=False),
+        sa.Column('recipients', sa.JSON(), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.Column('next_run_at', sa.DateTime(), nullable=True),
+        sa.Column('last_run_at', sa.DateTime(), nullable=True),
+        sa.Column('last_report_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('last_delivered_report_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.ForeignKeyConstraint(['organization_id'], ['organizations.id']),
+        sa.ForeignKeyConstraint(['created_by'], ['users.id']),
+        sa.ForeignKeyConstraint(['last_report_id'], ['reports.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_scheduled_reports_id', 'scheduled_reports', ['id'])
+    op.create_index('ix_scheduled_reports_organization_id', 'scheduled_reports', ['organization_id'])
+    op.create_index('ix_scheduled_reports_next_run_at', 'scheduled_reports', ['next_run_at'])
+    op.create_index('ix_scheduled_reports_last_report_id', 'scheduled_reports', ['last_report_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_scheduled_reports_last_report_id', table_name='scheduled_reports')
+    op.drop_index('ix_scheduled_reports_next_run_at', table_name='scheduled_reports')
+    op.drop_index('ix_scheduled_reports_organization_id', table_name='scheduled_reports')
+    op.drop_index('ix_scheduled_reports_id', table_name='scheduled_reports')
+    op.drop_table('scheduled_reports')
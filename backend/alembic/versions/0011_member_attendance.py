@@ -0,0 +1,48 @@
+"""member attendance
+
+Revision ID: 0011_member_attendance
+Revises: 0010_scheduled_reports
+Create Date: 2026-10-17 20:00:00.000000
+
+The table starts empty; run the app.tasks.checkins.backfill_member_attendance task
+once after upgrading to fill it from existing check-ins.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0011_member_attendance'
+down_revision = '0010_scheduled_reports'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'member_attendance',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('organization_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('member_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('total_visits', sa.Integer(), nullable=False),
+        sa.Column('last_visit', sa.DateTime(), nullable=True),
+        sa.Column('last_visit_day', sa.Date(), nullable=True),
+        sa.Column('current_streak', sa.Integer(), nullable=False),
+        sa.Column('longest_streak', sa.Integer(), nullable=False),
+        sa.Column('weekly_visits', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.ForeignKeyConstraint(['organization_id'], ['organizations.id']),
+        sa.ForeignKeyConstraint(['member_id'], ['members.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('member_id')
+    )
+    op.create_index('ix_member_attendance_id', 'member_attendance', ['id'])
+    op.create_index('ix_member_attendance_organization_id', 'member_attendance', ['organization_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_member_attendance_organization_id', table_name='member_attendance')
+    op.drop_index('ix_member_attendance_id', table_name='member_attendance')
+    op.drop_table('member_attendance')
@@ -1,160 +1,77 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import func, and_, extract
 from datetime import datetime, timedelta
-from typing import Optional
-from app.db.session import get_db
-from app.core.deps import get_current_user
+from typing import List, Optional
+from app.core.deps import get_current_user_read, get_current_user_read_async, get_read_db, get_async_read_db
 from app.models.user import User
 from app.models.member import Member
 from app.models.membership import Membership
-from app.models.checkin import CheckIn
 from app.models.payment import Payment
 from app.models.class_model import Class, ClassSchedule, ClassBooking
+from app.models.risk import MemberRiskScore
+from app.services.dashboard_metrics import dashboard_metrics
+from app.services.occupancy import occupancy_counter
+from app.services.rollups import get_checkin_rows, get_membership_rows, get_revenue_rows
+from app.services.churn import churn_prediction
+from app.services.cache import cached_analytics, CHECK_INS, PAYMENTS, MEMBERSHIPS, MEMBERS, CLASSES
+from app.core.time_windows import local_now
 from app.schemas.analytics import (
     DashboardMetrics,
     RevenueAnalytics,
     MemberAnalytics,
     AttendanceAnalytics,
-    ClassAnalytics
+    ClassAnalytics,
+    ChurnPrediction
 )
 
 router = APIRouter()
 
 
 @router.get("/dashboard", response_model=DashboardMetrics)
-def get_dashboard_metrics(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+@cached_analytics("dashboard", [CHECK_INS, PAYMENTS, MEMBERSHIPS, MEMBERS, CLASSES])
+async def get_dashboard_metrics(
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_current_user_read_async)
 ):
     """Get dashboard metrics"""
-    org_id = current_user.organization_id
-    today = datetime.now().date()
+    tz = current_user.organization.timezone
 
-    # Current occupancy - members checked in today who haven't checked out
-    current_occupancy = db.query(CheckIn).filter(
-        and_(
-            CheckIn.organization_id == org_id,
-            func.date(CheckIn.check_in_time) == today,
-            CheckIn.check_out_time.is_(None)
-        )
-    ).count()
-
-    # Total check-ins today
-    checkins_today = db.query(CheckIn).filter(
-        and_(
-            CheckIn.organization_id == org_id,
-            func.date(CheckIn.check_in_time) == today
-        )
-    ).count()
-
-    # Yesterday's check-ins for comparison
-    yesterday = today - timedelta(days=1)
-    checkins_yesterday = db.query(CheckIn).filter(
-        and_(
-            CheckIn.organization_id == org_id,
-            func.date(CheckIn.check_in_time) == yesterday
-        )
-    ).count()
-
-    # Revenue today
-    revenue_today = db.query(func.sum(Payment.amount)).filter(
-        and_(
-            Payment.organization_id == org_id,
-            Payment.status == "completed",
-            func.date(Payment.payment_date) == today
-        )
-    ).scalar() or 0
-
-    # Revenue yesterday
-    revenue_yesterday = db.query(func.sum(Payment.amount)).filter(
-        and_(
-            Payment.organization_id == org_id,
-            Payment.status == "completed",
-            func.date(Payment.payment_date) == yesterday
-        )
-    ).scalar() or 0
-
-    # Active memberships
-    active_memberships = db.query(Membership).filter(
-        and_(
-            Membership.organization_id == org_id,
-            Membership.status == "active"
-        )
-    ).count()
-
-    # New members today
-    new_members_today = db.query(Member).filter(
-        and_(
-            Member.organization_id == org_id,
-            func.date(Member.created_at) == today
-        )
-    ).count()
-
-    # Expiring memberships this week
-    week_from_now = today + timedelta(days=7)
-    expiring_memberships = db.query(Membership).filter(
-        and_(
-            Membership.organization_id == org_id,
-            Membership.status == "active",
-            Membership.end_date.between(today, week_from_now)
-        )
-    ).count()
-
-    # Overdue payments
-    overdue_payments = db.query(Payment).filter(
-        and_(
-            Payment.organization_id == org_id,
-            Payment.status == "pending",
-            Payment.due_date < today
-        )
-    ).count()
-
-    # Class bookings today
-    class_bookings_today = db.query(ClassBooking).join(ClassSchedule).filter(
-        and_(
-            ClassSchedule.organization_id == org_id,
-            ClassSchedule.scheduled_date == today
-        )
-    ).count()
-
-    return {
-        "current_occupancy": current_occupancy,
-        "checkins_today": checkins_today,
-        "checkins_yesterday": checkins_yesterday,
-        "revenue_today": float(revenue_today),
-        "revenue_yesterday": float(revenue_yesterday),
-        "active_memberships": active_memberships,
-        "new_members_today": new_members_today,
-        "expiring_memberships_this_week": expiring_memberships,
-        "overdue_payments": overdue_payments,
-        "class_bookings_today": class_bookings_today
-    }
+    # Occupancy comes from the live counters when they are available; every other tile
+    # is computed by the metrics engine in one statement per source table
+    occupancy = await occupancy_counter.get_async(current_user.organization_id, tz)
+    known = {"current_occupancy": occupancy["total"]} if occupancy is not None else None
+    return await dashboard_metrics.compute_async(db, current_user.organization_id, tz, known=known)
 
 
 @router.get("/revenue", response_model=RevenueAnalytics)
+@cached_analytics("revenue", [PAYMENTS, MEMBERSHIPS])
 def get_revenue_analytics(
     start_date: Optional[datetime] = Query(None),
     end_date: Optional[datetime] = Query(None),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user_read)
 ):
     """Get revenue analytics"""
     org_id = current_user.organization_id
+    tz = current_user.organization.timezone
 
     if not start_date:
-        start_date = datetime.now() - timedelta(days=30)
+        start_date = local_now(tz).replace(tzinfo=None) - timedelta(days=30)
     if not end_date:
-        end_date = datetime.now()
+        end_date = local_now(tz).replace(tzinfo=None)
 
-    # Total revenue in period
-    total_revenue = db.query(func.sum(Payment.amount)).filter(
-        and_(
-            Payment.organization_id == org_id,
-            Payment.status == "completed",
-            Payment.payment_date.between(start_date, end_date)
-        )
-    ).scalar() or 0
+    # Closed days are served from revenue_daily_rollups, only today touches payments
+    revenue_rows = get_revenue_rows(db, org_id, start_date.date(), end_date.date(), tz)
+
+    total_revenue = 0
+    revenue_by_method = {}
+    daily_revenue = {}
+    for day, method, amount, _ in revenue_rows:
+        total_revenue += amount
+        revenue_by_method[method] = revenue_by_method.get(method, 0) + amount
+        daily_revenue[day] = daily_revenue.get(day, 0) + amount
 
     # Monthly recurring revenue (active memberships)
     mrr_query = db.query(
@@ -167,41 +84,17 @@ def get_revenue_analytics(
         )
     ).scalar() or 0
 
-    # Revenue by payment method
-    revenue_by_method = db.query(
-        Payment.payment_method,
-        func.sum(Payment.amount).label('total')
-    ).filter(
-        and_(
-            Payment.organization_id == org_id,
-            Payment.status == "completed",
-            Payment.payment_date.between(start_date, end_date)
-        )
-    ).group_by(Payment.payment_method).all()
-
-    # Daily revenue trend
-    daily_revenue = db.query(
-        func.date(Payment.payment_date).label('date'),
-        func.sum(Payment.amount).label('revenue')
-    ).filter(
-        and_(
-            Payment.organization_id == org_id,
-            Payment.status == "completed",
-            Payment.payment_date.between(start_date, end_date)
-        )
-    ).group_by(func.date(Payment.payment_date)).all()
-
     return {
         "total_revenue": float(total_revenue),
         "mrr": float(mrr_query),
         "arr": float(mrr_query * 12),
         "revenue_by_payment_method": [
             {"method": method, "amount": float(amount)}
-            for method, amount in revenue_by_method
+            for method, amount in revenue_by_method.items()
         ],
         "daily_revenue": [
             {"date": date, "revenue": float(revenue)}
-            for date, revenue in daily_revenue
+            for date, revenue in sorted(daily_revenue.items())
         ],
         "start_date": start_date,
         "end_date": end_date
@@ -209,12 +102,14 @@ def get_revenue_analytics(
 
 
 @router.get("/members", response_model=MemberAnalytics)
+@cached_analytics("members", [MEMBERS, MEMBERSHIPS])
 def get_member_analytics(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user_read)
 ):
     """Get member analytics"""
     org_id = current_user.organization_id
+    tz = current_user.organization.timezone
 
     # Total members by status
     total_active = db.query(Membership).filter(
@@ -258,6 +153,20 @@ def get_member_analytics(
         )
     ).group_by('year', 'month').all()
 
+    # Monthly membership starts and exits (closed days from membership_daily_rollups)
+    today = local_now(tz).date()
+    membership_trend = {}
+    for day, started, frozen, expired, cancelled in get_membership_rows(
+        db, org_id, today - timedelta(days=365), today, tz
+    ):
+        month = membership_trend.setdefault(
+            (day.year, day.month), {"started": 0, "frozen": 0, "expired": 0, "cancelled": 0}
+        )
+        month["started"] += started
+        month["frozen"] += frozen
+        month["expired"] += expired
+        month["cancelled"] += cancelled
+
     # Demographics - gender distribution
     gender_distribution = db.query(
         Member.gender,
@@ -276,6 +185,10 @@ def get_member_analytics(
             {"year": int(year), "month": int(month), "count": count}
             for year, month, count in member_growth
         ],
+        "membership_trend": [
+            {"year": year, "month": month, **counts}
+            for (year, month), counts in sorted(membership_trend.items())
+        ],
         "gender_distribution": [
             {"gender": gender or "not_specified", "count": count}
             for gender, count in gender_distribution
@@ -284,72 +197,48 @@ def get_member_analytics(
 
 
 @router.get("/attendance", response_model=AttendanceAnalytics)
+@cached_analytics("attendance", [CHECK_INS])
 def get_attendance_analytics(
     start_date: Optional[datetime] = Query(None),
     end_date: Optional[datetime] = Query(None),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user_read)
 ):
     """Get attendance analytics"""
     org_id = current_user.organization_id
+    tz = current_user.organization.timezone
 
     if not start_date:
-        start_date = datetime.now() - timedelta(days=30)
+        start_date = local_now(tz).replace(tzinfo=None) - timedelta(days=30)
     if not end_date:
-        end_date = datetime.now()
-
-    # Total check-ins in period
-    total_checkins = db.query(CheckIn).filter(
-        and_(
-            CheckIn.organization_id == org_id,
-            CheckIn.check_in_time.between(start_date, end_date)
-        )
-    ).count()
+        end_date = local_now(tz).replace(tzinfo=None)
 
-    # Daily check-ins trend
-    daily_checkins = db.query(
-        func.date(CheckIn.check_in_time).label('date'),
-        func.count(CheckIn.id).label('count')
-    ).filter(
-        and_(
-            CheckIn.organization_id == org_id,
-            CheckIn.check_in_time.between(start_date, end_date)
-        )
-    ).group_by(func.date(CheckIn.check_in_time)).all()
+    # Closed days are served from checkin_hourly_rollups, only today touches check_ins
+    checkin_rows = get_checkin_rows(db, org_id, start_date.date(), end_date.date(), tz)
 
-    # Peak hours (hour of day distribution)
-    peak_hours = db.query(
-        extract('hour', CheckIn.check_in_time).label('hour'),
-        func.count(CheckIn.id).label('count')
-    ).filter(
-        and_(
-            CheckIn.organization_id == org_id,
-            CheckIn.check_in_time.between(start_date, end_date)
-        )
-    ).group_by('hour').all()
+    total_checkins = 0
+    completed_sessions = 0
+    session_seconds = 0
+    daily_checkins = {}
+    peak_hours = {}
+    for day, hour, check_ins, completed, seconds in checkin_rows:
+        total_checkins += check_ins
+        completed_sessions += completed
+        session_seconds += seconds
+        daily_checkins[day] = daily_checkins.get(day, 0) + check_ins
+        peak_hours[hour] = peak_hours.get(hour, 0) + check_ins
 
-    # Average session duration (for check-ins with check-out)
-    avg_duration = db.query(
-        func.avg(
-            extract('epoch', CheckIn.check_out_time - CheckIn.check_in_time)
-        )
-    ).filter(
-        and_(
-            CheckIn.organization_id == org_id,
-            CheckIn.check_out_time.isnot(None),
-            CheckIn.check_in_time.between(start_date, end_date)
-        )
-    ).scalar() or 0
+    avg_duration = session_seconds / completed_sessions if completed_sessions else 0
 
     return {
         "total_checkins": total_checkins,
         "daily_checkins": [
             {"date": date, "count": count}
-            for date, count in daily_checkins
+            for date, count in sorted(daily_checkins.items())
         ],
         "peak_hours": [
             {"hour": int(hour), "count": count}
-            for hour, count in peak_hours
+            for hour, count in sorted(peak_hours.items())
         ],
         "average_session_duration_minutes": float(avg_duration / 60) if avg_duration else 0,
         "start_date": start_date,
@@ -358,11 +247,12 @@ def get_attendance_analytics(
 
 
 @router.get("/classes", response_model=ClassAnalytics)
+@cached_analytics("classes", [CLASSES])
 def get_class_analytics(
     start_date: Optional[datetime] = Query(None),
     end_date: Optional[datetime] = Query(None),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user_read)
 ):
     """Get class analytics"""
     org_id = current_user.organization_id
@@ -430,3 +320,41 @@ def get_class_analytics(
         "start_date": start_date,
         "end_date": end_date
     }
+
+
+@router.get("/churn-risk", response_model=List[ChurnPrediction])
+def get_churn_risk(
+    min_score: Optional[float] = Query(None, ge=0, le=1, description="Defaults to the organization's at-risk threshold"),
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user_read)
+):
+    """Members most at risk of churning, from the latest scoring run"""
+    org_id = current_user.organization_id
+
+    scored_on = db.query(func.max(MemberRiskScore.scored_on)).filter(
+        MemberRiskScore.organization_id == org_id
+    ).scalar()
+    if scored_on is None:
+        return []
+
+    query = db.query(MemberRiskScore, User.first_name, User.last_name).join(
+        Member, Member.id == MemberRiskScore.member_id
+    ).join(
+        User, User.id == Member.user_id
+    ).filter(
+        MemberRiskScore.organization_id == org_id,
+        MemberRiskScore.scored_on == scored_on
+    )
+
+    if min_score is None:
+        query = query.filter(MemberRiskScore.at_risk == True)
+    else:
+        query = query.filter(MemberRiskScore.score >= min_score)
+
+    rows = query.order_by(MemberRiskScore.score.desc()).limit(limit).all()
+    today = local_now(current_user.organization.timezone).date()
+    return [
+        churn_prediction(score, f"{first_name} {last_name}", today)
+        for score, first_name, last_name in rows
+    ]
@@ -1,21 +1,39 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, and_
 from typing import List, Optional
 from uuid import UUID
-from datetime import datetime, date, timedelta
+from datetime import datetime, date
 
-from app.core.deps import get_db, get_current_active_user
+from app.core.deps import get_db, get_current_active_user, get_current_user_async, get_current_user_read, get_read_db
+from app.core.pagination import paginate
+from app.db.session import get_async_db
 from app.models.user import User
 from app.models.checkin import CheckIn
-from app.models.member import Member, MemberStatus
-from app.models.membership import Membership, MembershipStatus
+from app.models.attendance import MemberAttendance
+from app.models.member import Member
+from app.core.time_windows import day_window, today_window, since_window, to_naive_utc
+from app.core.time_buckets import local_hour
+from app.services.cache import analytics_cache, CHECK_INS
+from app.services.attendance import record_visit, attendance_summary
+from app.services.checkin_batch import sync_check_ins
+from app.services.occupancy import occupancy_counter, count_occupancy_async
+from app.services.eligibility import (
+    eligibility_cache,
+    get_eligibility_async,
+    ineligibility_reason,
+    with_open_check_in
+)
 from app.schemas.checkin import (
     CheckInCreate,
     CheckInUpdate,
     CheckInResponse,
+    CheckInBatch,
+    CheckInBatchResponse,
     QRCodeValidation,
     CheckInStats,
+    OccupancyResponse,
     MemberCheckInHistory
 )
 
@@ -23,85 +41,67 @@ router = APIRouter()
 
 
 @router.post("", response_model=CheckInResponse, status_code=status.HTTP_201_CREATED)
-def create_check_in(
+async def create_check_in(
     checkin_data: CheckInCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
 ):
     """Create a new check-in"""
-    # Verify member exists and belongs to organization
-    member = db.query(Member).filter(
-        Member.id == checkin_data.member_id,
-        Member.organization_id == current_user.organization_id
-    ).first()
+    tz = current_user.organization.timezone
 
-    if not member:
+    # Member status, membership windows and open check-in come from the eligibility
+    # cache, so a warm scan costs just the INSERT and the attendance upsert
+    entry = await get_eligibility_async(db, current_user.organization_id, tz, member_id=checkin_data.member_id)
+
+    if not entry:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Member not found"
         )
 
-    # Check if member is active
-    if member.status != MemberStatus.ACTIVE:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail=f"Member is {member.status.value}. Cannot check in."
-        )
-
-    # Check if member has active membership
-    active_membership = db.query(Membership).filter(
-        Membership.member_id == member.id,
-        Membership.status == MembershipStatus.ACTIVE,
-        Membership.start_date <= date.today(),
-        Membership.end_date >= date.today()
-    ).first()
-
-    if not active_membership:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="No active membership found for this member"
-        )
-
-    # Check if already checked in today and not checked out
-    existing_checkin = db.query(CheckIn).filter(
-        CheckIn.member_id == member.id,
-        CheckIn.check_out_time == None,
-        func.date(CheckIn.check_in_time) == date.today()
-    ).first()
-
-    if existing_checkin:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Member is already checked in. Please check out first."
-        )
+    reason = ineligibility_reason(entry, tz)
+    if reason:
+        raise HTTPException(status_code=reason[0], detail=reason[1])
 
     # Create check-in
     new_checkin = CheckIn(
         organization_id=current_user.organization_id,
-        **checkin_data.model_dump()
+        **checkin_data.model_dump(exclude={"check_in_time"}),
+        check_in_time=to_naive_utc(checkin_data.check_in_time)
     )
 
     db.add(new_checkin)
-    db.commit()
-    db.refresh(new_checkin)
+    await db.execute(record_visit(
+        current_user.organization_id, new_checkin.member_id, new_checkin.check_in_time, tz
+    ))
+    await db.commit()
+    await analytics_cache.invalidate_async(current_user.organization_id, CHECK_INS)
+    await eligibility_cache.store_async(
+        current_user.organization_id, with_open_check_in(entry, new_checkin.check_in_time)
+    )
+    await occupancy_counter.adjust_async(
+        current_user.organization_id, tz, [(new_checkin.check_in_time, new_checkin.location_id, 1)]
+    )
 
+    # All column defaults are client-side and the session does not expire on commit,
+    # so the instance is complete without a refresh
     return new_checkin
 
 
 @router.post("/qr-validate", response_model=CheckInResponse, status_code=status.HTTP_201_CREATED)
-def check_in_with_qr(
+async def check_in_with_qr(
     qr_data: QRCodeValidation,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
 ):
     """Check in a member using QR code"""
-    # Find member by QR code
-    member = db.query(Member).filter(
-        Member.qr_code == qr_data.qr_code,
-        Member.organization_id == current_user.organization_id
-    ).first()
+    # Resolve the QR code through the eligibility cache; create_check_in then finds
+    # the same entry in the in-process LRU
+    entry = await get_eligibility_async(
+        db, current_user.organization_id, current_user.organization.timezone, qr_code=qr_data.qr_code
+    )
 
-    if not member:
+    if not entry:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Invalid QR code"
@@ -110,24 +110,49 @@ def check_in_with_qr(
     # Create check-in using the standard create endpoint logic
     from app.models.checkin import CheckInMethod
     checkin_data = CheckInCreate(
-        member_id=member.id,
-        check_in_time=datetime.now(),
+        member_id=entry["member_id"],
+        check_in_time=datetime.utcnow(),
         method=CheckInMethod.QR,
         location_id=qr_data.location_id
     )
 
-    return create_check_in(checkin_data, db, current_user)
+    return await create_check_in(checkin_data, db, current_user)
+
+
+@router.post("/batch", response_model=CheckInBatchResponse)
+async def sync_check_in_batch(
+    batch: CheckInBatch,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    """Sync scans buffered offline by a kiosk; replays are deduplicated by idempotency key"""
+    results, member_ids = await sync_check_ins(
+        db, current_user.organization_id, batch.items, current_user.organization.timezone
+    )
+
+    if member_ids:
+        await analytics_cache.invalidate_async(current_user.organization_id, CHECK_INS)
+        await eligibility_cache.invalidate_async(current_user.organization_id, *member_ids)
+
+    return CheckInBatchResponse(
+        created=sum(1 for result in results if result["status"] == "created"),
+        duplicates=sum(1 for result in results if result["status"] == "duplicate"),
+        rejected=sum(1 for result in results if result["status"] == "rejected"),
+        results=results
+    )
 
 
 @router.get("", response_model=List[CheckInResponse])
 def get_check_ins(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
     member_id: Optional[UUID] = None,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user_read)
 ):
     """Get check-ins with filters"""
     query = db.query(CheckIn).filter(
@@ -138,72 +163,99 @@ def get_check_ins(
         query = query.filter(CheckIn.member_id == member_id)
 
     if start_date:
-        query = query.filter(func.date(CheckIn.check_in_time) >= start_date)
+        query = query.filter(
+            CheckIn.check_in_time >= day_window(start_date, current_user.organization.timezone).start
+        )
 
     if end_date:
-        query = query.filter(func.date(CheckIn.check_in_time) <= end_date)
+        query = query.filter(
+            CheckIn.check_in_time < day_window(end_date, current_user.organization.timezone).end
+        )
 
-    check_ins = query.order_by(CheckIn.check_in_time.desc()).offset(skip).limit(limit).all()
+    check_ins = paginate(
+        query, "check_ins", CheckIn.check_in_time, CheckIn.id, limit,
+        cursor=cursor, skip=skip, response=response
+    )
     return check_ins
 
 
 @router.get("/current", response_model=List[CheckInResponse])
-def get_current_check_ins(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+async def get_current_check_ins(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
 ):
     """Get all members currently checked in (no checkout time)"""
-    check_ins = db.query(CheckIn).filter(
-        CheckIn.organization_id == current_user.organization_id,
-        CheckIn.check_out_time == None,
-        func.date(CheckIn.check_in_time) == date.today()
-    ).all()
+    check_ins = (await db.execute(
+        select(CheckIn).where(
+            CheckIn.organization_id == current_user.organization_id,
+            CheckIn.check_out_time == None,
+            today_window(current_user.organization.timezone).clause(CheckIn.check_in_time)
+        )
+    )).scalars().all()
 
     return check_ins
 
 
+@router.get("/occupancy", response_model=OccupancyResponse)
+async def get_occupancy(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    """Live occupancy for the organization and per location"""
+    tz = current_user.organization.timezone
+    occupancy = await occupancy_counter.get_async(current_user.organization_id, tz)
+    if occupancy is None:
+        occupancy = await count_occupancy_async(db, current_user.organization_id, tz)
+
+    return OccupancyResponse(**occupancy)
+
+
 @router.get("/stats", response_model=CheckInStats)
-def get_check_in_stats(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+async def get_check_in_stats(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
 ):
     """Get check-in statistics"""
-    today = date.today()
+    tz = current_user.organization.timezone
+    window = today_window(tz)
 
     # Total check-ins today
-    total_today = db.query(func.count(CheckIn.id)).filter(
-        CheckIn.organization_id == current_user.organization_id,
-        func.date(CheckIn.check_in_time) == today
-    ).scalar() or 0
-
-    # Current occupancy
-    current_occupancy = db.query(func.count(CheckIn.id)).filter(
-        CheckIn.organization_id == current_user.organization_id,
-        CheckIn.check_out_time == None,
-        func.date(CheckIn.check_in_time) == today
-    ).scalar() or 0
-
-    # Peak hour (hour with most check-ins)
-    peak_hour_query = db.query(
-        func.extract('hour', CheckIn.check_in_time).label('hour'),
-        func.count(CheckIn.id).label('count')
-    ).filter(
-        CheckIn.organization_id == current_user.organization_id,
-        func.date(CheckIn.check_in_time) == today
-    ).group_by('hour').order_by(func.count(CheckIn.id).desc()).first()
+    total_today = (await db.execute(
+        select(func.count(CheckIn.id)).where(
+            CheckIn.organization_id == current_user.organization_id,
+            window.clause(CheckIn.check_in_time)
+        )
+    )).scalar() or 0
+
+    # Current occupancy from the live counters
+    occupancy = await occupancy_counter.get_async(current_user.organization_id, tz)
+    if occupancy is None:
+        occupancy = await count_occupancy_async(db, current_user.organization_id, tz)
+    current_occupancy = occupancy["total"]
+
+    # Peak hour (hour with most check-ins, bucketed in the organization's timezone)
+    hour = local_hour(CheckIn.check_in_time, tz).label('hour')
+    peak_hour_query = (await db.execute(
+        select(hour, func.count(CheckIn.id).label('count')).where(
+            CheckIn.organization_id == current_user.organization_id,
+            window.clause(CheckIn.check_in_time)
+        ).group_by(hour).order_by(func.count(CheckIn.id).desc()).limit(1)
+    )).first()
 
     peak_hour = f"{int(peak_hour_query[0])}:00" if peak_hour_query else None
 
     # Average duration
-    avg_duration_query = db.query(
-        func.avg(
-            func.extract('epoch', CheckIn.check_out_time - CheckIn.check_in_time) / 60
+    avg_duration_query = (await db.execute(
+        select(
+            func.avg(
+                func.extract('epoch', CheckIn.check_out_time - CheckIn.check_in_time) / 60
+            )
+        ).where(
+            CheckIn.organization_id == current_user.organization_id,
+            CheckIn.check_out_time != None,
+            CheckIn.check_in_time >= since_window(7, tz).start
         )
-    ).filter(
-        CheckIn.organization_id == current_user.organization_id,
-        CheckIn.check_out_time != None,
-        func.date(CheckIn.check_in_time) >= today - timedelta(days=7)
-    ).scalar()
+    )).scalar()
 
     avg_duration = float(avg_duration_query) if avg_duration_query else None
 
@@ -218,12 +270,15 @@ def get_check_in_stats(
 @router.get("/member/{member_id}", response_model=MemberCheckInHistory)
 def get_member_check_in_history(
     member_id: UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user_read)
 ):
     """Get check-in history for a specific member"""
-    # Verify member exists
-    member = db.query(Member).filter(
+    # Verify member exists and fetch the totals and streaks maintained as check-ins
+    # are created, in one row
+    member = db.query(Member.id, MemberAttendance).outerjoin(
+        MemberAttendance, MemberAttendance.member_id == Member.id
+    ).filter(
         Member.id == member_id,
         Member.organization_id == current_user.organization_id
     ).first()
@@ -234,23 +289,7 @@ def get_member_check_in_history(
             detail="Member not found"
         )
 
-    # Total visits
-    total_visits = db.query(func.count(CheckIn.id)).filter(
-        CheckIn.member_id == member_id
-    ).scalar() or 0
-
-    # Last visit
-    last_visit = db.query(func.max(CheckIn.check_in_time)).filter(
-        CheckIn.member_id == member_id
-    ).scalar()
-
-    # Average visits per week (last 12 weeks)
-    twelve_weeks_ago = datetime.now() - timedelta(weeks=12)
-    visits_last_12_weeks = db.query(func.count(CheckIn.id)).filter(
-        CheckIn.member_id == member_id,
-        CheckIn.check_in_time >= twelve_weeks_ago
-    ).scalar() or 0
-    avg_per_week = visits_last_12_weeks / 12
+    attendance = attendance_summary(member.MemberAttendance, current_user.organization.timezone)
 
     # Get recent check-ins
     recent_checkins = db.query(CheckIn).filter(
@@ -259,11 +298,7 @@ def get_member_check_in_history(
 
     return MemberCheckInHistory(
         member_id=member_id,
-        total_visits=total_visits,
-        last_visit=last_visit,
-        average_visits_per_week=avg_per_week,
-        current_streak=0,  # TODO: Calculate streak
-        longest_streak=0,  # TODO: Calculate streak
+        **attendance,
         check_ins=[CheckInResponse.from_orm(c) for c in recent_checkins]
     )
 
@@ -287,28 +322,41 @@ def update_check_in(
             detail="Check-in not found"
         )
 
+    was_open = checkin.check_out_time is None
+
     # Update fields
     update_data = checkin_data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(checkin, field, value)
 
+    is_open = checkin.check_out_time is None
+
     db.commit()
+    analytics_cache.invalidate(current_user.organization_id, CHECK_INS)
     db.refresh(checkin)
+    eligibility_cache.invalidate(current_user.organization_id, checkin.member_id)
+    if was_open != is_open:
+        occupancy_counter.adjust(
+            current_user.organization_id, current_user.organization.timezone,
+            [(checkin.check_in_time, checkin.location_id, 1 if is_open else -1)]
+        )
 
     return checkin
 
 
 @router.post("/{checkin_id}/checkout", response_model=CheckInResponse)
-def checkout(
+async def checkout(
     checkin_id: UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
 ):
     """Checkout a member"""
-    checkin = db.query(CheckIn).filter(
-        CheckIn.id == checkin_id,
-        CheckIn.organization_id == current_user.organization_id
-    ).first()
+    checkin = (await db.execute(
+        select(CheckIn).where(
+            CheckIn.id == checkin_id,
+            CheckIn.organization_id == current_user.organization_id
+        )
+    )).scalars().first()
 
     if not checkin:
         raise HTTPException(
@@ -322,8 +370,14 @@ def checkout(
             detail="Member already checked out"
         )
 
-    checkin.check_out_time = datetime.now()
-    db.commit()
-    db.refresh(checkin)
+    checkin.check_out_time = datetime.utcnow()
+    await db.commit()
+    await analytics_cache.invalidate_async(current_user.organization_id, CHECK_INS)
+    await eligibility_cache.invalidate_async(current_user.organization_id, checkin.member_id)
+    await occupancy_counter.adjust_async(
+        current_user.organization_id, current_user.organization.timezone,
+        [(checkin.check_in_time, checkin.location_id, -1)]
+    )
+    await db.refresh(checkin)
 
     return checkin
@@ -1,14 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, and_, func
 from typing import List, Optional
 from uuid import UUID
 from datetime import date, datetime
 
-from app.core.deps import get_db, get_current_active_user
+from app.core.deps import get_db, get_current_active_user, get_current_user_async, get_current_user_read, get_read_db
+from app.db.session import get_async_db
 from app.models.user import User
 from app.models.class_model import Class, ClassSchedule, ClassBooking, ClassStatus, BookingStatus
 from app.models.member import Member
+from app.services.cache import analytics_cache, CLASSES
 from app.schemas.class_schema import (
     ClassCreate,
     ClassUpdate,
@@ -31,8 +34,8 @@ def get_classes(
     limit: int = Query(100, ge=1, le=100),
     category: Optional[str] = None,
     instructor_id: Optional[UUID] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user_read)
 ):
     """Get all classes"""
     query = db.query(Class).filter(
@@ -69,6 +72,7 @@ def create_class(
 
     db.add(new_class)
     db.commit()
+    analytics_cache.invalidate(current_user.organization_id, CLASSES)
     db.refresh(new_class)
 
     return new_class
@@ -125,6 +129,7 @@ def update_class(
         setattr(class_obj, field, value)
 
     db.commit()
+    analytics_cache.invalidate(current_user.organization_id, CLASSES)
     db.refresh(class_obj)
 
     return class_obj
@@ -156,6 +161,7 @@ def delete_class(
 
     db.delete(class_obj)
     db.commit()
+    analytics_cache.invalidate(current_user.organization_id, CLASSES)
 
     return None
 
@@ -164,8 +170,8 @@ def delete_class(
 @router.get("/schedules/upcoming", response_model=List[ClassScheduleWithBookings])
 def get_upcoming_schedules(
     days: int = Query(7, ge=1, le=30),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user_read)
 ):
     """Get upcoming class schedules"""
     from datetime import timedelta
@@ -227,6 +233,7 @@ def create_schedule(
 
     db.add(new_schedule)
     db.commit()
+    analytics_cache.invalidate(current_user.organization_id, CLASSES)
     db.refresh(new_schedule)
 
     return new_schedule
@@ -262,6 +269,7 @@ def update_schedule(
         setattr(schedule, field, value)
 
     db.commit()
+    analytics_cache.invalidate(current_user.organization_id, CLASSES)
     db.refresh(schedule)
 
     # TODO: Send notifications to booked members if time/date changed
@@ -271,11 +279,11 @@ def update_schedule(
 
 # ===== CLASS BOOKINGS =====
 @router.post("/schedules/{schedule_id}/book", response_model=ClassBookingResponse)
-def book_class(
+async def book_class(
     schedule_id: UUID,
     member_id: Optional[UUID] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
 ):
     """Book a class for a member"""
     # If member_id not provided, book for current user (if they are a member)
@@ -286,21 +294,24 @@ def book_class(
                 detail="Member ID required for non-member users"
             )
 
-        member = db.query(Member).filter(Member.user_id == current_user.id).first()
-        if not member:
+        member_id = (await db.execute(
+            select(Member.id).where(Member.user_id == current_user.id)
+        )).scalars().first()
+        if not member_id:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Member profile not found"
             )
-        member_id = member.id
 
     # Verify schedule exists
-    schedule = db.query(ClassSchedule).options(
-        joinedload(ClassSchedule.class_obj)
-    ).filter(
-        ClassSchedule.id == schedule_id,
-        ClassSchedule.organization_id == current_user.organization_id
-    ).first()
+    schedule = (await db.execute(
+        select(ClassSchedule).options(
+            joinedload(ClassSchedule.class_obj)
+        ).where(
+            ClassSchedule.id == schedule_id,
+            ClassSchedule.organization_id == current_user.organization_id
+        )
+    )).scalars().first()
 
     if not schedule:
         raise HTTPException(
@@ -316,11 +327,13 @@ def book_class(
         )
 
     # Check if already booked
-    existing_booking = db.query(ClassBooking).filter(
-        ClassBooking.schedule_id == schedule_id,
-        ClassBooking.member_id == member_id,
-        ClassBooking.status.in_([BookingStatus.BOOKED, BookingStatus.WAITLISTED])
-    ).first()
+    existing_booking = (await db.execute(
+        select(ClassBooking.id).where(
+            ClassBooking.schedule_id == schedule_id,
+            ClassBooking.member_id == member_id,
+            ClassBooking.status.in_([BookingStatus.BOOKED, BookingStatus.WAITLISTED])
+        ).limit(1)
+    )).first()
 
     if existing_booking:
         raise HTTPException(
@@ -329,10 +342,12 @@ def book_class(
         )
 
     # Check capacity
-    current_bookings = db.query(func.count(ClassBooking.id)).filter(
-        ClassBooking.schedule_id == schedule_id,
-        ClassBooking.status == BookingStatus.BOOKED
-    ).scalar() or 0
+    current_bookings = (await db.execute(
+        select(func.count(ClassBooking.id)).where(
+            ClassBooking.schedule_id == schedule_id,
+            ClassBooking.status == BookingStatus.BOOKED
+        )
+    )).scalar() or 0
 
     # Determine booking status
     booking_status = BookingStatus.BOOKED
@@ -348,23 +363,26 @@ def book_class(
     )
 
     db.add(new_booking)
-    db.commit()
-    db.refresh(new_booking)
+    await db.commit()
+    await analytics_cache.invalidate_async(current_user.organization_id, CLASSES)
+    await db.refresh(new_booking)
 
     return new_booking
 
 
 @router.delete("/bookings/{booking_id}", status_code=status.HTTP_204_NO_CONTENT)
-def cancel_booking(
+async def cancel_booking(
     booking_id: UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
 ):
     """Cancel a class booking"""
-    booking = db.query(ClassBooking).filter(
-        ClassBooking.id == booking_id,
-        ClassBooking.organization_id == current_user.organization_id
-    ).first()
+    booking = (await db.execute(
+        select(ClassBooking).where(
+            ClassBooking.id == booking_id,
+            ClassBooking.organization_id == current_user.organization_id
+        )
+    )).scalars().first()
 
     if not booking:
         raise HTTPException(
@@ -374,8 +392,10 @@ def cancel_booking(
 
     # Check if user has permission to cancel
     if current_user.role == "member":
-        member = db.query(Member).filter(Member.user_id == current_user.id).first()
-        if not member or booking.member_id != member.id:
+        member_id = (await db.execute(
+            select(Member.id).where(Member.user_id == current_user.id)
+        )).scalars().first()
+        if not member_id or booking.member_id != member_id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Not authorized to cancel this booking"
@@ -384,7 +404,8 @@ def cancel_booking(
     booking.status = BookingStatus.CANCELLED
     booking.cancelled_at = datetime.now()
 
-    db.commit()
+    await db.commit()
+    await analytics_cache.invalidate_async(current_user.organization_id, CLASSES)
 
     # TODO: Promote from waitlist if applicable
 
@@ -394,8 +415,8 @@ def cancel_booking(
 @router.get("/my-bookings", response_model=List[ClassBookingResponse])
 def get_my_bookings(
     upcoming_only: bool = True,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user_read)
 ):
     """Get bookings for current member"""
     if current_user.role != "member":
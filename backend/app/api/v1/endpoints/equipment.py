@@ -3,7 +3,7 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 from uuid import UUID
 
-from app.core.deps import get_db, get_current_active_user
+from app.core.deps import get_db, get_current_active_user, get_current_user_read, get_read_db
 from app.models.user import User
 from app.models.equipment import Equipment, EquipmentStatus
 from app.schemas.equipment import (
@@ -22,8 +22,8 @@ def get_equipment(
     limit: int = Query(100, ge=1, le=100),
     status_filter: Optional[EquipmentStatus] = None,
     category: Optional[str] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user_read)
 ):
     """Get all equipment"""
     query = db.query(Equipment).filter(
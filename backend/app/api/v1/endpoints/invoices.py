@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime
 from uuid import UUID
 from app.db.session import get_db
-from app.core.deps import get_current_user
+from app.core.deps import get_current_user, get_current_user_read, get_read_db
+from app.core.pagination import paginate
 from app.models.user import User
 from app.models.payment import Invoice
 from app.models.member import Member
@@ -15,12 +16,14 @@ router = APIRouter()
 
 @router.get("/", response_model=List[InvoiceResponse])
 def get_invoices(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
     status: Optional[str] = None,
     member_id: Optional[UUID] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user_read)
 ):
     """Get all invoices for organization"""
     query = db.query(Invoice).filter(
@@ -33,7 +36,10 @@ def get_invoices(
     if member_id:
         query = query.filter(Invoice.member_id == member_id)
 
-    invoices = query.order_by(Invoice.created_at.desc()).offset(skip).limit(limit).all()
+    invoices = paginate(
+        query, "invoices", Invoice.created_at, Invoice.id, limit,
+        cursor=cursor, skip=skip, response=response
+    )
     return invoices
 
 
@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from uuid import UUID
 from datetime import date
 
-from app.core.deps import get_db, get_current_active_user
+from app.core.deps import get_db, get_current_active_user, get_current_user_read, get_read_db
+from app.core.pagination import paginate
 from app.models.user import User
 from app.models.lead import Lead, LeadStatus
 from app.models.member import Member
@@ -21,12 +22,14 @@ router = APIRouter()
 
 @router.get("", response_model=List[LeadResponse])
 def get_leads(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
     status_filter: Optional[LeadStatus] = None,
     assigned_to: Optional[UUID] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user_read)
 ):
     """Get all leads"""
     if current_user.role not in ["gym_owner", "admin", "receptionist", "super_admin"]:
@@ -45,7 +48,10 @@ def get_leads(
     if assigned_to:
         query = query.filter(Lead.assigned_to == assigned_to)
 
-    leads = query.order_by(Lead.created_at.desc()).offset(skip).limit(limit).all()
+    leads = paginate(
+        query, "leads", Lead.created_at, Lead.id, limit,
+        cursor=cursor, skip=skip, response=response
+    )
     return leads
 
 
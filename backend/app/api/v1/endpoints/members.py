@@ -1,12 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from uuid import UUID
 from app.db.session import get_db
-from app.core.deps import get_current_user, get_current_organization, require_role
+from app.core.deps import get_current_user, get_current_organization, require_role, get_current_user_read, get_read_db
+from app.core.pagination import paginate
 from app.models.user import User, UserRole
 from app.models.member import Member
 from app.models.organization import Organization
+from app.services.cache import analytics_cache, MEMBERS, MEMBERSHIPS, CHECK_INS, PAYMENTS
+from app.services.eligibility import eligibility_cache
 from app.schemas.member import MemberCreate, MemberUpdate, MemberResponse
 
 router = APIRouter()
@@ -39,6 +42,7 @@ def create_member(
 
     db.add(member)
     db.commit()
+    analytics_cache.invalidate(organization.id, MEMBERS)
     db.refresh(member)
 
     return member
@@ -46,16 +50,17 @@ def create_member(
 
 @router.get("/", response_model=List[MemberResponse])
 def list_members(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
     search: Optional[str] = Query(None, description="Search by name, email, or member ID"),
     status: Optional[str] = Query(None, description="Filter by status"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-    organization: Organization = Depends(get_current_organization)
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user_read)
 ):
     """List members with filtering and search"""
-    query = db.query(Member).filter(Member.organization_id == organization.id)
+    query = db.query(Member).filter(Member.organization_id == current_user.organization_id)
 
     if search:
         query = query.filter(Member.member_id.ilike(f"%{search}%"))
@@ -64,7 +69,10 @@ def list_members(
         from app.models.member import MemberStatus
         query = query.filter(Member.status == MemberStatus(status))
 
-    members = query.offset(skip).limit(limit).all()
+    members = paginate(
+        query, "members", Member.created_at, Member.id, limit,
+        cursor=cursor, skip=skip, response=response
+    )
     return members
 
 
@@ -131,6 +139,8 @@ def update_member(
         setattr(member, field, value)
 
     db.commit()
+    analytics_cache.invalidate(organization.id, MEMBERS)
+    eligibility_cache.invalidate(organization.id, member.id)
     db.refresh(member)
 
     return member
@@ -157,5 +167,8 @@ def delete_member(
 
     db.delete(member)
     db.commit()
+    # Deleting a member cascades to their memberships, check-ins and payments
+    analytics_cache.invalidate(organization.id, MEMBERS, MEMBERSHIPS, CHECK_INS, PAYMENTS)
+    eligibility_cache.invalidate(organization.id, member_id)
 
     return None
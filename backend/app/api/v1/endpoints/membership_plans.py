@@ -4,7 +4,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from uuid import UUID
 
-from app.core.deps import get_db, get_current_user, get_current_active_user
+from app.core.deps import get_db, get_current_active_user, get_current_user_read, get_read_db
 from app.models.user import User
 from app.models.membership import MembershipPlan
 from app.schemas.membership import (
@@ -21,8 +21,8 @@ def get_membership_plans(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
     is_active: Optional[bool] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user_read)
 ):
     """Get all membership plans for the organization"""
     query = db.query(MembershipPlan).filter(
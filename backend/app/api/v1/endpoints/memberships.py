@@ -1,13 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session, joinedload
 from typing import List, Optional
 from uuid import UUID
 from datetime import date
 
-from app.core.deps import get_db, get_current_active_user
+from app.core.deps import get_db, get_current_active_user, get_current_user_read, get_read_db
+from app.core.pagination import paginate
 from app.models.user import User
 from app.models.membership import Membership, MembershipStatus
 from app.models.member import Member
+from app.services.cache import analytics_cache, MEMBERSHIPS
+from app.services.eligibility import eligibility_cache
 from app.schemas.membership import (
     MembershipCreate,
     MembershipUpdate,
@@ -21,12 +24,14 @@ router = APIRouter()
 
 @router.get("", response_model=List[MembershipResponse])
 def get_memberships(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
     status_filter: Optional[MembershipStatus] = None,
     member_id: Optional[UUID] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user_read)
 ):
     """Get all memberships for the organization"""
     query = db.query(Membership).filter(
@@ -39,7 +44,10 @@ def get_memberships(
     if member_id:
         query = query.filter(Membership.member_id == member_id)
 
-    memberships = query.offset(skip).limit(limit).all()
+    memberships = paginate(
+        query, "memberships", Membership.created_at, Membership.id, limit,
+        cursor=cursor, skip=skip, response=response
+    )
     return memberships
 
 
@@ -76,7 +84,9 @@ def create_membership(
 
     db.add(new_membership)
     db.commit()
+    analytics_cache.invalidate(current_user.organization_id, MEMBERSHIPS)
     db.refresh(new_membership)
+    eligibility_cache.invalidate(current_user.organization_id, new_membership.member_id)
 
     return new_membership
 
@@ -134,7 +144,9 @@ def update_membership(
         setattr(membership, field, value)
 
     db.commit()
+    analytics_cache.invalidate(current_user.organization_id, MEMBERSHIPS)
     db.refresh(membership)
+    eligibility_cache.invalidate(current_user.organization_id, membership.member_id)
 
     return membership
 
@@ -174,7 +186,9 @@ def freeze_membership(
     membership.end_date = membership.end_date + timedelta(days=freeze_days)
 
     db.commit()
+    analytics_cache.invalidate(current_user.organization_id, MEMBERSHIPS)
     db.refresh(membership)
+    eligibility_cache.invalidate(current_user.organization_id, membership.member_id)
 
     return membership
 
@@ -204,7 +218,9 @@ def cancel_membership(
     membership.auto_renew = False
 
     db.commit()
+    analytics_cache.invalidate(current_user.organization_id, MEMBERSHIPS)
     db.refresh(membership)
+    eligibility_cache.invalidate(current_user.organization_id, membership.member_id)
 
     return membership
 
@@ -246,6 +262,8 @@ def renew_membership(
 
     db.add(new_membership)
     db.commit()
+    analytics_cache.invalidate(current_user.organization_id, MEMBERSHIPS)
     db.refresh(new_membership)
+    eligibility_cache.invalidate(current_user.organization_id, new_membership.member_id)
 
     return new_membership
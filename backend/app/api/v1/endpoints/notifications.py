@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime
 from uuid import UUID
 from app.db.session import get_db
-from app.core.deps import get_current_user
+from app.core.deps import get_current_user, get_current_user_read, get_read_db
+from app.core.pagination import paginate
 from app.models.user import User
 from app.models.notification import Notification
 from app.schemas.notification import (
@@ -19,13 +20,15 @@ router = APIRouter()
 
 @router.get("/", response_model=List[NotificationResponse])
 def get_notifications(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
     notification_type: Optional[str] = None,
     status: Optional[str] = None,
     user_id: Optional[UUID] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user_read)
 ):
     """Get all notifications for organization"""
     query = db.query(Notification).filter(
@@ -41,7 +44,10 @@ def get_notifications(
     if user_id:
         query = query.filter(Notification.user_id == user_id)
 
-    notifications = query.order_by(Notification.created_at.desc()).offset(skip).limit(limit).all()
+    notifications = paginate(
+        query, "notifications", Notification.created_at, Notification.id, limit,
+        cursor=cursor, skip=skip, response=response
+    )
     return notifications
 
 
@@ -260,8 +266,8 @@ def get_notification_templates(
 def get_notification_history(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user_read)
 ):
     """Get notification history with analytics"""
     notifications = db.query(Notification).filter(
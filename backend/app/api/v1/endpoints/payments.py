@@ -1,12 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from uuid import UUID
 from datetime import date
 
-from app.core.deps import get_db, get_current_active_user
+from app.core.deps import get_db, get_current_active_user, get_current_user_read, get_read_db
+from app.core.pagination import paginate
 from app.models.user import User
 from app.models.payment import Payment, Invoice, PaymentStatus, InvoiceStatus
+from app.services.cache import analytics_cache, PAYMENTS
 from app.schemas.payment import (
     PaymentCreate,
     PaymentUpdate,
@@ -22,14 +24,16 @@ router = APIRouter()
 # ===== PAYMENTS =====
 @router.get("", response_model=List[PaymentResponse])
 def get_payments(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
     status_filter: Optional[PaymentStatus] = None,
     member_id: Optional[UUID] = None,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user_read)
 ):
     """Get payments with filters"""
     query = db.query(Payment).filter(
@@ -48,7 +52,10 @@ def get_payments(
     if end_date:
         query = query.filter(Payment.payment_date <= end_date)
 
-    payments = query.order_by(Payment.payment_date.desc()).offset(skip).limit(limit).all()
+    payments = paginate(
+        query, "payments", Payment.payment_date, Payment.id, limit,
+        cursor=cursor, skip=skip, response=response
+    )
     return payments
 
 
@@ -72,6 +79,7 @@ def create_payment(
 
     db.add(new_payment)
     db.commit()
+    analytics_cache.invalidate(current_user.organization_id, PAYMENTS)
     db.refresh(new_payment)
 
     return new_payment
@@ -122,6 +130,7 @@ def update_payment(
         setattr(payment, field, value)
 
     db.commit()
+    analytics_cache.invalidate(current_user.organization_id, PAYMENTS)
     db.refresh(payment)
 
     return payment
@@ -129,8 +138,8 @@ def update_payment(
 
 @router.get("/pending/all", response_model=List[PaymentResponse])
 def get_pending_payments(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user_read)
 ):
     """Get all pending payments"""
     payments = db.query(Payment).filter(
@@ -149,8 +158,8 @@ def get_invoices(
     limit: int = Query(100, ge=1, le=100),
     status_filter: Optional[InvoiceStatus] = None,
     member_id: Optional[UUID] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user_read)
 ):
     """Get invoices with filters"""
     query = db.query(Invoice).filter(
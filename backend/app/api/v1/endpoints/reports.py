@@ -4,354 +4,325 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime, timedelta
 from uuid import UUID
-import io
-import csv
 from app.db.session import get_db
-from app.core.deps import get_current_user
-from app.models.user import User
-from app.models.member import Member
-from app.models.membership import Membership
-from app.models.payment import Payment
-from app.models.checkin import CheckIn
-from app.models.class_model import ClassSchedule, ClassBooking
+from app.core.deps import get_current_user, get_current_user_read, get_read_db, require_role
+from app.models.user import User, UserRole
+from app.models.report import Report, ReportStatus, ScheduledReport
+from app.services.reports import REPORT_DOMAINS, REPORT_DETAILS, build_report_header, build_report_details, create_report_job
+from app.services.report_export import EXPORT_FORMATS, export_response, format_row
+from app.services.columnar_export import COLUMNAR_FORMATS
+from app.services.scheduled_reports import is_valid_cron, next_run_at
+from app.services.storage import StorageFactory
+from app.services.cache import analytics_cache
+from app.core.time_windows import local_today
+from app.core.config import settings
+from app.schemas.report import (
+    ReportCreate, ReportResponse,
+    ScheduledReportCreate, ScheduledReportUpdate, ScheduledReportResponse
+)
+from app.tasks.reports import generate_report_artifact
 
 router = APIRouter()
 
+# Chunk size for streaming stored artifacts
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+
+def validate_report_options(report_type: str, format: str):
+    """Reject unknown report types/formats and columnar exports of summary-only reports"""
+    if report_type not in REPORT_DOMAINS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid report type: {report_type}"
+        )
+
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid report format: {format}"
+        )
+
+    if format in COLUMNAR_FORMATS and report_type not in REPORT_DETAILS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{report_type} reports have no detail rows to export as {format}"
+        )
+
 
 @router.post("/generate")
 def generate_report(
     report_type: str = Query(..., description="Type of report: membership, financial, attendance, performance"),
     start_date: Optional[datetime] = Query(None),
     end_date: Optional[datetime] = Query(None),
-    format: str = Query("json", description="Output format: json, csv, pdf"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    format: str = Query("json", description="Output format: json, csv, ndjson, parquet, arrow"),
+    compress: bool = Query(False, description="Gzip csv/ndjson exports"),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user_read)
 ):
     """Generate a report based on type and date range"""
     org_id = current_user.organization_id
+    tz = current_user.organization.timezone
+
+    if report_type not in REPORT_DOMAINS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid report type: {report_type}"
+        )
+
+    # Key the cache on what the caller asked for, not on the defaulted "now"
+    cache_params = {"day": local_today(tz), "start_date": start_date, "end_date": end_date}
 
     if not start_date:
         start_date = datetime.now() - timedelta(days=30)
     if not end_date:
         end_date = datetime.now()
 
-    if report_type == "membership":
-        return generate_membership_report(org_id, start_date, end_date, format, db)
-    elif report_type == "financial":
-        return generate_financial_report(org_id, start_date, end_date, format, db)
-    elif report_type == "attendance":
-        return generate_attendance_report(org_id, start_date, end_date, format, db)
-    elif report_type == "performance":
-        return generate_performance_report(org_id, start_date, end_date, format, db)
-    else:
+    if end_date - start_date > timedelta(days=settings.REPORT_INLINE_MAX_DAYS):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid report type: {report_type}"
+            detail=f"Reports over {settings.REPORT_INLINE_MAX_DAYS} days are generated in the background; "
+                   f"use POST /reports instead"
         )
 
+    def build_header(session: Session) -> dict:
+        return build_report_header(report_type, org_id, start_date, end_date, session, tz)
 
-def generate_membership_report(org_id: UUID, start_date: datetime, end_date: datetime, format: str, db: Session):
-    """Generate membership report"""
-    # Active memberships
-    active_memberships = db.query(Membership).filter(
-        Membership.organization_id == org_id,
-        Membership.status == "active"
-    ).all()
-
-    # New memberships in period
-    new_memberships = db.query(Membership).filter(
-        Membership.organization_id == org_id,
-        Membership.created_at.between(start_date, end_date)
-    ).all()
-
-    # Expired memberships in period
-    expired_memberships = db.query(Membership).filter(
-        Membership.organization_id == org_id,
-        Membership.status == "expired",
-        Membership.end_date.between(start_date, end_date)
-    ).all()
-
-    # Cancelled memberships in period
-    cancelled_memberships = db.query(Membership).filter(
-        Membership.organization_id == org_id,
-        Membership.status == "cancelled",
-        Membership.cancellation_date.between(start_date.date(), end_date.date())
-    ).all()
-
-    report_data = {
-        "report_type": "membership",
-        "start_date": start_date.isoformat(),
-        "end_date": end_date.isoformat(),
-        "summary": {
-            "total_active": len(active_memberships),
-            "new_memberships": len(new_memberships),
-            "expired_memberships": len(expired_memberships),
-            "cancelled_memberships": len(cancelled_memberships)
-        },
-        "details": {
-            "active_memberships": [
-                {
-                    "member_id": str(m.member_id),
-                    "plan_id": str(m.plan_id),
-                    "start_date": m.start_date.isoformat(),
-                    "end_date": m.end_date.isoformat(),
-                    "auto_renew": m.auto_renew
-                }
-                for m in active_memberships
-            ]
-        }
-    }
+    details = build_report_details(report_type, org_id, start_date, end_date, tz)
+    details_query = details[1] if details else None
+
+    if format in COLUMNAR_FORMATS and details is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{report_type} reports have no detail rows to export as {format}"
+        )
 
-    if format == "csv":
-        return export_to_csv(report_data, "membership_report")
+    # File exports are streamed row by row and not cached
+    if format in EXPORT_FORMATS:
+        return export_response(
+            current_user.id, build_header, details_query, format, f"{report_type}_report", compress
+        )
 
+    # Only the summary is cached; detail rows grow with the range and are read fresh
+    report_data = analytics_cache.get_or_compute(
+        org_id, f"reports:{report_type}", REPORT_DOMAINS[report_type], cache_params, lambda: build_header(db)
+    )
+    if details:
+        report_data["details"] = {
+            details[0]: [format_row(row) for row in db.execute(details_query)]
+        }
     return report_data
 
 
-def generate_financial_report(org_id: UUID, start_date: datetime, end_date: datetime, format: str, db: Session):
-    """Generate financial report"""
-    # Total revenue
-    total_revenue = db.query(Payment).filter(
-        Payment.organization_id == org_id,
-        Payment.status == "completed",
-        Payment.payment_date.between(start_date.date(), end_date.date())
-    ).all()
-
-    # Pending payments
-    pending_payments = db.query(Payment).filter(
-        Payment.organization_id == org_id,
-        Payment.status == "pending"
-    ).all()
-
-    # Overdue payments
-    overdue_payments = db.query(Payment).filter(
-        Payment.organization_id == org_id,
-        Payment.status == "pending",
-        Payment.due_date < datetime.now().date()
-    ).all()
-
-    # Revenue by payment method
-    from sqlalchemy import func
-    revenue_by_method = db.query(
-        Payment.payment_method,
-        func.sum(Payment.amount).label('total')
-    ).filter(
-        Payment.organization_id == org_id,
-        Payment.status == "completed",
-        Payment.payment_date.between(start_date.date(), end_date.date())
-    ).group_by(Payment.payment_method).all()
-
-    report_data = {
-        "report_type": "financial",
-        "start_date": start_date.isoformat(),
-        "end_date": end_date.isoformat(),
-        "summary": {
-            "total_revenue": sum(p.amount for p in total_revenue),
-            "total_payments": len(total_revenue),
-            "pending_payments": len(pending_payments),
-            "pending_amount": sum(p.amount for p in pending_payments),
-            "overdue_payments": len(overdue_payments),
-            "overdue_amount": sum(p.amount for p in overdue_payments)
-        },
-        "revenue_by_method": [
-            {"method": method, "amount": float(amount)}
-            for method, amount in revenue_by_method
-        ],
-        "details": {
-            "payments": [
-                {
-                    "payment_id": str(p.id),
-                    "member_id": str(p.member_id),
-                    "amount": float(p.amount),
-                    "payment_method": p.payment_method,
-                    "payment_date": p.payment_date.isoformat() if p.payment_date else None,
-                    "status": p.status
-                }
-                for p in total_revenue
-            ]
-        }
+@router.post("", response_model=ReportResponse, status_code=status.HTTP_202_ACCEPTED)
+def create_report(
+    report_data: ReportCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Queue a report for background generation (reuses a fresh identical report)"""
+    validate_report_options(report_data.report_type, report_data.format)
+
+    tz = current_user.organization.timezone
+    params = {
+        "day": local_today(tz),
+        "start_date": report_data.start_date,
+        "end_date": report_data.end_date
     }
 
-    if format == "csv":
-        return export_to_csv(report_data, "financial_report")
+    start_date = report_data.start_date or datetime.now() - timedelta(days=30)
+    end_date = report_data.end_date or datetime.now()
 
-    return report_data
+    report, created = create_report_job(
+        db, current_user.organization_id, current_user.id, report_data.report_type,
+        report_data.format, report_data.compress, start_date, end_date, params
+    )
 
+    if created:
+        generate_report_artifact.delay(str(report.id))
 
-def generate_attendance_report(org_id: UUID, start_date: datetime, end_date: datetime, format: str, db: Session):
-    """Generate attendance report"""
-    # Total check-ins
-    checkins = db.query(CheckIn).filter(
-        CheckIn.organization_id == org_id,
-        CheckIn.check_in_time.between(start_date, end_date)
-    ).all()
-
-    # Unique members who checked in
-    unique_members = db.query(CheckIn.member_id).filter(
-        CheckIn.organization_id == org_id,
-        CheckIn.check_in_time.between(start_date, end_date)
-    ).distinct().count()
-
-    # Daily breakdown
-    from sqlalchemy import func
-    daily_checkins = db.query(
-        func.date(CheckIn.check_in_time).label('date'),
-        func.count(CheckIn.id).label('count')
-    ).filter(
-        CheckIn.organization_id == org_id,
-        CheckIn.check_in_time.between(start_date, end_date)
-    ).group_by(func.date(CheckIn.check_in_time)).all()
-
-    report_data = {
-        "report_type": "attendance",
-        "start_date": start_date.isoformat(),
-        "end_date": end_date.isoformat(),
-        "summary": {
-            "total_checkins": len(checkins),
-            "unique_members": unique_members,
-            "average_daily_checkins": len(checkins) / max((end_date - start_date).days, 1)
-        },
-        "daily_breakdown": [
-            {"date": date.isoformat(), "count": count}
-            for date, count in daily_checkins
-        ],
-        "details": {
-            "checkins": [
-                {
-                    "checkin_id": str(c.id),
-                    "member_id": str(c.member_id),
-                    "check_in_time": c.check_in_time.isoformat(),
-                    "check_out_time": c.check_out_time.isoformat() if c.check_out_time else None,
-                    "method": c.method
-                }
-                for c in checkins
-            ]
-        }
-    }
+    return report
 
-    if format == "csv":
-        return export_to_csv(report_data, "attendance_report")
 
-    return report_data
+def get_schedule_or_404(db: Session, schedule_id: UUID, org_id: UUID) -> ScheduledReport:
+    """Fetch one of the organization's scheduled reports"""
+    schedule = db.query(ScheduledReport).filter(
+        ScheduledReport.id == schedule_id,
+        ScheduledReport.organization_id == org_id
+    ).first()
 
+    if not schedule:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Scheduled report not found"
+        )
+    return schedule
 
-def generate_performance_report(org_id: UUID, start_date: datetime, end_date: datetime, format: str, db: Session):
-    """Generate performance report"""
-    from sqlalchemy import func
-
-    # Class performance
-    class_bookings = db.query(
-        ClassSchedule.id,
-        func.count(ClassBooking.id).label('total_bookings'),
-        func.sum(func.case((ClassBooking.status == 'attended', 1), else_=0)).label('attended'),
-        func.sum(func.case((ClassBooking.status == 'no_show', 1), else_=0)).label('no_shows')
-    ).join(ClassBooking).filter(
-        ClassSchedule.organization_id == org_id,
-        ClassSchedule.scheduled_date.between(start_date.date(), end_date.date())
-    ).group_by(ClassSchedule.id).all()
-
-    # Membership retention
-    total_members_start = db.query(Membership).filter(
-        Membership.organization_id == org_id,
-        Membership.created_at < start_date
-    ).count()
-
-    cancelled_in_period = db.query(Membership).filter(
-        Membership.organization_id == org_id,
-        Membership.status == "cancelled",
-        Membership.cancellation_date.between(start_date.date(), end_date.date())
-    ).count()
-
-    retention_rate = ((total_members_start - cancelled_in_period) / total_members_start * 100) if total_members_start > 0 else 0
-
-    report_data = {
-        "report_type": "performance",
-        "start_date": start_date.isoformat(),
-        "end_date": end_date.isoformat(),
-        "summary": {
-            "class_performance": {
-                "total_classes": len(class_bookings),
-                "total_bookings": sum(cb.total_bookings for cb in class_bookings),
-                "total_attended": sum(cb.attended for cb in class_bookings),
-                "total_no_shows": sum(cb.no_shows for cb in class_bookings),
-                "attendance_rate": (sum(cb.attended for cb in class_bookings) / sum(cb.total_bookings for cb in class_bookings) * 100) if sum(cb.total_bookings for cb in class_bookings) > 0 else 0
-            },
-            "membership_retention": {
-                "members_at_start": total_members_start,
-                "cancelled_in_period": cancelled_in_period,
-                "retention_rate": retention_rate
-            }
-        }
-    }
 
-    if format == "csv":
-        return export_to_csv(report_data, "performance_report")
+def validate_cron(cron: str):
+    """Reject anything but a standard 5-field cron expression"""
+    if not is_valid_cron(cron):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid cron expression: {cron}"
+        )
+
 
-    return report_data
+@router.get("/scheduled", response_model=List[ScheduledReportResponse])
+def get_scheduled_reports(
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(require_role([UserRole.GYM_OWNER, UserRole.ADMIN], get_current_user_read))
+):
+    """Get list of scheduled reports"""
+    return db.query(ScheduledReport).filter(
+        ScheduledReport.organization_id == current_user.organization_id
+    ).order_by(ScheduledReport.created_at).all()
 
 
-def export_to_csv(data: dict, filename: str):
-    """Export report data to CSV format"""
-    output = io.StringIO()
-    writer = csv.writer(output)
+@router.post("/scheduled", response_model=ScheduledReportResponse, status_code=status.HTTP_201_CREATED)
+def create_scheduled_report(
+    schedule_data: ScheduledReportCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_role([UserRole.GYM_OWNER, UserRole.ADMIN]))
+):
+    """Schedule a report to be generated on a cron schedule and emailed to recipients"""
+    validate_report_options(schedule_data.report_type, schedule_data.format)
+    validate_cron(schedule_data.cron)
+
+    schedule = ScheduledReport(
+        **schedule_data.dict(),
+        organization_id=current_user.organization_id,
+        created_by=current_user.id,
+        next_run_at=next_run_at(schedule_data.cron, current_user.organization.timezone)
+    )
+    db.add(schedule)
+    db.commit()
+    db.refresh(schedule)
 
-    # Write summary section
-    writer.writerow(["Report Type", data["report_type"]])
-    writer.writerow(["Start Date", data["start_date"]])
-    writer.writerow(["End Date", data["end_date"]])
-    writer.writerow([])
+    return schedule
 
-    # Write summary data
-    writer.writerow(["Summary"])
-    for key, value in data["summary"].items():
-        writer.writerow([key, value])
 
-    output.seek(0)
+@router.get("/scheduled/{schedule_id}", response_model=ScheduledReportResponse)
+def get_scheduled_report(
+    schedule_id: UUID,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(require_role([UserRole.GYM_OWNER, UserRole.ADMIN], get_current_user_read))
+):
+    """Get a scheduled report by ID"""
+    return get_schedule_or_404(db, schedule_id, current_user.organization_id)
 
-    return StreamingResponse(
-        iter([output.getvalue()]),
-        media_type="text/csv",
-        headers={"Content-Disposition": f"attachment; filename={filename}_{datetime.now().strftime('%Y%m%d')}.csv"}
+
+@router.put("/scheduled/{schedule_id}", response_model=ScheduledReportResponse)
+def update_scheduled_report(
+    schedule_id: UUID,
+    schedule_update: ScheduledReportUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_role([UserRole.GYM_OWNER, UserRole.ADMIN]))
+):
+    """Update a scheduled report"""
+    schedule = get_schedule_or_404(db, schedule_id, current_user.organization_id)
+
+    update_data = schedule_update.dict(exclude_unset=True)
+    validate_report_options(
+        update_data.get("report_type", schedule.report_type),
+        update_data.get("format", schedule.format)
     )
+    if "cron" in update_data:
+        validate_cron(update_data["cron"])
 
+    for field, value in update_data.items():
+        setattr(schedule, field, value)
 
-@router.get("/scheduled")
-def get_scheduled_reports(
+    # Re-arm from now when the timing changes or a paused schedule is resumed
+    if "cron" in update_data or update_data.get("is_active"):
+        schedule.next_run_at = next_run_at(schedule.cron, current_user.organization.timezone)
+
+    db.commit()
+    db.refresh(schedule)
+
+    return schedule
+
+
+@router.delete("/scheduled/{schedule_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_scheduled_report(
+    schedule_id: UUID,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(require_role([UserRole.GYM_OWNER, UserRole.ADMIN]))
 ):
-    """Get list of scheduled reports"""
-    # TODO: Implement scheduled reports storage and retrieval
-    return {
-        "message": "Scheduled reports feature coming soon",
-        "scheduled_reports": []
-    }
+    """Delete a scheduled report"""
+    schedule = get_schedule_or_404(db, schedule_id, current_user.organization_id)
 
+    db.delete(schedule)
+    db.commit()
 
-@router.get("/{report_id}")
+    return None
+
+
+@router.get("/{report_id}", response_model=ReportResponse)
 def get_report(
     report_id: UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user_read)
 ):
-    """Get a previously generated report"""
-    # TODO: Implement report storage and retrieval
-    raise HTTPException(
-        status_code=status.HTTP_404_NOT_FOUND,
-        detail="Report not found"
-    )
+    """Get a report job's status and progress"""
+    report = db.query(Report).filter(
+        Report.id == report_id,
+        Report.organization_id == current_user.organization_id
+    ).first()
+
+    if not report:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Report not found"
+        )
+
+    return report
 
 
 @router.get("/{report_id}/download")
 def download_report(
     report_id: UUID,
-    format: str = Query("pdf", description="Download format: pdf, csv, excel"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user_read)
 ):
-    """Download a report in specified format"""
-    # TODO: Implement report download in multiple formats
-    raise HTTPException(
-        status_code=status.HTTP_404_NOT_FOUND,
-        detail="Report not found"
+    """Stream a generated report artifact"""
+    report = db.query(Report).filter(
+        Report.id == report_id,
+        Report.organization_id == current_user.organization_id
+    ).first()
+
+    if not report:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Report not found"
+        )
+
+    if report.status != ReportStatus.COMPLETED or not report.file_url:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Report is {report.status.value}"
+        )
+
+    storage = StorageFactory.get_storage(settings.REPORT_STORAGE_BACKEND)
+    try:
+        artifact = storage.open(report.file_url)
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Report file no longer available"
+        )
+
+    def chunks():
+        try:
+            while True:
+                chunk = artifact.read(DOWNLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            artifact.close()
+
+    return StreamingResponse(
+        chunks(),
+        media_type=report.content_type or "application/octet-stream",
+        headers={"Content-Disposition": f"attachment; filename={report.file_name}"}
     )
@@ -3,7 +3,7 @@ from sqlalchemy.orm import Session, joinedload
 from typing import List
 from uuid import UUID
 
-from app.core.deps import get_db, get_current_active_user
+from app.core.deps import get_db, get_current_active_user, get_current_user_read, get_read_db
 from app.core.security import get_password_hash
 from app.models.user import User, UserRole
 from app.models.trainer import Trainer
@@ -21,8 +21,8 @@ router = APIRouter()
 def get_trainers(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user_read)
 ):
     """Get all trainers"""
     trainers = db.query(Trainer).options(
@@ -1,6 +1,11 @@
 from celery import Celery
 from celery.schedules import crontab
+from celery.signals import task_prerun, task_postrun
 from app.core.config import settings
+from app.db import query_stats
+import logging
+
+logger = logging.getLogger(__name__)
 
 # Create Celery app
 celery_app = Celery(
@@ -40,16 +45,56 @@ celery_app.conf.beat_schedule = {
         "task": "app.tasks.memberships.check_expiring_memberships",
         "schedule": crontab(hour=8, minute=0),
     },
-    # Send class reminders every hour
+    # Send birthday wishes daily at 9 AM
+    "send-birthday-wishes": {
+        "task": "app.tasks.notifications.send_birthday_wishes",
+        "schedule": crontab(hour=9, minute=0),
+    },
+    # Send class reminders for classes starting soon
     "send-class-reminders": {
         "task": "app.tasks.notifications.send_class_reminders",
-        "schedule": crontab(minute=0),  # Every hour
+        "schedule": crontab(minute="*/5"),
     },
     # Update analytics weekly on Sunday at 1 AM
     "update-analytics": {
         "task": "app.tasks.analytics.update_weekly_analytics",
         "schedule": crontab(hour=1, minute=0, day_of_week=0),
     },
+    # Score churn risk daily at 5 AM
+    "predict-churn-risk": {
+        "task": "app.tasks.analytics.predict_churn_risk",
+        "schedule": crontab(hour=5, minute=0),
+    },
+    # Close out analytics rollups for recent days every hour
+    "update-daily-rollups": {
+        "task": "app.tasks.analytics.update_daily_rollups",
+        "schedule": crontab(minute=15),
+    },
+    # Delete report artifacts past their retention period
+    "purge-expired-reports": {
+        "task": "app.tasks.reports.purge_expired_reports",
+        "schedule": crontab(hour=3, minute=30),
+    },
+    # Correct drift in the live occupancy counters
+    "reconcile-occupancy": {
+        "task": "app.tasks.checkins.reconcile_occupancy",
+        "schedule": crontab(minute="*/5"),
+    },
+    # Close check-ins members forgot to check out of
+    "auto-checkout-stale-check-ins": {
+        "task": "app.tasks.checkins.auto_checkout_stale_check_ins",
+        "schedule": crontab(minute="*/15"),
+    },
+    # Create upcoming check_ins partitions and archive expired ones
+    "maintain-partitions": {
+        "task": "app.tasks.maintenance.maintain_partitions",
+        "schedule": crontab(hour=4, minute=0),
+    },
+    # Start due scheduled reports for all organizations
+    "dispatch-scheduled-reports": {
+        "task": "app.tasks.reports.dispatch_scheduled_reports",
+        "schedule": crontab(),  # Every minute
+    },
     # Check inactive members weekly
     "check-inactive-members": {
         "task": "app.tasks.memberships.check_inactive_members",
@@ -57,5 +102,19 @@ celery_app.conf.beat_schedule = {
     },
 }
 
+
+# Count SQL statements per task and warn about N+1 patterns
+@task_prerun.connect
+def start_task_query_stats(task=None, **kwargs):
+    query_stats.begin(task.name)
+
+
+@task_postrun.connect
+def finish_task_query_stats(task=None, **kwargs):
+    stats = query_stats.finish()
+    if stats is not None:
+        logger.info(f"Task {stats.name} ran {stats.count} queries in {stats.duration_ms:.0f}ms")
+
+
 # Import tasks to register them
-from app.tasks import payments, notifications, memberships, analytics
+from app.tasks import payments, notifications, memberships, analytics, reports, checkins, maintenance
@@ -15,13 +15,76 @@ class Settings(BaseSettings):
     # Server
     HOST: str = "0.0.0.0"
     PORT: int = 8000
+    # Externally reachable base URL, used for links in emails
+    PUBLIC_API_URL: str = "http://localhost:8000"
 
     # Database
     DATABASE_URL: str
     DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    ASYNC_DB_POOL_SIZE: int = 20
+    ASYNC_DB_MAX_OVERFLOW: int = 20
+
+    # Read replicas (comma-separated URLs; empty routes all reads to the primary)
+    DATABASE_REPLICA_URLS: str = ""
+    REPLICA_STICKY_SECONDS: int = 5
+    REPLICA_RETRY_SECONDS: int = 30
+
+    # Query instrumentation
+    QUERY_STATS_ENABLED: bool = True
+    QUERY_N_PLUS_ONE_THRESHOLD: int = 10
 
     # Redis
     REDIS_URL: str
+    REDIS_SOCKET_TIMEOUT: float = 0.5
+
+    # Analytics cache
+    ANALYTICS_CACHE_ENABLED: bool = True
+    ANALYTICS_CACHE_TTL_SECONDS: int = 300
+    ANALYTICS_CACHE_TTL_JITTER: float = 0.1
+    ANALYTICS_CACHE_LOCK_SECONDS: int = 30
+    ANALYTICS_CACHE_WAIT_SECONDS: float = 5.0
+
+    # Check-in eligibility cache (Redis, fronted by a short-lived in-process LRU)
+    ELIGIBILITY_CACHE_ENABLED: bool = True
+    ELIGIBILITY_CACHE_TTL_SECONDS: int = 172800
+    ELIGIBILITY_LOCAL_CACHE_SIZE: int = 10000
+    ELIGIBILITY_LOCAL_TTL_SECONDS: float = 5.0
+
+    # Live occupancy counters (one Redis hash per organization and local day)
+    OCCUPANCY_KEY_TTL_SECONDS: int = 172800
+
+    # Auto-checkout (organizations override the limit with settings["max_session_minutes"]; 0 disables)
+    AUTO_CHECKOUT_MAX_SESSION_MINUTES: int = 240
+    AUTO_CHECKOUT_BATCH_SIZE: int = 5000
+
+    # Member ids per batched notification subtask
+    NOTIFICATION_BATCH_SIZE: int = 500
+
+    # Class reminders go out this many minutes before a class starts
+    CLASS_REMINDER_LEAD_MINUTES: int = 30
+
+    # Recurring payments (renewals per chord batch, concurrent gateway calls per batch)
+    RECURRING_PAYMENT_BATCH_SIZE: int = 500
+    RECURRING_PAYMENT_CONCURRENCY: int = 8
+    RECURRING_PAYMENT_MAX_RETRIES: int = 3
+
+    # Re-engagement emails for members with no recent check-ins
+    INACTIVE_MEMBER_DAYS: int = 14
+    REENGAGEMENT_COOLDOWN_DAYS: int = 6
+    REENGAGEMENT_BATCH_SIZE: int = 500
+    REENGAGEMENT_STALE_MINUTES: int = 60
+
+    # Churn risk scoring (organizations override with settings["churn_risk_threshold"] / ["churn_weights"])
+    CHURN_RISK_THRESHOLD: float = 0.5
+    CHURN_SCORE_BATCH_SIZE: int = 5000
+    CHURN_SCORE_RETENTION_DAYS: int = 365
+
+    # Monthly table partitions (archiving is off while PARTITION_ARCHIVE_AFTER_MONTHS is 0)
+    PARTITION_MONTHS_AHEAD: int = 3
+    PARTITION_ARCHIVE_AFTER_MONTHS: int = 0
+    PARTITION_ARCHIVE_STORAGE_BACKEND: str = "local"
 
     # JWT
     JWT_SECRET_KEY: str
@@ -61,6 +124,9 @@ class Settings(BaseSettings):
     AWS_REGION: str = "us-east-1"
     AWS_S3_BUCKET: str = "fitflow-uploads"
 
+    # Local file storage
+    LOCAL_STORAGE_PATH: str = "./storage"
+
     # Cloudinary
     CLOUDINARY_CLOUD_NAME: str = ""
     CLOUDINARY_API_KEY: str = ""
@@ -73,6 +139,23 @@ class Settings(BaseSettings):
     RATE_LIMIT_PER_MINUTE: int = 60
     RATE_LIMIT_PER_HOUR: int = 1000
 
+    # Analytics rollups
+    ROLLUP_REFRESH_DAYS: int = 3
+    ROLLUP_BACKFILL_CHUNK_DAYS: int = 31
+
+    # Report exports (rows fetched per server-side cursor batch)
+    REPORT_EXPORT_BATCH_SIZE: int = 2000
+    # Longest range /reports/generate builds in the request; longer ones go through POST /reports
+    REPORT_INLINE_MAX_DAYS: int = 93
+
+    # Report jobs
+    REPORT_STORAGE_BACKEND: str = "local"
+    REPORT_REUSE_SECONDS: int = 900
+    REPORT_RETENTION_DAYS: int = 7
+
+    # Scheduled reports (dispatch rate is multiplied by the number of healthy replicas)
+    SCHEDULED_REPORTS_PER_MINUTE_PER_REPLICA: int = 30
+
     # Celery
     CELERY_BROKER_URL: str = "redis://localhost:6379/0"
     CELERY_RESULT_BACKEND: str = "redis://localhost:6379/0"
@@ -85,6 +168,10 @@ class Settings(BaseSettings):
     def cors_origins_list(self) -> List[str]:
         return [origin.strip() for origin in self.CORS_ORIGINS.split(",")]
 
+    @property
+    def database_replica_urls_list(self) -> List[str]:
+        return [url.strip() for url in self.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+
 
 @lru_cache()
 def get_settings() -> Settings:
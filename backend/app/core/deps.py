@@ -1,9 +1,11 @@
 from typing import Generator, Optional
 from fastapi import Depends, HTTPException, status, Header
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.ext.asyncio import AsyncSession
 from jose import JWTError, jwt
-from app.db.session import get_db
+from app.db.session import get_db, get_async_db, db_router
 from app.core.config import settings
 from app.core.security import decode_token
 from app.models.user import User
@@ -13,28 +15,31 @@ from uuid import UUID
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_PREFIX}/auth/login")
 
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
-    """Get current authenticated user"""
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+
+def get_token_user_id(token: str = Depends(oauth2_scheme)) -> UUID:
+    """User id from the access token, without touching the database"""
     payload = decode_token(token)
     if payload is None:
-        raise credentials_exception
+        raise _credentials_exception()
 
     user_id: str = payload.get("sub")
     if user_id is None:
-        raise credentials_exception
+        raise _credentials_exception()
+
+    return UUID(user_id)
 
-    user = db.query(User).filter(User.id == UUID(user_id)).first()
+
+def _load_user(db: Session, user_id: UUID) -> User:
+    user = db.query(User).filter(User.id == user_id).first()
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
 
     if not user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
@@ -42,6 +47,19 @@ def get_current_user(
     return user
 
 
+def get_current_user(
+    user_id: UUID = Depends(get_token_user_id),
+    db: Session = Depends(get_db)
+) -> User:
+    """Get current authenticated user"""
+    user = _load_user(db, user_id)
+
+    # Lets get_db pin this user's reads to the primary after a write
+    db.info["user_id"] = user.id
+
+    return user
+
+
 def get_current_active_user(
     current_user: User = Depends(get_current_user),
 ) -> User:
@@ -51,6 +69,67 @@ def get_current_active_user(
     return current_user
 
 
+async def _load_user_async(db: AsyncSession, user_id: UUID) -> User:
+    # Lazy loads are not allowed on async sessions, so load the organization up front
+    result = await db.execute(
+        select(User).options(joinedload(User.organization)).where(User.id == user_id)
+    )
+    user = result.scalar_one_or_none()
+    if user is None:
+        raise _credentials_exception()
+
+    if not user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+
+    return user
+
+
+async def get_current_user_async(
+    user_id: UUID = Depends(get_token_user_id),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    """Get current authenticated user on the async session (organization eagerly loaded)"""
+    user = await _load_user_async(db, user_id)
+
+    db.info["user_id"] = user.id
+
+    return user
+
+
+def get_read_db(user_id: UUID = Depends(get_token_user_id)) -> Generator:
+    """Dependency for a read-only session, served by a replica when one is available"""
+    db = db_router.read_session(user_id)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db(user_id: UUID = Depends(get_token_user_id)):
+    """Async variant of get_read_db"""
+    db = await db_router.read_session_async(user_id)
+    try:
+        yield db
+    finally:
+        await db.close()
+
+
+def get_current_user_read(
+    user_id: UUID = Depends(get_token_user_id),
+    db: Session = Depends(get_read_db)
+) -> User:
+    """Current user loaded on the request's read session, so read-only endpoints never open a primary session"""
+    return _load_user(db, user_id)
+
+
+async def get_current_user_read_async(
+    user_id: UUID = Depends(get_token_user_id),
+    db: AsyncSession = Depends(get_async_read_db)
+) -> User:
+    """Async variant of get_current_user_read"""
+    return await _load_user_async(db, user_id)
+
+
 def get_current_organization(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -69,9 +148,9 @@ def get_current_organization(
     return organization
 
 
-def require_role(required_roles: list):
+def require_role(required_roles: list, user_dependency=get_current_user):
     """Dependency to check if user has required role"""
-    def role_checker(current_user: User = Depends(get_current_user)) -> User:
+    def role_checker(current_user: User = Depends(user_dependency)) -> User:
         if current_user.role not in required_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
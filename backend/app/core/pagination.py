@@ -0,0 +1,100 @@
+from datetime import date, datetime
+from typing import Any, List, Optional
+from uuid import UUID
+import base64
+import hashlib
+import hmac
+import json
+from fastapi import HTTPException, Response, status
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query as OrmQuery
+from app.core.config import settings
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def _sign(scope: str, payload: bytes) -> bytes:
+    return hmac.new(settings.SECRET_KEY.encode(), scope.encode() + b"." + payload, hashlib.sha256).digest()[:16]
+
+
+def encode_cursor(scope: str, values: List[Any]) -> str:
+    """Encode keyset values as an opaque cursor signed for one list endpoint"""
+    payload = json.dumps(
+        [value.isoformat() if isinstance(value, (date, datetime)) else str(value) for value in values]
+    ).encode()
+    return f"{_b64encode(payload)}.{_b64encode(_sign(scope, payload))}"
+
+
+def decode_cursor(scope: str, cursor: str, columns: List[Any]) -> List[Any]:
+    """Verify a cursor and convert its values back to the types of the keyset columns"""
+    invalid = HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    try:
+        payload_text, signature_text = cursor.split(".", 1)
+        payload = _b64decode(payload_text)
+        if not hmac.compare_digest(_b64decode(signature_text), _sign(scope, payload)):
+            raise invalid
+        raw_values = json.loads(payload)
+        if len(raw_values) != len(columns):
+            raise invalid
+
+        values = []
+        for column, raw in zip(columns, raw_values):
+            python_type = column.type.python_type
+            if python_type is datetime:
+                values.append(datetime.fromisoformat(raw))
+            elif python_type is date:
+                values.append(date.fromisoformat(raw))
+            elif python_type is UUID:
+                values.append(UUID(raw))
+            else:
+                values.append(python_type(raw))
+        return values
+    except (ValueError, TypeError, NotImplementedError):
+        raise invalid
+
+
+def paginate(
+    query: OrmQuery,
+    scope: str,
+    sort_column,
+    id_column,
+    limit: int,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    response: Optional[Response] = None
+) -> list:
+    """
+    Newest-first keyset pagination over (sort_column, id_column).
+
+    With a cursor the page starts strictly after the cursor's row, so deep pages cost
+    the same as the first one. Without a cursor, `skip` keeps working as the offset
+    fallback. When another page exists its cursor is returned in the X-Next-Cursor
+    header, keeping the list response bodies unchanged.
+    """
+    if cursor:
+        sort_value, id_value = decode_cursor(scope, cursor, [sort_column, id_column])
+        query = query.filter(tuple_(sort_column, id_column) < tuple_(sort_value, id_value))
+
+    # ORDER BY has to be applied before OFFSET/LIMIT on a legacy Query
+    query = query.order_by(sort_column.desc(), id_column.desc())
+    if not cursor and skip:
+        query = query.offset(skip)
+
+    rows = query.limit(limit + 1).all()
+
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(scope, [getattr(last, sort_column.key), getattr(last, id_column.key)])
+        if response is not None:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+    return rows
@@ -0,0 +1,45 @@
+from datetime import timedelta
+from sqlalchemy import func, cast, extract, literal, Date, Integer
+from sqlalchemy.sql.elements import ColumnElement
+from app.core.time_windows import get_timezone
+
+# Widest offset from UTC of any real timezone (Pacific/Kiritimati is +14, Etc/GMT+12 is -12).
+# Used to widen a UTC range so it covers the same local days in every tenant's zone.
+MAX_UTC_OFFSET = timedelta(hours=14)
+
+
+def tz_expression(tz=None) -> ColumnElement:
+    """
+    SQL expression for a timezone name.
+
+    Accepts a timezone name (normalized through pytz) or a column such as
+    Organization.timezone, in which case NULLs fall back to UTC.
+    """
+    if tz is None or isinstance(tz, str):
+        return literal(get_timezone(tz).zone)
+    return func.coalesce(tz, "UTC")
+
+
+def local_timestamp(column, tz=None) -> ColumnElement:
+    """Convert a naive UTC timestamp column into naive local time (AT TIME ZONE in SQL)"""
+    return func.timezone(tz_expression(tz), func.timezone("UTC", column))
+
+
+def local_day(column, tz=None) -> ColumnElement:
+    """Local calendar day bucket of a naive UTC timestamp column"""
+    return cast(local_timestamp(column, tz), Date)
+
+
+def local_hour(column, tz=None) -> ColumnElement:
+    """Local hour-of-day bucket (0-23) of a naive UTC timestamp column"""
+    return cast(extract("hour", local_timestamp(column, tz)), Integer)
+
+
+def local_week(column, tz=None) -> ColumnElement:
+    """Local Monday-based week bucket (the week's first day) of a naive UTC timestamp column"""
+    return cast(func.date_trunc("week", local_timestamp(column, tz)), Date)
+
+
+def local_month(column, tz=None) -> ColumnElement:
+    """Local calendar month bucket (the month's first day) of a naive UTC timestamp column"""
+    return cast(func.date_trunc("month", local_timestamp(column, tz)), Date)
@@ -0,0 +1,100 @@
+from datetime import date, datetime, time, timedelta
+from typing import Optional, Union
+from sqlalchemy import and_
+import pytz
+
+# Timestamps are stored as naive UTC; windows are computed in the organization's
+# timezone and converted back so predicates compare the raw, indexed column.
+
+
+def get_timezone(tz: Optional[Union[str, pytz.BaseTzInfo]] = None) -> pytz.BaseTzInfo:
+    """Resolve a timezone name (e.g. Organization.timezone), falling back to UTC"""
+    if tz is None:
+        return pytz.utc
+    if isinstance(tz, pytz.BaseTzInfo):
+        return tz
+    try:
+        return pytz.timezone(tz)
+    except pytz.UnknownTimeZoneError:
+        return pytz.utc
+
+
+def local_now(tz: Optional[Union[str, pytz.BaseTzInfo]] = None) -> datetime:
+    """Current wall-clock time in the given timezone"""
+    return datetime.now(pytz.utc).astimezone(get_timezone(tz))
+
+
+def local_today(tz: Optional[Union[str, pytz.BaseTzInfo]] = None) -> date:
+    """Current calendar day in the given timezone"""
+    return local_now(tz).date()
+
+
+def to_naive_utc(timestamp: datetime) -> datetime:
+    """Normalize a possibly timezone-aware timestamp to the naive UTC we store"""
+    if timestamp.tzinfo is None:
+        return timestamp
+    return timestamp.astimezone(pytz.utc).replace(tzinfo=None)
+
+
+def local_date(timestamp: datetime, tz: Optional[Union[str, pytz.BaseTzInfo]] = None) -> date:
+    """Local calendar day of a naive UTC timestamp"""
+    return pytz.utc.localize(timestamp).astimezone(get_timezone(tz)).date()
+
+
+def to_utc(day: date, tz: Optional[Union[str, pytz.BaseTzInfo]] = None) -> datetime:
+    """Naive UTC timestamp of local midnight at the start of the given day"""
+    zone = get_timezone(tz)
+    local_midnight = zone.localize(datetime.combine(day, time.min))
+    return local_midnight.astimezone(pytz.utc).replace(tzinfo=None)
+
+
+class TimeWindow:
+    """Half-open [start, end) range of naive UTC timestamps"""
+
+    def __init__(self, start: datetime, end: datetime):
+        self.start = start
+        self.end = end
+
+    def clause(self, column):
+        """Sargable predicate restricting column to this window"""
+        return and_(column >= self.start, column < self.end)
+
+    def __contains__(self, value: datetime) -> bool:
+        return self.start <= value < self.end
+
+    def __repr__(self) -> str:
+        return f"TimeWindow({self.start.isoformat()}, {self.end.isoformat()})"
+
+
+def days_window(start_day: date, end_day: date, tz=None) -> TimeWindow:
+    """Window covering start_day through end_day (inclusive) in the given timezone"""
+    return TimeWindow(to_utc(start_day, tz), to_utc(end_day + timedelta(days=1), tz))
+
+
+def day_window(day: date, tz=None) -> TimeWindow:
+    """Window covering a single local day"""
+    return days_window(day, day, tz)
+
+
+def today_window(tz=None) -> TimeWindow:
+    """Window covering the current local day"""
+    return day_window(local_today(tz), tz)
+
+
+def week_window(day: date, tz=None) -> TimeWindow:
+    """Window covering the Monday-based local week containing day"""
+    week_start = day - timedelta(days=day.weekday())
+    return days_window(week_start, week_start + timedelta(days=6), tz)
+
+
+def month_window(day: date, tz=None) -> TimeWindow:
+    """Window covering the local calendar month containing day"""
+    month_start = day.replace(day=1)
+    next_month = (month_start + timedelta(days=32)).replace(day=1)
+    return days_window(month_start, next_month - timedelta(days=1), tz)
+
+
+def since_window(days: int, tz=None) -> TimeWindow:
+    """Window covering the last N local days up to and including today"""
+    today = local_today(tz)
+    return days_window(today - timedelta(days=days), today, tz)
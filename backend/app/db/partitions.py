@@ -0,0 +1,147 @@
+from datetime import date, datetime
+from typing import BinaryIO, Dict, List, Optional, Set
+import gzip
+import re
+import tempfile
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.db.query_plans import explain_plan, plan_nodes
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Tables range-partitioned by month, and the (naive UTC) column they are partitioned on.
+# payments and notifications join this registry once their own conversion migration ships.
+PARTITIONED_TABLES: Dict[str, str] = {
+    "check_ins": "check_in_time",
+}
+
+DEFAULT_SUFFIX = "default"
+_MONTH_SUFFIX = re.compile(r"_(\d{4})_(\d{2})$")
+
+
+def month_start(value) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_{month:%Y_%m}"
+
+
+def default_partition_name(table: str) -> str:
+    return f"{table}_{DEFAULT_SUFFIX}"
+
+
+def partition_month(name: str) -> Optional[date]:
+    """Month a partition covers, parsed from its name (None for the default partition)"""
+    match = _MONTH_SUFFIX.search(name)
+    return date(int(match.group(1)), int(match.group(2)), 1) if match else None
+
+
+def create_partition_sql(table: str, month: date) -> str:
+    """DDL creating the partition for one month (a no-op if it already exists)"""
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(table, month)} PARTITION OF {table} "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+    )
+
+
+def list_partitions(db: Session, table: str) -> List[str]:
+    """Names of the partitions currently attached to table"""
+    rows = db.execute(text(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "WHERE parent.relname = :table ORDER BY child.relname"
+    ), {"table": table}).scalars().all()
+    return list(rows)
+
+
+def ensure_partitions(db: Session, table: str, months_ahead: int, today: Optional[date] = None) -> List[str]:
+    """Create any missing partitions from the current month through months_ahead; returns the new ones"""
+    existing = set(list_partitions(db, table))
+    first = month_start(today or datetime.utcnow())
+
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(first, offset)
+        name = partition_name(table, month)
+        if name not in existing:
+            db.execute(text(create_partition_sql(table, month)))
+            created.append(name)
+    db.commit()
+    return created
+
+
+def archivable_partitions(db: Session, table: str, keep_months: int, today: Optional[date] = None) -> List[str]:
+    """Attached monthly partitions that ended more than keep_months months ago"""
+    cutoff = add_months(month_start(today or datetime.utcnow()), -keep_months)
+    return [
+        name for name in list_partitions(db, table)
+        if partition_month(name) is not None and partition_month(name) < cutoff
+    ]
+
+
+def _export_partition(db: Session, name: str, out: BinaryIO) -> int:
+    """COPY a partition out as gzipped CSV with a header row; returns the row count"""
+    row_count = db.execute(text(f"SELECT count(*) FROM {name}")).scalar()
+    cursor = db.connection().connection.cursor()
+    try:
+        with gzip.GzipFile(fileobj=out, mode="wb") as compressed:
+            cursor.copy_expert(f"COPY (SELECT * FROM {name}) TO STDOUT WITH (FORMAT csv, HEADER)", compressed)
+    finally:
+        cursor.close()
+    return row_count
+
+
+def archive_partition(db: Session, table: str, name: str, storage, folder: str) -> Optional[str]:
+    """
+    Copy a partition to storage as a gzipped CSV, then detach and drop it.
+
+    The export reads the still-attached partition so writers are never blocked on it;
+    the DETACH/DROP transaction is short and is only committed if the partition still
+    holds exactly the rows that were archived. Returns the archive URL, or None if the
+    partition changed underneath and was left in place.
+    """
+    with tempfile.TemporaryFile() as out:
+        exported = _export_partition(db, name, out)
+        db.commit()
+
+        out.seek(0)
+        file_url = storage.upload(out, f"{name}.csv.gz", folder=folder, content_type="application/gzip")
+
+    db.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+    remaining = db.execute(text(f"SELECT count(*) FROM {name}")).scalar()
+    if remaining != exported:
+        db.rollback()
+        storage.delete(file_url)
+        logger.warning(f"Partition {name} changed while archiving ({exported} -> {remaining} rows); kept")
+        return None
+
+    db.execute(text(f"DROP TABLE {name}"))
+    db.commit()
+    logger.info(f"Archived partition {name} ({exported} rows) to {file_url}")
+    return file_url
+
+
+def scanned_partitions(db: Session, statement) -> Set[str]:
+    """Relations the planner will scan for a statement, showing plan-time partition pruning"""
+    return {
+        node["Relation Name"] for node in plan_nodes(explain_plan(db, statement))
+        if "Relation Name" in node
+    }
+
+
+def expected_partitions(table: str, start: datetime, end: datetime) -> Set[str]:
+    """Monthly partitions a range scan over [start, end) should be pruned down to"""
+    names = set()
+    month = month_start(start)
+    while datetime(month.year, month.month, 1) < end:
+        names.add(partition_name(table, month))
+        month = add_months(month, 1)
+    return names
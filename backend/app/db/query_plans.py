@@ -0,0 +1,176 @@
+"""
+EXPLAIN checks for the hot queries the composite and partial indexes were built for.
+
+tests/test_query_plans.py seeds every table these queries read and fails if the
+planner would need a sequential scan for any of them, so a new hot query has to come
+with an index that serves it.
+"""
+from datetime import date, timedelta
+from typing import Callable, Dict, Iterator, List
+from uuid import UUID, uuid4
+from sqlalchemy import select, func
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+from sqlalchemy.orm import Session
+from app.models.checkin import CheckIn
+from app.models.class_model import ClassBooking, BookingStatus
+from app.models.member import Member
+from app.models.membership import Membership, MembershipStatus
+from app.models.notification import Notification, NotificationStatus
+from app.models.payment import Payment, PaymentStatus
+
+# name -> builder(org_id, today) returning the statement the endpoint or task runs
+HOT_QUERIES: Dict[str, Callable[[UUID, date], object]] = {}
+
+
+def hot_query(name: str):
+    def register(builder):
+        HOT_QUERIES[name] = builder
+        return builder
+    return register
+
+
+@hot_query("memberships.active_by_org")
+def _active_memberships(org_id, today):
+    return select(func.count()).select_from(Membership).where(
+        Membership.organization_id == org_id,
+        Membership.status == MembershipStatus.ACTIVE
+    )
+
+
+@hot_query("memberships.expiring")
+def _expiring_memberships(org_id, today):
+    return select(Membership.id).where(
+        Membership.status == MembershipStatus.ACTIVE,
+        Membership.end_date == today + timedelta(days=7)
+    )
+
+
+@hot_query("memberships.member_active_windows")
+def _member_active_windows(org_id, today):
+    return select(Membership.start_date, Membership.end_date).where(
+        Membership.member_id == uuid4(),
+        Membership.status == MembershipStatus.ACTIVE,
+        Membership.end_date >= today
+    )
+
+
+@hot_query("payments.completed_in_range")
+def _completed_payments(org_id, today):
+    return select(func.sum(Payment.amount)).where(
+        Payment.organization_id == org_id,
+        Payment.status == PaymentStatus.COMPLETED,
+        Payment.payment_date.between(today - timedelta(days=30), today)
+    )
+
+
+@hot_query("payments.pending_due")
+def _pending_due(org_id, today):
+    return select(Payment.id).where(
+        Payment.status == PaymentStatus.PENDING,
+        Payment.due_date == today + timedelta(days=3)
+    )
+
+
+@hot_query("payments.membership_pending")
+def _membership_pending(org_id, today):
+    return select(Payment.id).where(
+        Payment.membership_id == uuid4(),
+        Payment.status == PaymentStatus.PENDING,
+        Payment.due_date == today
+    )
+
+
+@hot_query("payments.overdue")
+def _overdue_payments(org_id, today):
+    return select(Payment.id).where(
+        Payment.organization_id == org_id,
+        Payment.status == PaymentStatus.PENDING,
+        Payment.due_date < today
+    ).order_by(Payment.due_date)
+
+
+@hot_query("class_bookings.booked_for_schedule")
+def _booked_for_schedule(org_id, today):
+    return select(func.count()).select_from(ClassBooking).where(
+        ClassBooking.schedule_id == uuid4(),
+        ClassBooking.status == BookingStatus.BOOKED
+    )
+
+
+@hot_query("notifications.history")
+def _notification_history(org_id, today):
+    return select(Notification.id).where(
+        Notification.organization_id == org_id,
+        Notification.status.in_([NotificationStatus.SENT, NotificationStatus.FAILED])
+    ).order_by(Notification.sent_at.desc()).limit(100)
+
+
+@hot_query("members.by_member_number")
+def _member_by_number(org_id, today):
+    return select(Member.id).where(Member.organization_id == org_id, Member.member_id == "M-000001")
+
+
+@hot_query("members.by_qr_code")
+def _member_by_qr(org_id, today):
+    return select(Member.id).where(Member.organization_id == org_id, Member.qr_code == "QR-000001")
+
+
+@hot_query("check_ins.open")
+def _open_check_ins(org_id, today):
+    return select(func.count()).select_from(CheckIn).where(
+        CheckIn.organization_id == org_id,
+        CheckIn.check_out_time == None
+    )
+
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) wrapped around a statement, so its binds go through the column types"""
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(Explain)
+def _compile_explain(element, compiler, **kw):
+    # Compile the statement as nested, so its columns do not become the result map and
+    # their type processors are not applied to the plan's JSON
+    compiler.stack.append({"correlate_froms": set(), "asfrom_froms": set(), "selectable": element})
+    try:
+        return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+    finally:
+        compiler.stack.pop()
+
+
+def explain_plan(db: Session, statement) -> dict:
+    """Root plan node of EXPLAIN (FORMAT JSON) for a statement"""
+    plan = db.execute(Explain(statement)).scalar()
+    return plan[0]["Plan"]
+
+
+def plan_nodes(plan: dict) -> Iterator[dict]:
+    stack = [plan]
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(node.get("Plans", []))
+
+
+def sequential_scans(db: Session, statement) -> List[str]:
+    """Relations the planner would read with a sequential scan"""
+    return sorted({
+        node["Relation Name"] for node in plan_nodes(explain_plan(db, statement))
+        if node["Node Type"] == "Seq Scan"
+    })
+
+
+def check_hot_queries(db: Session, org_id: UUID, today: date = None) -> Dict[str, List[str]]:
+    """Sequentially scanned relations per hot query; an empty dict means every query uses an index"""
+    today = today or date.today()
+    failures = {}
+    for name, builder in HOT_QUERIES.items():
+        scanned = sequential_scans(db, builder(org_id, today))
+        if scanned:
+            failures[name] = scanned
+    return failures
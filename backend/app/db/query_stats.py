@@ -0,0 +1,182 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from collections import Counter
+from typing import Any, Dict, List, Optional
+import re
+import time
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.middleware.base import BaseHTTPMiddleware
+from app.core.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    """Normalize a statement so executions that differ only in literals compare equal"""
+    return _WHITESPACE.sub(" ", _LITERALS.sub("?", statement)).strip()
+
+
+class QueryStats:
+    """Statements executed during one request or task"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints: Counter = Counter()
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        self.fingerprints[fingerprint(statement)] += 1
+
+    @property
+    def duration_ms(self) -> float:
+        return self.duration * 1000
+
+    @property
+    def repeated(self) -> List[tuple]:
+        """Statements executed often enough to look like an N+1 pattern"""
+        threshold = settings.QUERY_N_PLUS_ONE_THRESHOLD
+        return [(sql, n) for sql, n in self.fingerprints.most_common() if n >= threshold]
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "queries": self.count,
+            "db_time_ms": round(self.duration_ms, 2),
+            "n_plus_one": [{"statement": sql, "count": n} for sql, n in self.repeated]
+        }
+
+
+class QueryMetrics:
+    """Per-endpoint and per-task query totals for this process"""
+
+    def __init__(self):
+        self.totals: Dict[str, Counter] = {}
+
+    def observe(self, stats: QueryStats) -> None:
+        totals = self.totals.setdefault(stats.name, Counter())
+        totals["calls"] += 1
+        totals["queries"] += stats.count
+        totals["db_time_ms"] += stats.duration_ms
+        totals["max_queries"] = max(totals["max_queries"], stats.count)
+        if stats.repeated:
+            totals["n_plus_one"] += 1
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            name: {
+                "calls": totals["calls"],
+                "avg_queries": round(totals["queries"] / totals["calls"], 2),
+                "max_queries": totals["max_queries"],
+                "avg_db_time_ms": round(totals["db_time_ms"] / totals["calls"], 2),
+                "n_plus_one": totals["n_plus_one"]
+            }
+            for name, totals in self.totals.items()
+        }
+
+
+query_metrics = QueryMetrics()
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _current.get()
+
+
+def begin(name: str) -> Optional[QueryStats]:
+    """Start counting statements for a request or task in the current context"""
+    if not settings.QUERY_STATS_ENABLED:
+        return None
+    stats = QueryStats(name)
+    _current.set(stats)
+    return stats
+
+
+def finish(stats: Optional[QueryStats] = None, name: Optional[str] = None) -> Optional[QueryStats]:
+    """Stop counting, record the totals and warn about likely N+1 patterns"""
+    stats = stats or _current.get()
+    _current.set(None)
+    if stats is None:
+        return None
+    if name:
+        stats.name = name
+
+    query_metrics.observe(stats)
+    for sql, n in stats.repeated:
+        logger.warning(f"Possible N+1 in {stats.name}: {n}x {sql[:200]}")
+    return stats
+
+
+@contextmanager
+def track_queries(name: str = "block"):
+    """Count the statements executed inside a block (without recording process metrics)"""
+    stats = QueryStats(name)
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def assert_query_budget(max_queries: int, name: str = "block"):
+    """Fail if the block executes more than max_queries statements"""
+    with track_queries(name) as stats:
+        yield stats
+    if stats.count > max_queries:
+        details = "\n".join(f"  {n}x {sql}" for sql, n in stats.fingerprints.most_common(5))
+        raise AssertionError(f"{name} ran {stats.count} queries (budget {max_queries}):\n{details}")
+
+
+# ===== ENGINE HOOKS =====
+# Registered on the Engine class so the primary, replicas and the async engines'
+# sync cores are all covered.
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    started = conn.info.get("query_start_time")
+    if stats is None or not started:
+        return
+    stats.record(statement, time.perf_counter() - started.pop())
+
+
+# ===== HTTP =====
+class QueryStatsMiddleware(BaseHTTPMiddleware):
+    """
+    Count statements per request.
+
+    In debug mode the numbers are returned as X-DB-* response headers (which is also
+    how tests assert per-endpoint query budgets); otherwise they only feed query_metrics.
+    """
+
+    async def dispatch(self, request: Request, call_next):
+        stats = begin(request.url.path)
+        response = await call_next(request)
+        if stats is None:
+            return response
+
+        # Name by route template rather than raw path so IDs do not explode the metrics
+        route = request.scope.get("route")
+        finish(stats, f"{request.method} {route.path if route else 'unmatched'}")
+
+        if settings.DEBUG:
+            response.headers["X-DB-Query-Count"] = str(stats.count)
+            response.headers["X-DB-Query-Time-Ms"] = f"{stats.duration_ms:.2f}"
+            if stats.repeated:
+                response.headers["X-DB-N-Plus-One"] = str(len(stats.repeated))
+        return response
@@ -0,0 +1,30 @@
+import redis
+import redis.asyncio
+from app.core.config import settings
+
+# Connections are opened lazily on first command, so importing this module is cheap
+redis_client = redis.Redis.from_url(
+    settings.REDIS_URL,
+    decode_responses=True,
+    socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+    socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+    health_check_interval=30
+)
+
+async_redis_client = redis.asyncio.Redis.from_url(
+    settings.REDIS_URL,
+    decode_responses=True,
+    socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+    socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+    health_check_interval=30
+)
+
+
+def get_redis() -> redis.Redis:
+    """Get the shared Redis client"""
+    return redis_client
+
+
+def get_async_redis() -> redis.asyncio.Redis:
+    """Get the shared asyncio Redis client"""
+    return async_redis_client
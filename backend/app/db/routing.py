@@ -0,0 +1,194 @@
+from typing import Any, Dict, List, Optional
+from collections import Counter
+import itertools
+import time
+import redis
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db.redis import get_redis, get_async_redis
+import logging
+
+logger = logging.getLogger(__name__)
+
+STICKY_KEY_PREFIX = "fitflow:sticky"
+
+
+class DatabasePool:
+    """A primary or replica database with its sync and async engines and routing counters"""
+
+    def __init__(self, name: str, engine: Engine, async_engine: AsyncEngine):
+        self.name = name
+        self.engine = engine
+        self.async_engine = async_engine
+        self.down_until = 0.0
+        self.metrics: Counter = Counter()
+
+    @property
+    def healthy(self) -> bool:
+        return time.monotonic() >= self.down_until
+
+    def mark_down(self, error: Exception) -> None:
+        """Take the pool out of rotation for REPLICA_RETRY_SECONDS"""
+        self.down_until = time.monotonic() + settings.REPLICA_RETRY_SECONDS
+        self.metrics["failures"] += 1
+        logger.warning(f"Database pool {self.name} unavailable, routing reads to primary: {str(error)}")
+
+    def stats(self) -> Dict[str, Any]:
+        pool = self.engine.pool
+        async_pool = self.async_engine.sync_engine.pool
+        return {
+            "name": self.name,
+            "healthy": self.healthy,
+            "pool_size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+            "async_checked_out": async_pool.checkedout(),
+            "async_overflow": async_pool.overflow(),
+            **self.metrics
+        }
+
+
+class SessionRouter:
+    """
+    Route read-only request sessions to replicas and everything else to the primary.
+
+    Replicas are picked round-robin among healthy ones. A replica that fails to hand
+    out a connection is skipped for REPLICA_RETRY_SECONDS and the read falls back to
+    the primary. Users who wrote within REPLICA_STICKY_SECONDS read from the primary
+    so they always see their own writes despite replication lag.
+    """
+
+    def __init__(self, primary: DatabasePool, replicas: List[DatabasePool], session_factory, async_session_factory):
+        self.primary = primary
+        self.replicas = replicas
+        self.session_factory = session_factory
+        self.async_session_factory = async_session_factory
+        self._round_robin = itertools.count()
+        self._recent_writes: Dict[str, float] = {}
+
+    # ===== STICKINESS =====
+    @staticmethod
+    def sticky_key(user_id) -> str:
+        return f"{STICKY_KEY_PREFIX}:{user_id}"
+
+    def _remember_write(self, user_id) -> None:
+        now = time.monotonic()
+        self._recent_writes[str(user_id)] = now + settings.REPLICA_STICKY_SECONDS
+        # Keep the local map from growing without bound
+        if len(self._recent_writes) > 10000:
+            self._recent_writes = {k: v for k, v in self._recent_writes.items() if v > now}
+
+    def _recently_wrote(self, user_id) -> bool:
+        return self._recent_writes.get(str(user_id), 0) > time.monotonic()
+
+    def mark_write(self, user_id) -> None:
+        """Pin a user's reads to the primary for the stickiness window"""
+        if not self.replicas or user_id is None:
+            return
+        self._remember_write(user_id)
+        try:
+            get_redis().set(self.sticky_key(user_id), 1, ex=settings.REPLICA_STICKY_SECONDS)
+        except redis.RedisError as e:
+            logger.warning(f"Error recording write for {user_id}: {str(e)}")
+
+    async def mark_write_async(self, user_id) -> None:
+        """Async variant of mark_write()"""
+        if not self.replicas or user_id is None:
+            return
+        self._remember_write(user_id)
+        try:
+            await get_async_redis().set(self.sticky_key(user_id), 1, ex=settings.REPLICA_STICKY_SECONDS)
+        except redis.RedisError as e:
+            logger.warning(f"Error recording write for {user_id}: {str(e)}")
+
+    def is_sticky(self, user_id) -> bool:
+        """Whether a user wrote recently (on any worker) and must read from the primary"""
+        if user_id is None:
+            return False
+        if self._recently_wrote(user_id):
+            return True
+        try:
+            return bool(get_redis().exists(self.sticky_key(user_id)))
+        except redis.RedisError:
+            return False
+
+    async def is_sticky_async(self, user_id) -> bool:
+        """Async variant of is_sticky()"""
+        if user_id is None:
+            return False
+        if self._recently_wrote(user_id):
+            return True
+        try:
+            return bool(await get_async_redis().exists(self.sticky_key(user_id)))
+        except redis.RedisError:
+            return False
+
+    # ===== ROUTING =====
+    def _next_replica(self) -> Optional[DatabasePool]:
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            self.primary.metrics["failover_reads"] += 1
+            return None
+        return healthy[next(self._round_robin) % len(healthy)]
+
+    def _primary_session(self) -> Session:
+        self.primary.metrics["reads"] += 1
+        return self.session_factory()
+
+    def _primary_async_session(self) -> AsyncSession:
+        self.primary.metrics["reads"] += 1
+        return self.async_session_factory()
+
+    def read_session(self, user_id=None) -> Session:
+        """Open a session for read-only work, on a replica when possible"""
+        if not self.replicas:
+            return self._primary_session()
+        if self.is_sticky(user_id):
+            self.primary.metrics["sticky_reads"] += 1
+            return self._primary_session()
+
+        replica = self._next_replica()
+        if replica is None:
+            return self._primary_session()
+
+        db = self.session_factory(bind=replica.engine)
+        try:
+            # Check a connection out now so an unreachable replica fails over before any query
+            db.connection()
+        except DBAPIError as e:
+            db.close()
+            replica.mark_down(e)
+            return self._primary_session()
+
+        replica.metrics["reads"] += 1
+        return db
+
+    async def read_session_async(self, user_id=None) -> AsyncSession:
+        """Async variant of read_session()"""
+        if not self.replicas:
+            return self._primary_async_session()
+        if await self.is_sticky_async(user_id):
+            self.primary.metrics["sticky_reads"] += 1
+            return self._primary_async_session()
+
+        replica = self._next_replica()
+        if replica is None:
+            return self._primary_async_session()
+
+        db = self.async_session_factory(bind=replica.async_engine)
+        try:
+            await db.connection()
+        except DBAPIError as e:
+            await db.close()
+            replica.mark_down(e)
+            return self._primary_async_session()
+
+        replica.metrics["reads"] += 1
+        return db
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Per-pool connection and routing counters for this process"""
+        return [self.primary.stats()] + [replica.stats() for replica in self.replicas]
@@ -1,17 +1,69 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from app.core.config import settings
+from app.db.routing import DatabasePool, SessionRouter
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,
-    echo=settings.DB_ECHO,
-    pool_size=10,
-    max_overflow=20
-)
+
+def get_async_database_url(url: str) -> str:
+    """Rewrite a sync PostgreSQL URL to use the asyncpg driver"""
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    return url
+
+
+def create_database_pool(name: str, url: str) -> DatabasePool:
+    """Create the sync and async engines for one database"""
+    return DatabasePool(
+        name,
+        create_engine(
+            url,
+            pool_pre_ping=True,
+            echo=settings.DB_ECHO,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW
+        ),
+        create_async_engine(
+            get_async_database_url(url),
+            pool_pre_ping=True,
+            echo=settings.DB_ECHO,
+            pool_size=settings.ASYNC_DB_POOL_SIZE,
+            max_overflow=settings.ASYNC_DB_MAX_OVERFLOW
+        )
+    )
+
+
+primary_pool = create_database_pool("primary", settings.DATABASE_URL)
+
+engine = primary_pool.engine
+async_engine = primary_pool.async_engine
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+db_router = SessionRouter(
+    primary_pool,
+    [
+        create_database_pool(f"replica-{index}", url)
+        for index, url in enumerate(settings.database_replica_urls_list, start=1)
+    ],
+    SessionLocal,
+    AsyncSessionLocal
+)
+
+
+@event.listens_for(Session, "after_flush")
+def _record_write(session, flush_context):
+    """Flag sessions that wrote so the request's user gets read-your-writes stickiness"""
+    session.info["wrote"] = True
+
 
 def get_db():
     """Dependency for getting database session"""
@@ -19,4 +71,16 @@ def get_db():
     try:
         yield db
     finally:
+        if db.info.get("wrote"):
+            db_router.mark_write(db.info.get("user_id"))
         db.close()
+
+
+async def get_async_db():
+    """Dependency for getting an async database session"""
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+        finally:
+            if db.info.get("wrote"):
+                await db_router.mark_write_async(db.info.get("user_id"))
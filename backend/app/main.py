@@ -2,7 +2,9 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.api.v1.api import api_router
-from app.db.session import engine
+from app.db.session import engine, db_router
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.db.query_stats import QueryStatsMiddleware, query_metrics
 from app.db.base import Base
 
 # Create database tables
@@ -24,8 +26,12 @@ app.add_middleware(
     allow_credentials=settings.CORS_CREDENTIALS,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
+# Per-request SQL statement counting (X-DB-* headers in debug mode)
+app.add_middleware(QueryStatsMiddleware)
+
 # Include API routes
 app.include_router(api_router, prefix=settings.API_V1_PREFIX)
 
@@ -47,6 +53,22 @@ def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/health/db")
+def database_health():
+    """Per-pool connection and read-routing metrics for this worker"""
+    pools = db_router.stats()
+    return {
+        "status": "healthy" if all(pool["healthy"] for pool in pools) else "degraded",
+        "pools": pools
+    }
+
+
+@app.get("/health/queries")
+def query_health():
+    """Per-endpoint and per-task SQL statement metrics for this worker"""
+    return query_metrics.stats()
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
@@ -8,8 +8,12 @@ from app.models.trainer import Trainer
 from app.models.payment import Payment, Invoice, PaymentMethod, PaymentStatus, InvoiceStatus
 from app.models.staff import Staff
 from app.models.equipment import Equipment, EquipmentStatus
-from app.models.notification import Notification, NotificationType, NotificationStatus
+from app.models.notification import Notification, NotificationType, NotificationStatus, MemberReengagement
 from app.models.lead import Lead, LeadStatus
+from app.models.rollup import CheckInHourlyRollup, RevenueDailyRollup, MembershipDailyRollup
+from app.models.report import Report, ReportStatus, ScheduledReport
+from app.models.attendance import MemberAttendance
+from app.models.risk import MemberRiskScore
 
 __all__ = [
     "Organization",
@@ -43,6 +47,15 @@ __all__ = [
     "Notification",
     "NotificationType",
     "NotificationStatus",
+    "MemberReengagement",
     "Lead",
     "LeadStatus",
+    "CheckInHourlyRollup",
+    "RevenueDailyRollup",
+    "MembershipDailyRollup",
+    "Report",
+    "ReportStatus",
+    "ScheduledReport",
+    "MemberAttendance",
+    "MemberRiskScore",
 ]
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, Date, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from app.db.base import Base, BaseModel
+
+
+class MemberAttendance(Base, BaseModel):
+    """Per-member visit totals and streaks, kept current as check-ins are created"""
+    __tablename__ = "member_attendance"
+
+    organization_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False, index=True)
+    member_id = Column(UUID(as_uuid=True), ForeignKey("members.id", ondelete="CASCADE"), nullable=False, unique=True)
+    total_visits = Column(Integer, nullable=False, default=0)
+    last_visit = Column(DateTime, nullable=True)
+    # Streaks count consecutive org-local days with at least one check-in
+    last_visit_day = Column(Date, nullable=True)
+    current_streak = Column(Integer, nullable=False, default=0)
+    longest_streak = Column(Integer, nullable=False, default=0)
+    # Visits per local week ({"YYYY-MM-DD" week start: count}); readers only sum the
+    # recent weeks and rebuilds drop the older ones
+    weekly_visits = Column(JSONB, nullable=False, default=dict)
@@ -1,6 +1,8 @@
-from sqlalchemy import Column, DateTime, ForeignKey, Enum as SQLEnum
+from sqlalchemy import (
+    DDL, Column, String, DateTime, ForeignKey, Index, UniqueConstraint, event, text, Enum as SQLEnum
+)
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import declared_attr, relationship
 from app.db.base import Base, BaseModel
 import enum
 
@@ -15,14 +17,45 @@ class CheckInMethod(str, enum.Enum):
 
 class CheckIn(Base, BaseModel):
     __tablename__ = "check_ins"
+    # Range-partitioned by month on check_in_time (see app/db/partitions.py). Unique
+    # constraints must include the partition key, so the database primary key is
+    # (id, check_in_time) while the ORM keeps identifying rows by id alone.
+    __table_args__ = (
+        # Client-generated keys make offline kiosk replays idempotent
+        UniqueConstraint(
+            "organization_id", "idempotency_key", "check_in_time", name="uq_check_ins_org_idempotency_key"
+        ),
+        # Open check-ins are a tiny slice of history; occupancy lookups and the
+        # auto-checkout sweeper only ever scan this
+        Index(
+            "ix_check_ins_open", "organization_id", "check_in_time",
+            postgresql_where=text("check_out_time IS NULL")
+        ),
+        {"postgresql_partition_by": "RANGE (check_in_time)"},
+    )
+
+    @declared_attr
+    def __mapper_args__(cls):
+        return {"primary_key": [cls.__table__.c.id]}
 
     organization_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False, index=True)
     member_id = Column(UUID(as_uuid=True), ForeignKey("members.id"), nullable=False, index=True)
-    check_in_time = Column(DateTime, nullable=False, index=True)
+    check_in_time = Column(DateTime, primary_key=True, nullable=False, index=True)
     check_out_time = Column(DateTime, nullable=True)
     method = Column(SQLEnum(CheckInMethod), nullable=False)
     location_id = Column(UUID(as_uuid=True), nullable=True)
+    idempotency_key = Column(String(64), nullable=True)
 
     # Relationships
     organization = relationship("Organization", back_populates="check_ins")
     member = relationship("Member", back_populates="check_ins")
+
+
+# create_all builds the partitioned parent only; the default partition makes it
+# writable until maintain_partitions adds the monthly ones
+event.listen(
+    CheckIn.__table__, "after_create",
+    DDL("CREATE TABLE check_ins_default PARTITION OF check_ins DEFAULT").execute_if(
+        dialect="postgresql"
+    )
+)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Boolean, JSON, Date, Time, ForeignKey, Enum as SQLEnum, DateTime
+from sqlalchemy import Column, String, Integer, Boolean, JSON, Date, Time, ForeignKey, Index, Enum as SQLEnum, DateTime
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.db.base import Base, BaseModel
@@ -50,6 +50,10 @@ class Class(Base, BaseModel):
 
 class ClassSchedule(Base, BaseModel):
     __tablename__ = "class_schedules"
+    __table_args__ = (
+        # Reminders look up classes by local start (scheduled_date, start_time) ranges
+        Index("ix_class_schedules_date_start_time", "scheduled_date", "start_time"),
+    )
 
     organization_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False, index=True)
     class_id = Column(UUID(as_uuid=True), ForeignKey("classes.id"), nullable=False, index=True)
@@ -67,6 +71,9 @@ class ClassSchedule(Base, BaseModel):
 
 class ClassBooking(Base, BaseModel):
     __tablename__ = "class_bookings"
+    __table_args__ = (
+        Index("ix_class_bookings_schedule_status", "schedule_id", "status"),
+    )
 
     organization_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False, index=True)
     schedule_id = Column(UUID(as_uuid=True), ForeignKey("class_schedules.id"), nullable=False, index=True)
@@ -75,6 +82,8 @@ class ClassBooking(Base, BaseModel):
     booked_at = Column(DateTime, nullable=False)
     cancelled_at = Column(DateTime, nullable=True)
     attended_at = Column(DateTime, nullable=True)
+    # Set when the booking is claimed for its class reminder, so each booking is reminded once
+    reminder_sent_at = Column(DateTime, nullable=True)
 
     # Relationships
     schedule = relationship("ClassSchedule", back_populates="bookings")
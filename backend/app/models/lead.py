@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, String, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.db.base import Base, BaseModel
@@ -25,6 +25,10 @@ class LeadSource(str, enum.Enum):
 
 class Lead(Base, BaseModel):
     __tablename__ = "leads"
+    __table_args__ = (
+        # Keyset pagination of the lead list (newest first)
+        Index("ix_leads_org_created_at_id", "organization_id", "created_at", "id"),
+    )
 
     organization_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False, index=True)
     name = Column(String(100), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Date, JSON, ForeignKey, Enum as SQLEnum, ARRAY
+from sqlalchemy import Column, String, Date, JSON, ForeignKey, Index, extract, Enum as SQLEnum, ARRAY
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.db.base import Base, BaseModel
@@ -21,6 +21,11 @@ class MemberStatus(str, enum.Enum):
 
 class Member(Base, BaseModel):
     __tablename__ = "members"
+    __table_args__ = (
+        Index("ix_members_org_member_id", "organization_id", "member_id"),
+        # Keyset pagination of the member list (newest first)
+        Index("ix_members_org_created_at_id", "organization_id", "created_at", "id"),
+    )
 
     organization_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False, index=True)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, unique=True)
@@ -45,3 +50,12 @@ class Member(Base, BaseModel):
     check_ins = relationship("CheckIn", back_populates="member", cascade="all, delete-orphan")
     payments = relationship("Payment", back_populates="member", cascade="all, delete-orphan")
     bookings = relationship("ClassBooking", back_populates="member", cascade="all, delete-orphan")
+
+
+def birthday_month_day():
+    """(month, day) expressions of date_of_birth, matching ix_members_birthday"""
+    return extract("month", Member.date_of_birth), extract("day", Member.date_of_birth)
+
+
+# Daily birthday lookups probe this instead of scanning every member
+Index("ix_members_birthday", *birthday_month_day(), postgresql_where=Member.date_of_birth != None)
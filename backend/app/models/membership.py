@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Numeric, Integer, JSON, Boolean, Date, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, String, Numeric, Integer, JSON, Boolean, Date, ForeignKey, Index, text, Enum as SQLEnum
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.db.base import Base, BaseModel
@@ -42,6 +42,18 @@ class MembershipPlan(Base, BaseModel):
 
 class Membership(Base, BaseModel):
     __tablename__ = "memberships"
+    __table_args__ = (
+        Index("ix_memberships_org_status", "organization_id", "status"),
+        # Renewal, expiry and reminder tasks scan one status and end date across tenants
+        Index("ix_memberships_status_end_date", "status", "end_date"),
+        # Check-in eligibility only ever looks at a member's active memberships
+        Index(
+            "ix_memberships_member_active", "member_id", "end_date",
+            postgresql_where=text("status = 'ACTIVE'")
+        ),
+        # Keyset pagination of the membership list (newest first)
+        Index("ix_memberships_org_created_at_id", "organization_id", "created_at", "id"),
+    )
 
     organization_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False, index=True)
     member_id = Column(UUID(as_uuid=True), ForeignKey("members.id"), nullable=False, index=True)
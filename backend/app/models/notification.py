@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.db.base import Base, BaseModel
@@ -20,6 +20,11 @@ class NotificationStatus(str, enum.Enum):
 
 class Notification(Base, BaseModel):
     __tablename__ = "notifications"
+    __table_args__ = (
+        Index("ix_notifications_org_status_sent_at", "organization_id", "status", "sent_at"),
+        # Keyset pagination of the notification list (newest first)
+        Index("ix_notifications_org_created_at_id", "organization_id", "created_at", "id"),
+    )
 
     organization_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False, index=True)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True, index=True)
@@ -32,3 +37,20 @@ class Notification(Base, BaseModel):
     # Relationships
     organization = relationship("Organization")
     user = relationship("User")
+
+
+class MemberReengagement(Base, BaseModel):
+    """A re-engagement email owed to (or sent to) an inactive member"""
+    __tablename__ = "member_reengagements"
+    __table_args__ = (
+        Index("ix_member_reengagements_member_created_at", "member_id", "created_at"),
+        Index("ix_member_reengagements_status", "status"),
+    )
+
+    organization_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False, index=True)
+    member_id = Column(UUID(as_uuid=True), ForeignKey("members.id", ondelete="CASCADE"), nullable=False)
+    status = Column(SQLEnum(NotificationStatus), default=NotificationStatus.PENDING, nullable=False)
+    sent_at = Column(DateTime, nullable=True)
+
+    # Relationships
+    member = relationship("Member")
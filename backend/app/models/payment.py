@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Numeric, Date, Integer, JSON, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, String, Numeric, Date, Integer, JSON, ForeignKey, Index, text, Enum as SQLEnum
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.db.base import Base, BaseModel
@@ -30,6 +30,19 @@ class InvoiceStatus(str, enum.Enum):
 
 class Payment(Base, BaseModel):
     __tablename__ = "payments"
+    __table_args__ = (
+        Index("ix_payments_org_status_payment_date", "organization_id", "status", "payment_date"),
+        # Reminder and renewal tasks look up pending payments by due date across tenants
+        Index("ix_payments_status_due_date", "status", "due_date"),
+        Index("ix_payments_membership_status_due_date", "membership_id", "status", "due_date"),
+        # Overdue lists and dashboard counts per organization
+        Index(
+            "ix_payments_org_pending_due_date", "organization_id", "due_date",
+            postgresql_where=text("status = 'PENDING'")
+        ),
+        # Keyset pagination of the payment list (newest first)
+        Index("ix_payments_org_payment_date_id", "organization_id", "payment_date", "id"),
+    )
 
     organization_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False, index=True)
     member_id = Column(UUID(as_uuid=True), ForeignKey("members.id"), nullable=False, index=True)
@@ -43,7 +56,8 @@ class Payment(Base, BaseModel):
     payment_date = Column(Date, nullable=False)
     due_date = Column(Date, nullable=True)
     retry_count = Column(Integer, default=0)
-    metadata = Column(JSON, default=dict)
+    # "metadata" is reserved on declarative models, so the column is mapped under another name
+    payment_metadata = Column("metadata", JSON, default=dict)
 
     # Relationships
     organization = relationship("Organization", back_populates="payments")
@@ -54,6 +68,10 @@ class Payment(Base, BaseModel):
 
 class Invoice(Base, BaseModel):
     __tablename__ = "invoices"
+    __table_args__ = (
+        # Keyset pagination of the invoice list (newest first)
+        Index("ix_invoices_org_created_at_id", "organization_id", "created_at", "id"),
+    )
 
     organization_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False, index=True)
     member_id = Column(UUID(as_uuid=True), ForeignKey("members.id"), nullable=False, index=True)
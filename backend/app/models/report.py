@@ -0,0 +1,71 @@
+from sqlalchemy import Column, String, Integer, BigInteger, Boolean, DateTime, JSON, ForeignKey, Index, Enum as SQLEnum
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+from app.db.base import Base, BaseModel
+import enum
+
+
+class ReportStatus(str, enum.Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class Report(Base, BaseModel):
+    """A report generation job and the artifact it produced"""
+    __tablename__ = "reports"
+    __table_args__ = (
+        Index("ix_reports_org_params_hash", "organization_id", "params_hash"),
+    )
+
+    organization_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False, index=True)
+    requested_by = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
+    report_type = Column(String(50), nullable=False)
+    format = Column(String(10), nullable=False)
+    compress = Column(Boolean, default=False, nullable=False)
+    start_date = Column(DateTime, nullable=False)
+    end_date = Column(DateTime, nullable=False)
+    params_hash = Column(String(64), nullable=False)
+    # Cache generations of the report's data domains when the job was queued
+    generations = Column(JSON, nullable=True)
+    status = Column(SQLEnum(ReportStatus), default=ReportStatus.PENDING, nullable=False)
+    progress = Column(Integer, default=0, nullable=False)
+    row_count = Column(Integer, nullable=True)
+    file_url = Column(String(500), nullable=True)
+    file_name = Column(String(255), nullable=True)
+    file_size = Column(BigInteger, nullable=True)
+    content_type = Column(String(100), nullable=True)
+    error = Column(String(1000), nullable=True)
+    started_at = Column(DateTime, nullable=True)
+    completed_at = Column(DateTime, nullable=True)
+    expires_at = Column(DateTime, nullable=True, index=True)
+
+    # Relationships
+    organization = relationship("Organization")
+    user = relationship("User")
+
+
+class ScheduledReport(Base, BaseModel):
+    """A report an organization wants generated on a cron schedule and emailed out"""
+    __tablename__ = "scheduled_reports"
+
+    organization_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False, index=True)
+    created_by = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
+    name = Column(String(200), nullable=False)
+    report_type = Column(String(50), nullable=False)
+    format = Column(String(10), nullable=False, default="csv")
+    compress = Column(Boolean, default=False, nullable=False)
+    # Standard 5-field cron expression, evaluated in the organization's timezone
+    cron = Column(String(100), nullable=False)
+    lookback_days = Column(Integer, default=30, nullable=False)
+    recipients = Column(JSON, default=list, nullable=False)
+    is_active = Column(Boolean, default=True, nullable=False)
+    next_run_at = Column(DateTime, nullable=True, index=True)
+    last_run_at = Column(DateTime, nullable=True)
+    last_report_id = Column(UUID(as_uuid=True), ForeignKey("reports.id", ondelete="SET NULL"), nullable=True, index=True)
+    last_delivered_report_id = Column(UUID(as_uuid=True), nullable=True)
+
+    # Relationships
+    organization = relationship("Organization")
+    last_report = relationship("Report", foreign_keys=[last_report_id])
@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Float, Boolean, Date, DateTime, String, JSON, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from app.db.base import Base, BaseModel
+
+
+class MemberRiskScore(Base, BaseModel):
+    """A member's churn risk score and the features behind it, one row per scoring day"""
+    __tablename__ = "member_risk_scores"
+    __table_args__ = (
+        UniqueConstraint("member_id", "scored_on", name="uq_member_risk_scores_member_scored_on"),
+        Index("ix_member_risk_scores_org_scored_on_score", "organization_id", "scored_on", "score"),
+    )
+
+    organization_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False, index=True)
+    member_id = Column(UUID(as_uuid=True), ForeignKey("members.id", ondelete="CASCADE"), nullable=False)
+    scored_on = Column(Date, nullable=False)
+    # Weighted share of risk factors present, 0-1
+    score = Column(Float, nullable=False)
+    at_risk = Column(Boolean, nullable=False, default=False)
+    # Names of the risk factors that applied (see app/services/churn.py)
+    factors = Column(JSON, nullable=False, default=list)
+    visits_per_week = Column(Float, nullable=False, default=0)
+    last_visit = Column(DateTime, nullable=True)
+    membership_end_date = Column(Date, nullable=True)
+    attendance_trend = Column(String(20), nullable=False)
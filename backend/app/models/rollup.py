@@ -0,0 +1,48 @@
+from sqlalchemy import Column, Numeric, Integer, BigInteger, Date, ForeignKey, UniqueConstraint, Enum as SQLEnum
+from sqlalchemy.dialects.postgresql import UUID
+from app.db.base import Base, BaseModel
+from app.models.payment import PaymentMethod
+
+
+class CheckInHourlyRollup(Base, BaseModel):
+    """Check-in counts and session durations per organization, day and hour"""
+    __tablename__ = "checkin_hourly_rollups"
+    __table_args__ = (
+        UniqueConstraint("organization_id", "day", "hour", name="uq_checkin_hourly_rollups_org_day_hour"),
+    )
+
+    organization_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False, index=True)
+    day = Column(Date, nullable=False, index=True)
+    hour = Column(Integer, nullable=False)
+    check_ins = Column(Integer, nullable=False, default=0)
+    completed_sessions = Column(Integer, nullable=False, default=0)
+    session_seconds = Column(BigInteger, nullable=False, default=0)
+
+
+class RevenueDailyRollup(Base, BaseModel):
+    """Completed payment totals per organization, day and payment method"""
+    __tablename__ = "revenue_daily_rollups"
+    __table_args__ = (
+        UniqueConstraint("organization_id", "day", "payment_method", name="uq_revenue_daily_rollups_org_day_method"),
+    )
+
+    organization_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False, index=True)
+    day = Column(Date, nullable=False, index=True)
+    payment_method = Column(SQLEnum(PaymentMethod), nullable=False)
+    total_amount = Column(Numeric(12, 2), nullable=False, default=0)
+    payment_count = Column(Integer, nullable=False, default=0)
+
+
+class MembershipDailyRollup(Base, BaseModel):
+    """Membership status transitions per organization and day"""
+    __tablename__ = "membership_daily_rollups"
+    __table_args__ = (
+        UniqueConstraint("organization_id", "day", name="uq_membership_daily_rollups_org_day"),
+    )
+
+    organization_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False, index=True)
+    day = Column(Date, nullable=False, index=True)
+    started = Column(Integer, nullable=False, default=0)
+    frozen = Column(Integer, nullable=False, default=0)
+    expired = Column(Integer, nullable=False, default=0)
+    cancelled = Column(Integer, nullable=False, default=0)
@@ -26,6 +26,7 @@ class MemberAnalytics(BaseModel):
     total_expired: int
     total_cancelled: int
     member_growth: List[Dict[str, Any]]
+    membership_trend: List[Dict[str, Any]]
     gender_distribution: List[Dict[str, Any]]
 
 
@@ -90,8 +91,9 @@ class ChurnPrediction(BaseModel):
     member_id: UUID
     member_name: str
     churn_risk_score: float  # 0-1, higher = more likely to churn
-    last_visit_days_ago: int
-    membership_expires_in_days: int
+    scored_on: date
+    last_visit_days_ago: Optional[int] = None  # None if the member never checked in
+    membership_expires_in_days: Optional[int] = None
     attendance_trend: str  # increasing, stable, declining
     recommended_actions: List[str]
 
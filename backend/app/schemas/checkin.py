@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 from uuid import UUID
 from app.models.checkin import CheckInMethod
@@ -37,6 +37,40 @@ class QRCodeValidation(BaseModel):
     location_id: Optional[UUID] = None
 
 
+# Batch (offline kiosk) Sync
+class CheckInBatchItem(BaseModel):
+    idempotency_key: str = Field(..., min_length=1, max_length=64)
+    member_id: Optional[UUID] = None
+    qr_code: Optional[str] = None
+    check_in_time: datetime
+    method: CheckInMethod = CheckInMethod.QR
+    location_id: Optional[UUID] = None
+
+
+class CheckInBatch(BaseModel):
+    items: List[CheckInBatchItem] = Field(..., min_length=1, max_length=500)
+
+
+class CheckInBatchResult(BaseModel):
+    idempotency_key: str
+    status: str = Field(..., description="created, duplicate or rejected")
+    check_in_id: Optional[UUID] = None
+    error_code: Optional[int] = None
+    detail: Optional[str] = None
+
+
+class CheckInBatchResponse(BaseModel):
+    created: int
+    duplicates: int
+    rejected: int
+    results: List[CheckInBatchResult]
+
+
+class OccupancyResponse(BaseModel):
+    total: int
+    locations: Dict[str, int] = Field(default_factory=dict, description="Open check-ins per location id ('unassigned' for none)")
+
+
 class CheckInStats(BaseModel):
     total_check_ins_today: int
     current_occupancy: int
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field, EmailStr
 from typing import Optional
-from datetime import datetime
+from datetime import date, datetime
 from uuid import UUID
 from app.models.lead import LeadStatus, LeadSource
 
@@ -43,5 +43,3 @@ class LeadResponse(LeadBase):
 class LeadConvert(BaseModel):
     membership_plan_id: UUID
     start_date: date
-
-    from datetime import date
@@ -18,13 +18,13 @@ class PaymentBase(BaseModel):
 class PaymentCreate(PaymentBase):
     payment_gateway: Optional[str] = None
     transaction_id: Optional[str] = None
-    metadata: Dict[str, Any] = Field(default_factory=dict)
+    payment_metadata: Dict[str, Any] = Field(default_factory=dict, alias="metadata")
 
 
 class PaymentUpdate(BaseModel):
     status: PaymentStatus
     transaction_id: Optional[str] = None
-    metadata: Optional[Dict[str, Any]] = None
+    payment_metadata: Optional[Dict[str, Any]] = Field(default=None, alias="metadata")
 
 
 class PaymentResponse(PaymentBase):
@@ -35,7 +35,7 @@ class PaymentResponse(PaymentBase):
     status: PaymentStatus
     due_date: Optional[date] = None
     retry_count: int
-    metadata: Dict[str, Any]
+    metadata: Dict[str, Any] = Field(validation_alias="payment_metadata")
     created_at: datetime
     updated_at: datetime
 
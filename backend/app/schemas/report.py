@@ -0,0 +1,80 @@
+from pydantic import BaseModel, Field, EmailStr
+from typing import List, Optional
+from datetime import datetime
+from uuid import UUID
+from app.models.report import ReportStatus
+
+
+# Report Job Schemas
+class ReportCreate(BaseModel):
+    report_type: str = Field(..., description="membership, financial, attendance or performance")
+    format: str = Field("csv", description="csv, ndjson, parquet or arrow")
+    compress: bool = False
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+
+
+class ReportResponse(BaseModel):
+    id: UUID
+    organization_id: UUID
+    report_type: str
+    format: str
+    compress: bool
+    start_date: datetime
+    end_date: datetime
+    status: ReportStatus
+    progress: int
+    row_count: Optional[int] = None
+    file_name: Optional[str] = None
+    file_size: Optional[int] = None
+    error: Optional[str] = None
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    expires_at: Optional[datetime] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+# Scheduled Report Schemas
+class ScheduledReportCreate(BaseModel):
+    name: str = Field(..., max_length=200)
+    report_type: str = Field(..., description="membership, financial, attendance or performance")
+    format: str = Field("csv", description="csv, ndjson, parquet or arrow")
+    compress: bool = False
+    cron: str = Field(..., description="5-field cron expression in the organization's timezone")
+    lookback_days: int = Field(30, ge=1, le=366)
+    recipients: List[EmailStr] = Field(..., min_length=1)
+    is_active: bool = True
+
+
+class ScheduledReportUpdate(BaseModel):
+    name: Optional[str] = Field(None, max_length=200)
+    report_type: Optional[str] = None
+    format: Optional[str] = None
+    compress: Optional[bool] = None
+    cron: Optional[str] = None
+    lookback_days: Optional[int] = Field(None, ge=1, le=366)
+    recipients: Optional[List[EmailStr]] = Field(None, min_length=1)
+    is_active: Optional[bool] = None
+
+
+class ScheduledReportResponse(BaseModel):
+    id: UUID
+    organization_id: UUID
+    name: str
+    report_type: str
+    format: str
+    compress: bool
+    cron: str
+    lookback_days: int
+    recipients: List[str]
+    is_active: bool
+    next_run_at: Optional[datetime] = None
+    last_run_at: Optional[datetime] = None
+    last_report_id: Optional[UUID] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
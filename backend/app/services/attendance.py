@@ -0,0 +1,201 @@
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, Optional
+from uuid import UUID, uuid4
+from sqlalchemy import select, func, case, cast, Date, Integer, String
+from sqlalchemy.dialects.postgresql import insert, array, array_agg, aggregate_order_by, JSONB
+from app.core.time_buckets import local_day
+from app.core.time_windows import local_date, local_today, to_naive_utc
+from app.models.attendance import MemberAttendance
+from app.models.checkin import CheckIn
+from app.models.organization import Organization
+
+# Visits per week are averaged over this many weeks (the current one included)
+ROLLING_WEEKS = 12
+
+
+def week_start(day: date) -> date:
+    return day - timedelta(days=day.weekday())
+
+
+def record_visit(org_id: UUID, member_id: UUID, check_in_time: datetime, tz=None):
+    """
+    Upsert that folds one new check-in into the member's attendance row.
+
+    Runs in the check-in's own transaction. A visit on the day after the last one
+    extends the current streak, a later day restarts it, and a backdated visit only
+    counts towards the totals (its streak effect is picked up by the next rebuild).
+    """
+    check_in_time = to_naive_utc(check_in_time)
+    day = local_date(check_in_time, tz)
+    week = week_start(day).isoformat()
+    now = datetime.utcnow()
+
+    stmt = insert(MemberAttendance).values(
+        id=uuid4(),
+        organization_id=org_id,
+        member_id=member_id,
+        total_visits=1,
+        last_visit=check_in_time,
+        last_visit_day=day,
+        current_streak=1,
+        longest_streak=1,
+        weekly_visits={week: 1},
+        created_at=now,
+        updated_at=now
+    )
+
+    current_streak = case(
+        (MemberAttendance.last_visit_day == day, MemberAttendance.current_streak),
+        (MemberAttendance.last_visit_day == day - timedelta(days=1), MemberAttendance.current_streak + 1),
+        (MemberAttendance.last_visit_day < day, 1),
+        else_=MemberAttendance.current_streak
+    )
+    week_visits = func.coalesce(cast(MemberAttendance.weekly_visits[week].astext, Integer), 0) + 1
+
+    return stmt.on_conflict_do_update(
+        index_elements=[MemberAttendance.member_id],
+        set_={
+            "total_visits": MemberAttendance.total_visits + 1,
+            "last_visit": func.greatest(MemberAttendance.last_visit, check_in_time),
+            "last_visit_day": func.greatest(MemberAttendance.last_visit_day, day),
+            "current_streak": current_streak,
+            "longest_streak": func.greatest(MemberAttendance.longest_streak, current_streak),
+            "weekly_visits": func.jsonb_set(
+                MemberAttendance.weekly_visits, array([week]), func.to_jsonb(week_visits)
+            ),
+            "updated_at": now
+        }
+    )
+
+
+def attendance_aggregate(org_id: Optional[UUID] = None, member_ids: Optional[Iterable[UUID]] = None, tz=None):
+    """
+    Attendance rows computed from raw check-ins in one set-based pass.
+
+    Check-ins collapse into one row per member and local day. Consecutive days keep
+    day - row_number() constant, so each streak is a single group, and the longest
+    group and the group ending on the last visit day give the two streak lengths.
+    """
+    day = local_day(CheckIn.check_in_time, Organization.timezone)
+    days = select(
+        CheckIn.organization_id.label("organization_id"),
+        CheckIn.member_id.label("member_id"),
+        day.label("day"),
+        func.count().label("visits"),
+        func.max(CheckIn.check_in_time).label("last_visit")
+    ).join(
+        Organization, Organization.id == CheckIn.organization_id
+    ).group_by(CheckIn.organization_id, CheckIn.member_id, day)
+
+    if org_id:
+        days = days.where(CheckIn.organization_id == org_id)
+    if member_ids is not None:
+        days = days.where(CheckIn.member_id.in_(list(member_ids)))
+
+    days = days.cte("attendance_days")
+
+    runs = select(
+        days.c.member_id,
+        days.c.day,
+        (days.c.day - cast(
+            func.row_number().over(partition_by=days.c.member_id, order_by=days.c.day), Integer
+        )).label("run")
+    ).cte("attendance_runs")
+
+    streaks = select(
+        runs.c.member_id,
+        func.count().label("length"),
+        func.max(runs.c.day).label("end_day")
+    ).group_by(runs.c.member_id, runs.c.run).cte("attendance_streaks")
+
+    streak_totals = select(
+        streaks.c.member_id,
+        func.max(streaks.c.length).label("longest_streak"),
+        array_agg(aggregate_order_by(streaks.c.length, streaks.c.end_day.desc()))[1].label("current_streak")
+    ).group_by(streaks.c.member_id).subquery()
+
+    cutoff = week_start(local_today(tz)) - timedelta(weeks=ROLLING_WEEKS)
+    week = cast(func.date_trunc("week", days.c.day), Date)
+    week_counts = select(
+        days.c.member_id,
+        week.label("week"),
+        func.sum(days.c.visits).label("visits")
+    ).where(days.c.day >= cutoff).group_by(days.c.member_id, week).subquery()
+
+    weeks = select(
+        week_counts.c.member_id,
+        func.jsonb_object_agg(cast(week_counts.c.week, String), week_counts.c.visits).label("weekly_visits")
+    ).group_by(week_counts.c.member_id).subquery()
+
+    totals = select(
+        days.c.organization_id,
+        days.c.member_id,
+        func.sum(days.c.visits).label("total_visits"),
+        func.max(days.c.last_visit).label("last_visit"),
+        func.max(days.c.day).label("last_visit_day")
+    ).group_by(days.c.organization_id, days.c.member_id).subquery()
+
+    return select(
+        totals.c.organization_id,
+        totals.c.member_id,
+        totals.c.total_visits,
+        totals.c.last_visit,
+        totals.c.last_visit_day,
+        streak_totals.c.current_streak,
+        streak_totals.c.longest_streak,
+        func.coalesce(weeks.c.weekly_visits, cast("{}", JSONB)).label("weekly_visits")
+    ).join(
+        streak_totals, streak_totals.c.member_id == totals.c.member_id
+    ).outerjoin(
+        weeks, weeks.c.member_id == totals.c.member_id
+    )
+
+
+def rebuild_attendance(org_id: Optional[UUID] = None, member_ids: Optional[Iterable[UUID]] = None, tz=None):
+    """INSERT ... SELECT upsert recomputing attendance rows from check-in history"""
+    columns = [
+        "organization_id", "member_id", "total_visits", "last_visit", "last_visit_day",
+        "current_streak", "longest_streak", "weekly_visits"
+    ]
+    source = attendance_aggregate(org_id, member_ids, tz).subquery()
+    rows = select(
+        func.gen_random_uuid(),
+        func.now(),
+        func.now(),
+        *[source.c[name] for name in columns]
+    )
+
+    stmt = insert(MemberAttendance).from_select(["id", "created_at", "updated_at", *columns], rows)
+    return stmt.on_conflict_do_update(
+        index_elements=[MemberAttendance.member_id],
+        set_={**{name: stmt.excluded[name] for name in columns}, "updated_at": func.now()}
+    )
+
+
+def attendance_summary(row: Optional[MemberAttendance], tz=None) -> Dict[str, Any]:
+    """Visit totals and streaks as of today from a member's attendance row"""
+    if row is None:
+        return {
+            "total_visits": 0,
+            "last_visit": None,
+            "average_visits_per_week": 0.0,
+            "current_streak": 0,
+            "longest_streak": 0
+        }
+
+    today = local_today(tz)
+    first_week = (week_start(today) - timedelta(weeks=ROLLING_WEEKS - 1)).isoformat()
+    recent_visits = sum(count for week, count in (row.weekly_visits or {}).items() if week >= first_week)
+
+    # A streak is still current if the last visit was today or yesterday
+    current_streak = row.current_streak
+    if row.last_visit_day is None or row.last_visit_day < today - timedelta(days=1):
+        current_streak = 0
+
+    return {
+        "total_visits": row.total_visits,
+        "last_visit": row.last_visit,
+        "average_visits_per_week": recent_visits / ROLLING_WEEKS,
+        "current_streak": current_streak,
+        "longest_streak": row.longest_streak
+    }
@@ -0,0 +1,324 @@
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+from uuid import UUID, uuid4
+from collections import Counter
+from functools import wraps
+import asyncio
+import hashlib
+import inspect
+import json
+import random
+import time
+import redis
+import redis.asyncio
+from app.core.config import settings
+from app.db.redis import get_redis, get_async_redis
+from app.core.time_windows import local_today
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Cache domains. A write to any of these bumps the organization's generation for it,
+# which invalidates every cached response that declared a dependency on the domain.
+CHECK_INS = "check_ins"
+PAYMENTS = "payments"
+MEMBERSHIPS = "memberships"
+MEMBERS = "members"
+CLASSES = "classes"
+
+KEY_PREFIX = "fitflow"
+
+
+def _json_default(value: Any):
+    """Serialize the non-JSON types our analytics payloads contain"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class AnalyticsCache:
+    """
+    Tenant-scoped response cache for analytics and report endpoints.
+
+    Entries are keyed by organization, endpoint and normalized parameters, and store
+    the generation counters of the domains they depend on. A lookup fetches the entry
+    and the current generations in a single MGET, so a hit costs one round trip and a
+    write only has to INCR a counter to invalidate precisely.
+    """
+
+    def __init__(self, client: Optional[redis.Redis] = None, async_client: Optional[redis.asyncio.Redis] = None):
+        self._client = client
+        self._async_client = async_client
+        self.metrics: Counter = Counter()
+
+    @property
+    def client(self) -> redis.Redis:
+        return self._client or get_redis()
+
+    @property
+    def async_client(self) -> redis.asyncio.Redis:
+        return self._async_client or get_async_redis()
+
+    # ===== KEYS =====
+    @staticmethod
+    def generation_key(org_id, domain: str) -> str:
+        return f"{KEY_PREFIX}:gen:{org_id}:{domain}"
+
+    @staticmethod
+    def global_generation_key() -> str:
+        return f"{KEY_PREFIX}:gen:global"
+
+    @staticmethod
+    def entry_key(org_id, endpoint: str, params: Dict[str, Any]) -> str:
+        normalized = json.dumps(params, sort_keys=True, default=_json_default)
+        digest = hashlib.sha1(normalized.encode()).hexdigest()
+        return f"{KEY_PREFIX}:cache:{org_id}:{endpoint}:{digest}"
+
+    def _generation_keys(self, org_id, domains: Iterable[str]) -> list:
+        return [self.global_generation_key()] + [self.generation_key(org_id, domain) for domain in domains]
+
+    # ===== INVALIDATION =====
+    def invalidate(self, org_id, *domains: str) -> None:
+        """Bump the generation counters for an organization's domains"""
+        if not settings.ANALYTICS_CACHE_ENABLED:
+            return
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for domain in domains:
+                pipe.incr(self.generation_key(org_id, domain))
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Error invalidating analytics cache for {org_id} {domains}: {str(e)}")
+
+    async def invalidate_async(self, org_id, *domains: str) -> None:
+        """Async variant of invalidate() for endpoints running on the event loop"""
+        if not settings.ANALYTICS_CACHE_ENABLED:
+            return
+        try:
+            pipe = self.async_client.pipeline(transaction=False)
+            for domain in domains:
+                pipe.incr(self.generation_key(org_id, domain))
+            await pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Error invalidating analytics cache for {org_id} {domains}: {str(e)}")
+
+    def invalidate_all(self) -> None:
+        """Invalidate every cached entry for every organization (e.g. after a rollup rebuild)"""
+        if not settings.ANALYTICS_CACHE_ENABLED:
+            return
+        try:
+            self.client.incr(self.global_generation_key())
+        except redis.RedisError as e:
+            logger.warning(f"Error invalidating analytics cache: {str(e)}")
+
+    def current_generations(self, org_id, domains: Iterable[str]) -> Optional[list]:
+        """Current generation counters for an organization's domains (None if unavailable)"""
+        try:
+            return [int(v or 0) for v in self.client.mget(self._generation_keys(org_id, domains))]
+        except redis.RedisError as e:
+            logger.warning(f"Error reading cache generations for {org_id}: {str(e)}")
+            return None
+
+    # ===== LOOKUP =====
+    def _ttl(self) -> int:
+        """TTL with random jitter so entries written together do not expire together"""
+        jitter = settings.ANALYTICS_CACHE_TTL_JITTER
+        return max(1, int(settings.ANALYTICS_CACHE_TTL_SECONDS * random.uniform(1 - jitter, 1 + jitter)))
+
+    @staticmethod
+    def _decode(values: list):
+        """Turn an MGET of [entry, *generations] into (value or None, current generations)"""
+        generations = [int(v or 0) for v in values[1:]]
+        if values[0] is None:
+            return None, generations
+        entry = json.loads(values[0])
+        if entry.get("generations") != generations:
+            return None, generations
+        return entry["value"], generations
+
+    @staticmethod
+    def _encode(value: Any, generations: list) -> str:
+        return json.dumps({"generations": generations, "value": value}, default=_json_default)
+
+    def _lookup(self, key: str, generation_keys: list):
+        """Return (value or None, current generations) in one round trip"""
+        return self._decode(self.client.mget([key, *generation_keys]))
+
+    def _store(self, key: str, value: Any, generations: list) -> None:
+        self.client.set(key, self._encode(value, generations), ex=self._ttl())
+
+    def get_or_compute(
+        self,
+        org_id,
+        endpoint: str,
+        domains: Iterable[str],
+        params: Dict[str, Any],
+        compute: Callable[[], Any]
+    ) -> Any:
+        """
+        Return a cached response, computing and storing it on a miss.
+
+        Only one caller recomputes a missing entry (single-flight via a SET NX lock);
+        concurrent callers wait briefly for it and fall back to computing themselves.
+        """
+        if not settings.ANALYTICS_CACHE_ENABLED:
+            return compute()
+
+        key = self.entry_key(org_id, endpoint, params)
+        generation_keys = self._generation_keys(org_id, domains)
+
+        try:
+            value, generations = self._lookup(key, generation_keys)
+        except redis.RedisError as e:
+            logger.warning(f"Analytics cache unavailable, computing {endpoint} directly: {str(e)}")
+            self.metrics[f"{endpoint}:error"] += 1
+            return compute()
+
+        if value is not None:
+            self.metrics[f"{endpoint}:hit"] += 1
+            return value
+
+        self.metrics[f"{endpoint}:miss"] += 1
+        lock_key = f"{key}:lock"
+        token = uuid4().hex
+
+        try:
+            acquired = self.client.set(lock_key, token, nx=True, ex=settings.ANALYTICS_CACHE_LOCK_SECONDS)
+        except redis.RedisError:
+            acquired = False
+
+        if not acquired:
+            # Someone else is recomputing; wait for their result instead of piling onto the database
+            deadline = time.monotonic() + settings.ANALYTICS_CACHE_WAIT_SECONDS
+            while time.monotonic() < deadline:
+                time.sleep(0.05)
+                try:
+                    value, generations = self._lookup(key, generation_keys)
+                except redis.RedisError:
+                    break
+                if value is not None:
+                    self.metrics[f"{endpoint}:coalesced"] += 1
+                    return value
+
+        value = compute()
+
+        try:
+            self._store(key, value, generations)
+            if acquired:
+                # Only release the lock if it is still ours
+                if self.client.get(lock_key) == token:
+                    self.client.delete(lock_key)
+        except redis.RedisError as e:
+            logger.warning(f"Error storing analytics cache entry for {endpoint}: {str(e)}")
+
+        return value
+
+    async def get_or_compute_async(
+        self,
+        org_id,
+        endpoint: str,
+        domains: Iterable[str],
+        params: Dict[str, Any],
+        compute: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Async variant of get_or_compute() with the same single-flight semantics"""
+        if not settings.ANALYTICS_CACHE_ENABLED:
+            return await compute()
+
+        client = self.async_client
+        key = self.entry_key(org_id, endpoint, params)
+        generation_keys = self._generation_keys(org_id, domains)
+
+        try:
+            value, generations = self._decode(await client.mget([key, *generation_keys]))
+        except redis.RedisError as e:
+            logger.warning(f"Analytics cache unavailable, computing {endpoint} directly: {str(e)}")
+            self.metrics[f"{endpoint}:error"] += 1
+            return await compute()
+
+        if value is not None:
+            self.metrics[f"{endpoint}:hit"] += 1
+            return value
+
+        self.metrics[f"{endpoint}:miss"] += 1
+        lock_key = f"{key}:lock"
+        token = uuid4().hex
+
+        try:
+            acquired = await client.set(lock_key, token, nx=True, ex=settings.ANALYTICS_CACHE_LOCK_SECONDS)
+        except redis.RedisError:
+            acquired = False
+
+        if not acquired:
+            deadline = time.monotonic() + settings.ANALYTICS_CACHE_WAIT_SECONDS
+            while time.monotonic() < deadline:
+                await asyncio.sleep(0.05)
+                try:
+                    value, generations = self._decode(await client.mget([key, *generation_keys]))
+                except redis.RedisError:
+                    break
+                if value is not None:
+                    self.metrics[f"{endpoint}:coalesced"] += 1
+                    return value
+
+        value = await compute()
+
+        try:
+            await client.set(key, self._encode(value, generations), ex=self._ttl())
+            if acquired and await client.get(lock_key) == token:
+                await client.delete(lock_key)
+        except redis.RedisError as e:
+            logger.warning(f"Error storing analytics cache entry for {endpoint}: {str(e)}")
+
+        return value
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters for this process"""
+        return dict(self.metrics)
+
+
+analytics_cache = AnalyticsCache()
+
+
+def cached_analytics(endpoint: str, domains: Iterable[str]):
+    """
+    Cache a GET analytics endpoint per organization and org-local day.
+
+    Query parameters become part of the key as given, since responses echo them back.
+    The wrapped endpoint must take current_user.
+    """
+    def cache_params(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        organization = kwargs["current_user"].organization
+        params = {"day": local_today(organization.timezone)}
+        for name, value in kwargs.items():
+            if name in ("db", "current_user"):
+                continue
+            params[name] = value
+        return params
+
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                return await analytics_cache.get_or_compute_async(
+                    kwargs["current_user"].organization_id, endpoint, domains, cache_params(kwargs),
+                    lambda: func(*args, **kwargs)
+                )
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            return analytics_cache.get_or_compute(
+                kwargs["current_user"].organization_id, endpoint, domains, cache_params(kwargs),
+                lambda: func(*args, **kwargs)
+            )
+        return wrapper
+    return decorator
@@ -0,0 +1,200 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Set, Tuple
+from uuid import uuid4
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.time_windows import local_date, days_window, to_naive_utc
+from app.models.checkin import CheckIn
+from app.models.member import Member
+from app.models.membership import Membership, MembershipStatus
+from app.schemas.checkin import CheckInBatchItem
+from app.services.attendance import rebuild_attendance
+from app.services.eligibility import ineligibility_reason
+from app.services.occupancy import occupancy_counter
+
+
+def _result(item: CheckInBatchItem, status: str, check_in_id=None, *, error_code=None, detail=None) -> Dict[str, Any]:
+    return {
+        "idempotency_key": item.idempotency_key,
+        "status": status,
+        "check_in_id": check_in_id,
+        "error_code": error_code,
+        "detail": detail,
+    }
+
+
+def _ordered(results: Dict[int, Dict[str, Any]], items: List[CheckInBatchItem], first_index: Dict[str, int]) -> list:
+    """Results in request order, with repeated keys pointing at their first item's check-in"""
+    ordered = []
+    for index, item in enumerate(items):
+        result = results[index]
+        first = first_index[item.idempotency_key]
+        if index != first and result["status"] == "duplicate":
+            result["check_in_id"] = results[first]["check_in_id"]
+        ordered.append(result)
+    return ordered
+
+
+async def sync_check_ins(db: AsyncSession, org_id, items: List[CheckInBatchItem], tz=None) -> Tuple[list, Set]:
+    """
+    Validate and insert a batch of buffered scans with a fixed number of queries.
+
+    Scans are judged as of their own local day and in scan order, so a replay gives
+    the same answers the kiosk would have got online. Idempotency keys already seen
+    (in this batch or stored) come back as duplicates, and a concurrent replay of the
+    same key loses to the unique constraint. Returns (per-item results in request
+    order, ids of members that got a check-in).
+    """
+    results: Dict[int, Dict[str, Any]] = {}
+    pending: Dict[str, int] = {}
+    first_index: Dict[str, int] = {}
+
+    for index, item in enumerate(items):
+        if item.idempotency_key in first_index:
+            results[index] = _result(item, "duplicate")
+        elif item.member_id is None and not item.qr_code:
+            results[index] = _result(item, "rejected", error_code=422, detail="member_id or qr_code is required")
+        else:
+            pending[item.idempotency_key] = index
+        first_index.setdefault(item.idempotency_key, index)
+
+    # Keys stored by an earlier sync
+    if pending:
+        stored = (await db.execute(
+            select(CheckIn.idempotency_key, CheckIn.id).where(
+                CheckIn.organization_id == org_id,
+                CheckIn.idempotency_key.in_(list(pending))
+            )
+        )).all()
+        for key, check_in_id in stored:
+            index = pending.pop(key)
+            results[index] = _result(items[index], "duplicate", check_in_id)
+
+    # Resolve QR codes in one query
+    qr_codes = {items[index].qr_code for index in pending.values() if items[index].member_id is None}
+    member_by_qr = {}
+    if qr_codes:
+        member_by_qr = dict((await db.execute(
+            select(Member.qr_code, Member.id).where(
+                Member.organization_id == org_id,
+                Member.qr_code.in_(qr_codes)
+            )
+        )).all())
+
+    scans = []
+    for key, index in list(pending.items()):
+        item = items[index]
+        member_id = item.member_id or member_by_qr.get(item.qr_code)
+        if member_id is None:
+            results[index] = _result(item, "rejected", error_code=404, detail="Invalid QR code")
+            del pending[key]
+            continue
+        at = to_naive_utc(item.check_in_time)
+        scans.append((at, index, member_id, local_date(at, tz)))
+
+    if not scans:
+        return _ordered(results, items, first_index), set()
+
+    member_ids = {member_id for _, _, member_id, _ in scans}
+    first_day = min(day for _, _, _, day in scans)
+    last_day = max(day for _, _, _, day in scans)
+
+    statuses = dict((await db.execute(
+        select(Member.id, Member.status).where(
+            Member.organization_id == org_id,
+            Member.id.in_(member_ids)
+        )
+    )).all())
+
+    memberships = defaultdict(list)
+    for member_id, start_date, end_date in (await db.execute(
+        select(Membership.member_id, Membership.start_date, Membership.end_date).where(
+            Membership.member_id.in_(member_ids),
+            Membership.status == MembershipStatus.ACTIVE,
+            Membership.end_date >= first_day
+        )
+    )).all():
+        memberships[member_id].append([start_date.isoformat(), end_date.isoformat()])
+
+    open_check_ins = {}
+    for member_id, check_in_time in (await db.execute(
+        select(CheckIn.member_id, CheckIn.check_in_time).where(
+            CheckIn.member_id.in_(member_ids),
+            CheckIn.check_out_time == None,
+            days_window(first_day, last_day, tz).clause(CheckIn.check_in_time)
+        )
+    )).all():
+        open_check_ins[(member_id, local_date(check_in_time, tz))] = check_in_time
+
+    # Judge scans in the order they happened so earlier scans win
+    now = datetime.utcnow()
+    rows = []
+    for at, index, member_id, day in sorted(scans, key=lambda scan: scan[0]):
+        item = items[index]
+        if member_id not in statuses:
+            results[index] = _result(item, "rejected", error_code=404, detail="Member not found")
+            continue
+
+        open_at = open_check_ins.get((member_id, day))
+        entry = {
+            "status": statuses[member_id].value,
+            "memberships": memberships[member_id],
+            "open_check_in_at": open_at.isoformat() if open_at else None,
+        }
+        reason = ineligibility_reason(entry, tz, day)
+        if reason:
+            results[index] = _result(item, "rejected", error_code=reason[0], detail=reason[1])
+            continue
+
+        open_check_ins[(member_id, day)] = at
+        rows.append({
+            "id": uuid4(),
+            "organization_id": org_id,
+            "member_id": member_id,
+            "check_in_time": at,
+            "method": item.method,
+            "location_id": item.location_id,
+            "idempotency_key": item.idempotency_key,
+            "created_at": now,
+            "updated_at": now,
+        })
+
+    checked_in = set()
+    if rows:
+        # One multi-row INSERT; rows whose key raced in from a concurrent sync are skipped
+        inserted = dict((await db.execute(
+            insert(CheckIn).values(rows).on_conflict_do_nothing(
+                constraint="uq_check_ins_org_idempotency_key"
+            ).returning(CheckIn.idempotency_key, CheckIn.id)
+        )).all())
+        await db.execute(rebuild_attendance(org_id, {row["member_id"] for row in rows}, tz))
+
+        # Core INSERTs bypass the flush hook that makes reads sticky to the primary
+        db.info["wrote"] = True
+        await db.commit()
+
+        raced = {row["idempotency_key"] for row in rows if row["idempotency_key"] not in inserted}
+        if raced:
+            inserted.update(dict((await db.execute(
+                select(CheckIn.idempotency_key, CheckIn.id).where(
+                    CheckIn.organization_id == org_id,
+                    CheckIn.idempotency_key.in_(list(raced))
+                )
+            )).all()))
+
+        created = []
+        for row in rows:
+            key = row["idempotency_key"]
+            index = pending[key]
+            if key in raced:
+                results[index] = _result(items[index], "duplicate", inserted.get(key))
+            else:
+                results[index] = _result(items[index], "created", inserted[key])
+                checked_in.add(row["member_id"])
+                created.append((row["check_in_time"], row["location_id"], 1))
+
+        await occupancy_counter.adjust_async(org_id, tz, created)
+
+    return _ordered(results, items, first_index), checked_in
@@ -0,0 +1,208 @@
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Optional
+from uuid import UUID, uuid4
+import numpy as np
+import pandas as pd
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.attendance import MemberAttendance
+from app.models.checkin import CheckIn
+from app.models.membership import Membership, MembershipStatus
+from app.models.organization import Organization
+from app.models.risk import MemberRiskScore
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Risk factor weights; organizations override them with settings["churn_weights"]
+DEFAULT_CHURN_WEIGHTS = {
+    "low_attendance": 30,   # fewer than LOW_ATTENDANCE_PER_WEEK visits a week over 8 weeks
+    "inactive": 40,         # no visit in INACTIVE_DAYS days
+    "expiring": 30,         # membership ends within EXPIRING_DAYS days and won't renew
+}
+RECOMMENDED_ACTIONS = {
+    "low_attendance": "Invite them to a class or offer a session with a trainer",
+    "inactive": "Reach out personally to check in",
+    "expiring": "Send a renewal offer before the membership ends",
+}
+LOW_ATTENDANCE_PER_WEEK = 2
+INACTIVE_DAYS = 14
+EXPIRING_DAYS = 30
+FEATURE_WEEKS = 8
+
+FEATURE_COLUMNS = [
+    "organization_id", "member_id", "end_date", "auto_renew", "visits", "recent_visits", "last_visit"
+]
+
+
+def churn_weights(organization_settings) -> Dict[str, float]:
+    """An organization's risk factor weights, falling back to the defaults per factor"""
+    overrides = (organization_settings or {}).get("churn_weights") or {}
+    weights = {}
+    for factor, default in DEFAULT_CHURN_WEIGHTS.items():
+        try:
+            weights[factor] = max(0.0, float(overrides.get(factor, default)))
+        except (TypeError, ValueError):
+            weights[factor] = float(default)
+    return weights
+
+
+def churn_threshold(organization_settings) -> float:
+    """Score at or above which an organization's members count as at risk"""
+    value = (organization_settings or {}).get("churn_risk_threshold")
+    try:
+        return float(value) if value is not None else settings.CHURN_RISK_THRESHOLD
+    except (TypeError, ValueError):
+        return settings.CHURN_RISK_THRESHOLD
+
+
+def churn_features(today: date, org_id: Optional[UUID] = None):
+    """
+    One row of scoring features per member with an active membership.
+
+    DISTINCT ON keeps each member's latest-ending active membership, visits over the
+    feature window come from one grouped scan of the recent check_ins partitions, and
+    the last visit is read from member_attendance instead of all check-in history.
+    """
+    memberships = select(
+        Membership.organization_id,
+        Membership.member_id,
+        Membership.end_date,
+        Membership.auto_renew
+    ).where(
+        Membership.status == MembershipStatus.ACTIVE
+    ).distinct(Membership.member_id).order_by(Membership.member_id, Membership.end_date.desc())
+
+    window_start = datetime.combine(today - timedelta(weeks=FEATURE_WEEKS), datetime.min.time())
+    recent_start = datetime.combine(today - timedelta(weeks=FEATURE_WEEKS // 2), datetime.min.time())
+    visits = select(
+        CheckIn.member_id,
+        func.count().label("visits"),
+        func.count().filter(CheckIn.check_in_time >= recent_start).label("recent_visits")
+    ).where(CheckIn.check_in_time >= window_start).group_by(CheckIn.member_id)
+
+    if org_id:
+        memberships = memberships.where(Membership.organization_id == org_id)
+        visits = visits.where(CheckIn.organization_id == org_id)
+
+    memberships = memberships.subquery()
+    visits = visits.subquery()
+
+    return select(
+        memberships.c.organization_id,
+        memberships.c.member_id,
+        memberships.c.end_date,
+        memberships.c.auto_renew,
+        func.coalesce(visits.c.visits, 0),
+        func.coalesce(visits.c.recent_visits, 0),
+        MemberAttendance.last_visit
+    ).outerjoin(
+        visits, visits.c.member_id == memberships.c.member_id
+    ).outerjoin(
+        MemberAttendance, MemberAttendance.member_id == memberships.c.member_id
+    )
+
+
+def score_features(features: pd.DataFrame, org_settings: Dict[Any, Any], today: date) -> pd.DataFrame:
+    """Vectorized risk scores for a feature frame, using each row's organization weights"""
+    weights = {org_id: churn_weights(value) for org_id, value in org_settings.items()}
+    thresholds = {org_id: churn_threshold(value) for org_id, value in org_settings.items()}
+
+    today_ts = pd.Timestamp(today)
+    visits_per_week = features["visits"].astype(float) / FEATURE_WEEKS
+    last_visit = pd.to_datetime(features["last_visit"])
+    end_date = pd.to_datetime(features["end_date"])
+    auto_renew = features["auto_renew"].fillna(True).astype(bool)
+
+    factors = pd.DataFrame({
+        "low_attendance": visits_per_week < LOW_ATTENDANCE_PER_WEEK,
+        "inactive": last_visit.isna() | (last_visit < today_ts - pd.Timedelta(days=INACTIVE_DAYS)),
+        "expiring": ((end_date - today_ts).dt.days <= EXPIRING_DAYS) & ~auto_renew,
+    })
+
+    weight_frame = pd.DataFrame.from_dict(weights, orient="index")[list(DEFAULT_CHURN_WEIGHTS)].reindex(
+        features["organization_id"]
+    ).set_axis(features.index)
+    total = weight_frame.sum(axis=1).replace(0, np.nan)
+    score = ((factors * weight_frame).sum(axis=1) / total).fillna(0.0)
+
+    # Compare the second half of the window with the first
+    recent = features["recent_visits"].astype(float)
+    earlier = features["visits"].astype(float) - recent
+    trend = np.select(
+        [recent > earlier * 1.2, recent < earlier * 0.8],
+        ["increasing", "declining"],
+        default="stable"
+    )
+
+    return pd.DataFrame({
+        "organization_id": features["organization_id"],
+        "member_id": features["member_id"],
+        "scored_on": today,
+        "score": score.round(4),
+        "at_risk": score >= features["organization_id"].map(thresholds),
+        "factors": [
+            [name for name, present in zip(factors.columns, row) if present]
+            for row in factors.itertuples(index=False)
+        ],
+        "visits_per_week": visits_per_week.round(2),
+        "last_visit": features["last_visit"],
+        "membership_end_date": features["end_date"],
+        "attendance_trend": trend,
+    })
+
+
+def save_scores(db: Session, scores: pd.DataFrame) -> None:
+    """Upsert a day's scores in chunks, so re-running a day replaces its rows"""
+    columns = ["score", "at_risk", "factors", "visits_per_week", "last_visit", "membership_end_date", "attendance_trend"]
+    records = scores.astype(object).where(scores.notna(), None).to_dict("records")
+    now = datetime.utcnow()
+
+    for start in range(0, len(records), settings.CHURN_SCORE_BATCH_SIZE):
+        stmt = insert(MemberRiskScore).values([
+            {**record, "id": uuid4(), "created_at": now, "updated_at": now}
+            for record in records[start:start + settings.CHURN_SCORE_BATCH_SIZE]
+        ])
+        db.execute(stmt.on_conflict_do_update(
+            constraint="uq_member_risk_scores_member_scored_on",
+            set_={**{name: stmt.excluded[name] for name in columns}, "updated_at": func.now()}
+        ))
+
+
+def score_churn_risk(db: Session, org_id: Optional[UUID] = None, today: Optional[date] = None) -> pd.DataFrame:
+    """Score every member with an active membership (optionally one organization) and store the results"""
+    today = today or date.today()
+
+    rows = db.execute(churn_features(today, org_id)).all()
+    features = pd.DataFrame(rows, columns=FEATURE_COLUMNS)
+    if features.empty:
+        return features
+
+    org_query = select(Organization.id, Organization.settings)
+    if org_id:
+        org_query = org_query.where(Organization.id == org_id)
+    org_settings = dict(db.execute(org_query).all())
+
+    scores = score_features(features, org_settings, today)
+    save_scores(db, scores)
+    db.commit()
+    return scores
+
+
+def churn_prediction(score: MemberRiskScore, member_name: str, today: Optional[date] = None) -> Dict[str, Any]:
+    """API representation of a stored risk score"""
+    today = today or date.today()
+    return {
+        "member_id": score.member_id,
+        "member_name": member_name,
+        "churn_risk_score": score.score,
+        "scored_on": score.scored_on,
+        "last_visit_days_ago": (today - score.last_visit.date()).days if score.last_visit else None,
+        "membership_expires_in_days": (
+            (score.membership_end_date - today).days if score.membership_end_date else None
+        ),
+        "attendance_trend": score.attendance_trend,
+        "recommended_actions": [RECOMMENDED_ACTIONS[factor] for factor in score.factors or []],
+    }
@@ -0,0 +1,113 @@
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+import io
+import json
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import types as sqltypes
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from app.core.config import settings
+
+COLUMNAR_FORMATS = {"parquet", "arrow"}
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands its bytes back in chunks while tracking the absolute offset"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _field(column) -> tuple:
+    """(Arrow field, value converter) for a selected SQLAlchemy column"""
+    column_type = column.type
+    convert: Optional[Callable[[Any], Any]] = None
+
+    if isinstance(column_type, PGUUID):
+        arrow_type = pa.string()
+        convert = str
+    elif isinstance(column_type, sqltypes.Enum):
+        # The app's enums subclass str, so pyarrow encodes them without conversion
+        arrow_type = pa.dictionary(pa.int32(), pa.string())
+    elif isinstance(column_type, sqltypes.Numeric) and not isinstance(column_type, sqltypes.Float):
+        arrow_type = pa.decimal128(column_type.precision or 38, column_type.scale or 0)
+    elif isinstance(column_type, sqltypes.DateTime):
+        arrow_type = pa.timestamp("us")
+    elif isinstance(column_type, sqltypes.Date):
+        arrow_type = pa.date32()
+    elif isinstance(column_type, sqltypes.Boolean):
+        arrow_type = pa.bool_()
+    elif isinstance(column_type, sqltypes.Integer):
+        arrow_type = pa.int64()
+    elif isinstance(column_type, sqltypes.Float):
+        arrow_type = pa.float64()
+    elif isinstance(column_type, sqltypes.String):
+        arrow_type = pa.string()
+    else:
+        arrow_type = pa.string()
+        convert = str
+
+    return pa.field(column.key, arrow_type), convert
+
+
+def arrow_schema(columns, header: Dict[str, Any]) -> tuple:
+    """Arrow schema for a statement's selected columns, with the report header as metadata"""
+    fields, converters = zip(*[_field(column) for column in columns])
+    metadata = {"report": json.dumps(header, default=str)}
+    return pa.schema(list(fields), metadata=metadata), list(converters)
+
+
+def record_batches(rows: Iterable, schema: pa.Schema, converters: list) -> Iterator[pa.RecordBatch]:
+    """Transpose row batches into columns and build one typed Arrow array per column"""
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, settings.REPORT_EXPORT_BATCH_SIZE))
+        if not batch:
+            return
+
+        arrays = []
+        for field, convert, values in zip(schema, converters, zip(*batch)):
+            if convert is not None:
+                values = [None if value is None else convert(value) for value in values]
+            arrays.append(pa.array(values, type=field.type))
+
+        yield pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def columnar_chunks(format: str, header: Dict[str, Any], rows: Iterable, columns) -> Iterator[bytes]:
+    """Write detail rows as Parquet or an Arrow IPC stream, yielding bytes as batches are written"""
+    schema, converters = arrow_schema(columns, header)
+    sink = _ChunkSink()
+
+    if format == "parquet":
+        writer = pq.ParquetWriter(pa.PythonFile(sink, mode="w"), schema, compression="zstd")
+    else:
+        writer = pa.ipc.new_stream(pa.PythonFile(sink, mode="w"), schema)
+
+    try:
+        for batch in record_batches(rows, schema, converters):
+            writer.write_batch(batch)
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    finally:
+        writer.close()
+
+    yield sink.drain()
@@ -0,0 +1,257 @@
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from uuid import UUID
+from sqlalchemy import select, func, and_
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.time_windows import local_today, day_window
+from app.models.member import Member
+from app.models.membership import Membership, MembershipStatus
+from app.models.checkin import CheckIn
+from app.models.payment import Payment, PaymentStatus
+from app.models.class_model import ClassSchedule, ClassBooking
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class MetricContext:
+    """Dates and tenant scope shared by every metric expression in one computation"""
+
+    def __init__(self, org_id: UUID, tz: Optional[str] = None, today: Optional[date] = None):
+        self.org_id = org_id
+        self.tz = tz
+        self.today = today or local_today(tz)
+        self.yesterday = self.today - timedelta(days=1)
+        self.week_from_now = self.today + timedelta(days=7)
+
+        # Half-open timestamp bounds so range predicates stay index friendly
+        self.today_window = day_window(self.today, tz)
+        self.yesterday_window = day_window(self.yesterday, tz)
+
+
+class MetricSource:
+    """A table (or join) whose metrics are aggregated together in a single statement"""
+
+    def __init__(
+        self,
+        name: str,
+        select_from: Callable[[], Any],
+        scope: Callable[[MetricContext], List[Any]]
+    ):
+        self.name = name
+        self.select_from = select_from
+        self.scope = scope
+
+
+class DashboardMetric:
+    """A single dashboard tile computed as a conditional aggregate over its source"""
+
+    def __init__(
+        self,
+        name: str,
+        source: str,
+        expression: Callable[[MetricContext], Any],
+        coerce: Callable[[Any], Any] = int
+    ):
+        self.name = name
+        self.source = source
+        self.expression = expression
+        self.coerce = coerce
+
+
+class DashboardMetricsEngine:
+    """
+    Registry of dashboard metrics grouped by source table.
+
+    All metrics registered against the same source are folded into one
+    SELECT using FILTER clauses, so adding a tile never adds a round trip.
+    """
+
+    def __init__(self):
+        self._sources: Dict[str, MetricSource] = {}
+        self._metrics: Dict[str, DashboardMetric] = {}
+
+    def register_source(self, source: MetricSource) -> MetricSource:
+        """Register a metric source"""
+        self._sources[source.name] = source
+        return source
+
+    def register(self, metric: DashboardMetric) -> DashboardMetric:
+        """Register a metric against an existing source"""
+        if metric.source not in self._sources:
+            raise ValueError(f"Unknown metric source: {metric.source}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def metric(self, name: str, source: str, coerce: Callable[[Any], Any] = int):
+        """Decorator form of register() for metric expression builders"""
+        def decorator(expression: Callable[[MetricContext], Any]):
+            self.register(DashboardMetric(name, source, expression, coerce))
+            return expression
+        return decorator
+
+    @property
+    def metric_names(self) -> List[str]:
+        return list(self._metrics.keys())
+
+    def build_statements(self, ctx: MetricContext, skip: Iterable[str] = ()) -> Dict[str, Any]:
+        """Build one aggregate statement per source that has registered metrics (other than skip)"""
+        grouped: Dict[str, List[DashboardMetric]] = {}
+        for metric in self._metrics.values():
+            if metric.name not in skip:
+                grouped.setdefault(metric.source, []).append(metric)
+
+        statements = {}
+        for source_name, metrics in grouped.items():
+            source = self._sources[source_name]
+            columns = [metric.expression(ctx).label(metric.name) for metric in metrics]
+            statements[source_name] = select(*columns).select_from(
+                source.select_from()
+            ).where(*source.scope(ctx))
+
+        return statements
+
+    def compute(self, db: Session, org_id: UUID, tz: Optional[str] = None,
+                today: Optional[date] = None, known: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Compute every registered metric for an organization.
+
+        Metrics in known (e.g. values read from live counters) are taken as given
+        and left out of the statements.
+        """
+        ctx = MetricContext(org_id, tz, today)
+        results: Dict[str, Any] = dict(known or {})
+
+        for statement in self.build_statements(ctx, skip=results).values():
+            row = db.execute(statement).one()._mapping
+            for name, value in row.items():
+                results[name] = self._metrics[name].coerce(value or 0)
+
+        return results
+
+    async def compute_async(self, db: AsyncSession, org_id: UUID, tz: Optional[str] = None,
+                            today: Optional[date] = None, known: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Compute every registered metric for an organization on an async session"""
+        ctx = MetricContext(org_id, tz, today)
+        results: Dict[str, Any] = dict(known or {})
+
+        for statement in self.build_statements(ctx, skip=results).values():
+            row = (await db.execute(statement)).one()._mapping
+            for name, value in row.items():
+                results[name] = self._metrics[name].coerce(value or 0)
+
+        return results
+
+
+dashboard_metrics = DashboardMetricsEngine()
+
+
+# ===== SOURCES =====
+dashboard_metrics.register_source(MetricSource(
+    "check_ins",
+    select_from=lambda: CheckIn,
+    # Only yesterday and today are ever needed, so bound the scan on the indexed column
+    scope=lambda ctx: [
+        CheckIn.organization_id == ctx.org_id,
+        CheckIn.check_in_time >= ctx.yesterday_window.start,
+        CheckIn.check_in_time < ctx.today_window.end
+    ]
+))
+
+dashboard_metrics.register_source(MetricSource(
+    "payments",
+    select_from=lambda: Payment,
+    scope=lambda ctx: [Payment.organization_id == ctx.org_id]
+))
+
+dashboard_metrics.register_source(MetricSource(
+    "memberships",
+    select_from=lambda: Membership,
+    scope=lambda ctx: [
+        Membership.organization_id == ctx.org_id,
+        Membership.status == MembershipStatus.ACTIVE
+    ]
+))
+
+dashboard_metrics.register_source(MetricSource(
+    "members",
+    select_from=lambda: Member,
+    scope=lambda ctx: [Member.organization_id == ctx.org_id]
+))
+
+dashboard_metrics.register_source(MetricSource(
+    "class_bookings",
+    select_from=lambda: ClassBooking.__table__.join(
+        ClassSchedule.__table__, ClassBooking.schedule_id == ClassSchedule.id
+    ),
+    scope=lambda ctx: [
+        ClassSchedule.organization_id == ctx.org_id,
+        ClassSchedule.scheduled_date == ctx.today
+    ]
+))
+
+
+# ===== METRICS =====
+# The dashboard passes the live occupancy counter as a known value; this count only
+# runs when Redis is unavailable
+@dashboard_metrics.metric("current_occupancy", source="check_ins")
+def _current_occupancy(ctx: MetricContext):
+    return func.count().filter(and_(
+        CheckIn.check_in_time >= ctx.today_window.start,
+        CheckIn.check_out_time.is_(None)
+    ))
+
+
+@dashboard_metrics.metric("checkins_today", source="check_ins")
+def _checkins_today(ctx: MetricContext):
+    return func.count().filter(CheckIn.check_in_time >= ctx.today_window.start)
+
+
+@dashboard_metrics.metric("checkins_yesterday", source="check_ins")
+def _checkins_yesterday(ctx: MetricContext):
+    return func.count().filter(CheckIn.check_in_time < ctx.today_window.start)
+
+
+@dashboard_metrics.metric("revenue_today", source="payments", coerce=float)
+def _revenue_today(ctx: MetricContext):
+    return func.sum(Payment.amount).filter(and_(
+        Payment.status == PaymentStatus.COMPLETED,
+        Payment.payment_date == ctx.today
+    ))
+
+
+@dashboard_metrics.metric("revenue_yesterday", source="payments", coerce=float)
+def _revenue_yesterday(ctx: MetricContext):
+    return func.sum(Payment.amount).filter(and_(
+        Payment.status == PaymentStatus.COMPLETED,
+        Payment.payment_date == ctx.yesterday
+    ))
+
+
+@dashboard_metrics.metric("overdue_payments", source="payments")
+def _overdue_payments(ctx: MetricContext):
+    return func.count().filter(and_(
+        Payment.status == PaymentStatus.PENDING,
+        Payment.due_date < ctx.today
+    ))
+
+
+@dashboard_metrics.metric("active_memberships", source="memberships")
+def _active_memberships(ctx: MetricContext):
+    return func.count()
+
+
+@dashboard_metrics.metric("expiring_memberships_this_week", source="memberships")
+def _expiring_memberships(ctx: MetricContext):
+    return func.count().filter(Membership.end_date.between(ctx.today, ctx.week_from_now))
+
+
+@dashboard_metrics.metric("new_members_today", source="members")
+def _new_members_today(ctx: MetricContext):
+    return func.count().filter(ctx.today_window.clause(Member.created_at))
+
+
+@dashboard_metrics.metric("class_bookings_today", source="class_bookings")
+def _class_bookings_today(ctx: MetricContext):
+    return func.count(ClassBooking.id)
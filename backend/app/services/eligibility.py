@@ -0,0 +1,270 @@
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Optional, Tuple
+from collections import Counter, OrderedDict
+import json
+import threading
+import time
+import redis
+import redis.asyncio
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.time_windows import local_today, day_window, today_window, to_naive_utc
+from app.db.redis import get_redis, get_async_redis
+from app.models.checkin import CheckIn
+from app.models.member import Member, MemberStatus
+from app.models.membership import Membership, MembershipStatus
+import logging
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "fitflow:elig"
+
+
+class LocalLRU:
+    """Small thread-safe LRU whose entries expire after a fixed number of seconds"""
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class EligibilityCache:
+    """
+    Check-in eligibility per member: status, active membership windows and the
+    time of today's open check-in, if any.
+
+    Entries live in Redis with a short-lived in-process LRU in front, so a repeat scan
+    at the same turnstile costs no round trip at all. Invalidation drops the Redis key
+    and this process's copy; other processes may serve their local copy for up to
+    ELIGIBILITY_LOCAL_TTL_SECONDS longer.
+    """
+
+    def __init__(self, client: Optional[redis.Redis] = None, async_client: Optional[redis.asyncio.Redis] = None):
+        self._client = client
+        self._async_client = async_client
+        self.local = LocalLRU(settings.ELIGIBILITY_LOCAL_CACHE_SIZE, settings.ELIGIBILITY_LOCAL_TTL_SECONDS)
+        self.metrics: Counter = Counter()
+
+    @property
+    def client(self) -> redis.Redis:
+        return self._client or get_redis()
+
+    @property
+    def async_client(self) -> redis.asyncio.Redis:
+        return self._async_client or get_async_redis()
+
+    # ===== KEYS =====
+    @staticmethod
+    def member_key(org_id, member_id) -> str:
+        return f"{KEY_PREFIX}:member:{org_id}:{member_id}"
+
+    @staticmethod
+    def qr_key(org_id, qr_code: str) -> str:
+        return f"{KEY_PREFIX}:qr:{org_id}:{qr_code}"
+
+    # ===== LOOKUP =====
+    async def _get(self, key: str) -> Optional[Any]:
+        value = self.local.get(key)
+        if value is not None:
+            self.metrics["local_hit"] += 1
+            return value
+
+        try:
+            raw = await self.async_client.get(key)
+        except redis.RedisError as e:
+            logger.warning(f"Eligibility cache unavailable: {str(e)}")
+            self.metrics["error"] += 1
+            return None
+
+        if raw is None:
+            self.metrics["miss"] += 1
+            return None
+
+        self.metrics["hit"] += 1
+        value = json.loads(raw)
+        self.local.set(key, value)
+        return value
+
+    async def get_async(self, org_id, member_id) -> Optional[Dict[str, Any]]:
+        """Cached eligibility entry for a member, or None on a miss"""
+        if not settings.ELIGIBILITY_CACHE_ENABLED:
+            return None
+        return await self._get(self.member_key(org_id, member_id))
+
+    async def resolve_qr_async(self, org_id, qr_code: str) -> Optional[str]:
+        """Member id a QR code was last seen to belong to, or None on a miss"""
+        if not settings.ELIGIBILITY_CACHE_ENABLED:
+            return None
+        return await self._get(self.qr_key(org_id, qr_code))
+
+    async def store_async(self, org_id, entry: Dict[str, Any]) -> None:
+        """Write an entry (and its QR mapping) to Redis and the local LRU"""
+        if not settings.ELIGIBILITY_CACHE_ENABLED:
+            return
+
+        key = self.member_key(org_id, entry["member_id"])
+        self.local.set(key, entry)
+        try:
+            pipe = self.async_client.pipeline(transaction=False)
+            pipe.set(key, json.dumps(entry), ex=settings.ELIGIBILITY_CACHE_TTL_SECONDS)
+            if entry["qr_code"]:
+                qr_key = self.qr_key(org_id, entry["qr_code"])
+                self.local.set(qr_key, entry["member_id"])
+                pipe.set(qr_key, json.dumps(entry["member_id"]), ex=settings.ELIGIBILITY_CACHE_TTL_SECONDS)
+            await pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Error storing eligibility for member {entry['member_id']}: {str(e)}")
+
+    # ===== INVALIDATION =====
+    def invalidate(self, org_id, *member_ids) -> None:
+        """Drop members' entries after a member, membership or check-in write"""
+        self.invalidate_keys([self.member_key(org_id, member_id) for member_id in member_ids])
+
+    def invalidate_members(self, pairs: Iterable[Tuple[Any, Any]]) -> None:
+        """Drop entries for (org_id, member_id) pairs across organizations (for batch jobs)"""
+        self.invalidate_keys([self.member_key(org_id, member_id) for org_id, member_id in pairs])
+
+    def invalidate_keys(self, keys: list) -> None:
+        for key in keys:
+            self.local.delete(key)
+        if not settings.ELIGIBILITY_CACHE_ENABLED or not keys:
+            return
+        try:
+            self.client.delete(*keys)
+        except redis.RedisError as e:
+            logger.warning(f"Error invalidating {len(keys)} eligibility entries: {str(e)}")
+
+    async def invalidate_async(self, org_id, *member_ids) -> None:
+        """Async variant of invalidate() for endpoints running on the event loop"""
+        keys = [self.member_key(org_id, member_id) for member_id in member_ids]
+        for key in keys:
+            self.local.delete(key)
+        if not settings.ELIGIBILITY_CACHE_ENABLED or not keys:
+            return
+        try:
+            await self.async_client.delete(*keys)
+        except redis.RedisError as e:
+            logger.warning(f"Error invalidating eligibility for {member_ids}: {str(e)}")
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters for this process"""
+        return dict(self.metrics)
+
+
+eligibility_cache = EligibilityCache()
+
+
+async def load_eligibility_async(db: AsyncSession, org_id, tz=None, member_id=None,
+                                 qr_code: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Build a member's eligibility entry from the database (by id or QR code)"""
+    member_query = select(Member.id, Member.qr_code, Member.status).where(Member.organization_id == org_id)
+    if qr_code is not None:
+        member_query = member_query.where(Member.qr_code == qr_code)
+    else:
+        member_query = member_query.where(Member.id == member_id)
+
+    member = (await db.execute(member_query)).first()
+    if not member:
+        return None
+
+    # Every active membership that has not ended yet, so the entry stays valid across days
+    windows = (await db.execute(
+        select(Membership.start_date, Membership.end_date).where(
+            Membership.member_id == member.id,
+            Membership.status == MembershipStatus.ACTIVE,
+            Membership.end_date >= local_today(tz)
+        )
+    )).all()
+
+    open_check_in_at = (await db.execute(
+        select(func.max(CheckIn.check_in_time)).where(
+            CheckIn.member_id == member.id,
+            CheckIn.check_out_time == None,
+            today_window(tz).clause(CheckIn.check_in_time)
+        )
+    )).scalar()
+
+    return {
+        "member_id": str(member.id),
+        "qr_code": member.qr_code,
+        "status": member.status.value,
+        "memberships": [[start.isoformat(), end.isoformat()] for start, end in windows],
+        "open_check_in_at": open_check_in_at.isoformat() if open_check_in_at else None,
+    }
+
+
+async def get_eligibility_async(db: AsyncSession, org_id, tz=None, member_id=None,
+                                qr_code: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Eligibility entry from the cache, loading and caching it on a miss"""
+    if qr_code is not None:
+        member_id = await eligibility_cache.resolve_qr_async(org_id, qr_code)
+
+    entry = await eligibility_cache.get_async(org_id, member_id) if member_id else None
+    # A regenerated QR code leaves a stale mapping behind; only trust it if the entry agrees
+    if entry is not None and (qr_code is None or entry["qr_code"] == qr_code):
+        return entry
+
+    entry = await load_eligibility_async(
+        db, org_id, tz, member_id=None if qr_code is not None else member_id, qr_code=qr_code
+    )
+    if entry is not None:
+        await eligibility_cache.store_async(org_id, entry)
+    return entry
+
+
+def with_open_check_in(entry: Dict[str, Any], check_in_time: datetime) -> Dict[str, Any]:
+    """Copy of an entry recording a check-in that was just opened"""
+    return {**entry, "open_check_in_at": to_naive_utc(check_in_time).isoformat()}
+
+
+def has_active_membership(entry: Dict[str, Any], day: date) -> bool:
+    return any(
+        date.fromisoformat(start) <= day <= date.fromisoformat(end)
+        for start, end in entry["memberships"]
+    )
+
+
+def is_checked_in(entry: Dict[str, Any], tz=None, day: Optional[date] = None) -> bool:
+    """Whether the member has a check-in on day (default today) that is still open"""
+    if not entry["open_check_in_at"]:
+        return False
+    window = day_window(day, tz) if day else today_window(tz)
+    return datetime.fromisoformat(entry["open_check_in_at"]) in window
+
+
+def ineligibility_reason(entry: Dict[str, Any], tz=None, day: Optional[date] = None) -> Optional[tuple]:
+    """(HTTP status, detail) explaining why a member cannot check in on day (default today), or None"""
+    day = day or local_today(tz)
+    if entry["status"] != MemberStatus.ACTIVE.value:
+        return 403, f"Member is {entry['status']}. Cannot check in."
+    if not has_active_membership(entry, day):
+        return 403, "No active membership found for this member"
+    if is_checked_in(entry, tz, day):
+        return 400, "Member is already checked in. Please check out first."
+    return None
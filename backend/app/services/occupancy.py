@@ -0,0 +1,129 @@
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Optional, Tuple
+import redis
+import redis.asyncio
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.time_windows import local_date, local_today, today_window
+from app.db.redis import get_redis, get_async_redis
+from app.models.checkin import CheckIn
+import logging
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "fitflow:occupancy"
+TOTAL = "total"
+UNASSIGNED = "unassigned"
+
+# (check_in_time, location_id, +1 for a check-in / -1 for a check-out)
+OccupancyChange = Tuple[datetime, Any, int]
+
+
+class OccupancyCounter:
+    """
+    Live occupancy per organization and location, kept as Redis hash counters.
+
+    Each organization has one hash per local day holding the total and one field per
+    location, so reading occupancy is a single HGETALL. Check-ins and check-outs
+    adjust the day of the check-in after their transaction commits; check-ins still
+    open at local midnight drop out with the day, matching the "open check-ins today"
+    definition the queries used. reconcile_occupancy rewrites the hashes from the
+    check_ins table to correct any drift.
+    """
+
+    def __init__(self, client: Optional[redis.Redis] = None, async_client: Optional[redis.asyncio.Redis] = None):
+        self._client = client
+        self._async_client = async_client
+
+    @property
+    def client(self) -> redis.Redis:
+        return self._client or get_redis()
+
+    @property
+    def async_client(self) -> redis.asyncio.Redis:
+        return self._async_client or get_async_redis()
+
+    @staticmethod
+    def key(org_id, day: date) -> str:
+        return f"{KEY_PREFIX}:{org_id}:{day.isoformat()}"
+
+    @staticmethod
+    def location_field(location_id) -> str:
+        return str(location_id) if location_id else UNASSIGNED
+
+    def _queue_changes(self, pipe, org_id, tz, changes: Iterable[OccupancyChange]) -> None:
+        for check_in_time, location_id, delta in changes:
+            key = self.key(org_id, local_date(check_in_time, tz))
+            pipe.hincrby(key, TOTAL, delta)
+            pipe.hincrby(key, self.location_field(location_id), delta)
+            pipe.expire(key, settings.OCCUPANCY_KEY_TTL_SECONDS)
+
+    def adjust(self, org_id, tz, changes: Iterable[OccupancyChange]) -> None:
+        """Apply committed check-ins/check-outs to the counters"""
+        try:
+            pipe = self.client.pipeline(transaction=True)
+            self._queue_changes(pipe, org_id, tz, changes)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Error updating occupancy for {org_id}: {str(e)}")
+
+    async def adjust_async(self, org_id, tz, changes: Iterable[OccupancyChange]) -> None:
+        """Async variant of adjust() for endpoints running on the event loop"""
+        try:
+            pipe = self.async_client.pipeline(transaction=True)
+            self._queue_changes(pipe, org_id, tz, changes)
+            await pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Error updating occupancy for {org_id}: {str(e)}")
+
+    @staticmethod
+    def _decode(values: Dict) -> Dict[str, Any]:
+        counts = {
+            (field.decode() if isinstance(field, bytes) else field): max(0, int(value))
+            for field, value in values.items()
+        }
+        total = counts.pop(TOTAL, 0)
+        return {"total": total, "locations": {field: count for field, count in counts.items() if count}}
+
+    async def get_async(self, org_id, tz=None) -> Optional[Dict[str, Any]]:
+        """
+        Current occupancy ({"total", "locations"}), or None if Redis is unavailable or
+        holds no counters for today (never written, expired or flushed), in which case
+        callers count from the database instead.
+        """
+        try:
+            values = await self.async_client.hgetall(self.key(org_id, local_today(tz)))
+        except redis.RedisError as e:
+            logger.warning(f"Occupancy counters unavailable for {org_id}: {str(e)}")
+            return None
+        if not values:
+            return None
+        return self._decode(values)
+
+    def replace(self, days: Dict[Tuple[Any, date], Dict[str, int]]) -> None:
+        """Overwrite the given (org_id, day) hashes with recounted values"""
+        pipe = self.client.pipeline(transaction=True)
+        for (org_id, day), counts in days.items():
+            key = self.key(org_id, day)
+            pipe.delete(key)
+            pipe.hset(key, mapping={TOTAL: sum(counts.values()), **counts})
+            pipe.expire(key, settings.OCCUPANCY_KEY_TTL_SECONDS)
+        pipe.execute()
+
+
+occupancy_counter = OccupancyCounter()
+
+
+async def count_occupancy_async(db: AsyncSession, org_id, tz=None) -> Dict[str, Any]:
+    """Occupancy counted from the check_ins table (fallback when Redis is down)"""
+    rows = (await db.execute(
+        select(CheckIn.location_id, func.count(CheckIn.id)).where(
+            CheckIn.organization_id == org_id,
+            CheckIn.check_out_time == None,
+            today_window(tz).clause(CheckIn.check_in_time)
+        ).group_by(CheckIn.location_id)
+    )).all()
+
+    locations = {OccupancyCounter.location_field(location_id): count for location_id, count in rows}
+    return {"total": sum(locations.values()), "locations": locations}
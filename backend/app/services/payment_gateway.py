@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional
 from decimal import Decimal
+from functools import lru_cache
 import stripe
 import razorpay
 from app.core.config import settings
@@ -20,9 +21,11 @@ class PaymentGateway(ABC):
         amount: Decimal,
         currency: str,
         customer_id: str,
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        payment_method_id: Optional[str] = None,
+        idempotency_key: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Create a payment intent"""
+        """Create a payment intent (charged right away when a saved payment method is given)"""
         pass
 
     @abstractmethod
@@ -84,19 +87,27 @@ class StripeGateway(PaymentGateway):
         amount: Decimal,
         currency: str,
         customer_id: str,
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        payment_method_id: Optional[str] = None,
+        idempotency_key: Optional[str] = None
     ) -> Dict[str, Any]:
         """Create a Stripe payment intent"""
         # Stripe expects amount in cents
         amount_cents = int(amount * 100)
 
-        intent = stripe.PaymentIntent.create(
-            amount=amount_cents,
-            currency=currency.lower(),
-            customer=customer_id,
-            metadata=metadata or {},
-            automatic_payment_methods={"enabled": True}
-        )
+        params = {
+            "amount": amount_cents,
+            "currency": currency.lower(),
+            "customer": customer_id,
+            "metadata": metadata or {},
+        }
+        if payment_method_id:
+            # Charge the saved payment method without the customer present
+            params.update(payment_method=payment_method_id, confirm=True, off_session=True)
+        else:
+            params["automatic_payment_methods"] = {"enabled": True}
+
+        intent = stripe.PaymentIntent.create(**params, idempotency_key=idempotency_key)
 
         return {
             "payment_intent_id": intent.id,
@@ -200,17 +211,26 @@ class RazorpayGateway(PaymentGateway):
         amount: Decimal,
         currency: str,
         customer_id: str,
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        payment_method_id: Optional[str] = None,
+        idempotency_key: Optional[str] = None
     ) -> Dict[str, Any]:
         """Create a Razorpay order (equivalent to payment intent)"""
         # Razorpay expects amount in paise (smallest currency unit)
         amount_paise = int(amount * 100)
 
-        order = self.client.order.create({
+        order_data = {
             "amount": amount_paise,
             "currency": currency,
             "notes": metadata or {}
-        })
+        }
+        if idempotency_key:
+            # Razorpay has no idempotency support; the receipt only labels the order with the attempt
+            if len(idempotency_key) > 40:
+                raise ValueError("Razorpay receipts are limited to 40 characters")
+            order_data["receipt"] = idempotency_key
+
+        order = self.client.order.create(order_data)
 
         return {
             "payment_intent_id": order["id"],
@@ -292,3 +312,9 @@ class PaymentGatewayFactory:
             return RazorpayGateway()
         else:
             raise ValueError(f"Unsupported payment gateway: {gateway_type}")
+
+
+@lru_cache()
+def get_shared_gateway(gateway_type: str = "stripe") -> PaymentGateway:
+    """Gateway client reused for the life of the process (for batch jobs charging many payments)"""
+    return PaymentGatewayFactory.get_gateway(gateway_type)
@@ -0,0 +1,109 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from decimal import Decimal
+from typing import Any, Dict, List
+from uuid import UUID
+from sqlalchemy import select
+from app.models.membership import Membership, MembershipStatus
+from app.models.payment import Payment, PaymentStatus
+from app.services.payment_gateway import get_shared_gateway
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Saved payment details live in the pending payment's metadata under these keys
+CUSTOMER_KEY = "customer_id"
+PAYMENT_METHOD_KEY = "payment_method_id"
+
+
+def _renewals():
+    """Pending payments of auto-renewing memberships, one row per renewal"""
+    return select(
+        Payment.id.label("payment_id"),
+        Payment.membership_id,
+        Payment.organization_id,
+        Payment.member_id,
+        Payment.amount,
+        Payment.currency,
+        Payment.payment_gateway,
+        Payment.retry_count,
+        Payment.payment_metadata[CUSTOMER_KEY].as_string().label("customer_id"),
+        Payment.payment_metadata[PAYMENT_METHOD_KEY].as_string().label("payment_method_id")
+    ).join(
+        Membership, Membership.id == Payment.membership_id
+    ).where(
+        Membership.status == MembershipStatus.ACTIVE,
+        Membership.auto_renew == True,
+        Payment.status == PaymentStatus.PENDING
+    )
+
+
+def due_renewals(today: date):
+    """Memberships renewing today joined with their pending payment, one row per renewal"""
+    return _renewals().where(
+        Membership.end_date == today,
+        Payment.due_date == today
+    ).order_by(Payment.id)
+
+
+def pending_renewal(payment_id: UUID):
+    """A renewal whose earlier attempt failed, if its payment is still pending"""
+    return _renewals().where(Payment.id == payment_id)
+
+
+def renewal_task_args(row) -> Dict[str, Any]:
+    """JSON-serializable renewal for a chord batch"""
+    return {
+        "payment_id": str(row.payment_id),
+        "membership_id": str(row.membership_id),
+        "organization_id": str(row.organization_id),
+        "member_id": str(row.member_id),
+        "amount": str(row.amount),
+        "currency": row.currency or "USD",
+        "gateway": row.payment_gateway or "stripe",
+        "attempt": (row.retry_count or 0) + 1,
+        "customer_id": row.customer_id,
+        "payment_method_id": row.payment_method_id,
+    }
+
+
+def renewal_idempotency_key(renewal: Dict[str, Any]) -> str:
+    """
+    Same key for the same payment attempt, so a redelivered or re-run batch cannot
+    charge twice on Stripe, while the next day's retry (a new attempt) is a fresh
+    charge. Kept within Razorpay's 40-character receipt limit, where it only labels
+    the order (Razorpay has no idempotency support).
+    """
+    return f"{UUID(renewal['payment_id']).hex}-{renewal['attempt']}"
+
+
+def charge_renewal(renewal: Dict[str, Any]) -> Dict[str, Any]:
+    """Charge one renewal's saved payment method; never raises"""
+    if not renewal["customer_id"] or not renewal["payment_method_id"]:
+        return {**renewal, "succeeded": False, "error": "No saved payment method"}
+
+    try:
+        gateway = get_shared_gateway(renewal["gateway"])
+        intent = gateway.create_payment_intent(
+            amount=Decimal(renewal["amount"]),
+            currency=renewal["currency"],
+            customer_id=renewal["customer_id"],
+            metadata={"payment_id": renewal["payment_id"], "membership_id": renewal["membership_id"]},
+            payment_method_id=renewal["payment_method_id"],
+            idempotency_key=renewal_idempotency_key(renewal)
+        )
+    except Exception as e:
+        return {**renewal, "succeeded": False, "error": str(e)}
+
+    return {
+        **renewal,
+        "succeeded": intent.get("status") == "succeeded",
+        "transaction_id": intent.get("payment_intent_id"),
+        "error": None if intent.get("status") == "succeeded" else f"Gateway status {intent.get('status')}",
+    }
+
+
+def charge_renewals(renewals: List[Dict[str, Any]], concurrency: int) -> List[Dict[str, Any]]:
+    """Charge a batch with at most concurrency gateway calls in flight"""
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        return list(executor.map(charge_renewal, renewals))
@@ -0,0 +1,173 @@
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+from uuid import UUID
+import csv
+import io
+import json
+import zlib
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db.session import db_router
+from app.services.columnar_export import COLUMNAR_FORMATS, columnar_chunks
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+}
+
+
+def format_value(value: Any) -> Any:
+    """Convert a column value to its JSON/CSV representation"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def format_row(row) -> Dict[str, Any]:
+    """Turn a result row of labelled columns into a plain dict"""
+    return {key: format_value(value) for key, value in row._mapping.items()}
+
+
+def stream_rows(db: Session, statement) -> Iterator:
+    """Iterate a SELECT in batches from a server-side cursor so memory stays flat"""
+    return db.execute(statement.execution_options(yield_per=settings.REPORT_EXPORT_BATCH_SIZE))
+
+
+def _flush(buffer: io.StringIO) -> bytes:
+    chunk = buffer.getvalue().encode()
+    buffer.seek(0)
+    buffer.truncate()
+    return chunk
+
+
+def csv_chunks(header: Dict[str, Any], rows: Optional[Iterable] = None) -> Iterator[bytes]:
+    """Write the report header and summary, then one CSV line per detail row"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(["Report Type", header["report_type"]])
+    writer.writerow(["Start Date", header["start_date"]])
+    writer.writerow(["End Date", header["end_date"]])
+    writer.writerow([])
+
+    writer.writerow(["Summary"])
+    for key, value in header["summary"].items():
+        writer.writerow([key, value])
+
+    # Small breakdown sections (e.g. revenue by method) follow the summary
+    for section, entries in header.items():
+        if section in ("report_type", "start_date", "end_date", "summary") or not entries:
+            continue
+        writer.writerow([])
+        writer.writerow([section.replace("_", " ").title()])
+        writer.writerow(list(entries[0].keys()))
+        for entry in entries:
+            writer.writerow(list(entry.values()))
+
+    yield _flush(buffer)
+
+    if rows is None:
+        return
+
+    columns_written = False
+    for count, row in enumerate(rows, start=1):
+        if not columns_written:
+            writer.writerow([])
+            writer.writerow(["Details"])
+            writer.writerow(list(row._mapping.keys()))
+            columns_written = True
+        writer.writerow([format_value(value) for value in row])
+        if count % settings.REPORT_EXPORT_BATCH_SIZE == 0:
+            yield _flush(buffer)
+
+    yield _flush(buffer)
+
+
+def ndjson_chunks(header: Dict[str, Any], rows: Optional[Iterable] = None) -> Iterator[bytes]:
+    """Write the report header as the first line, then one JSON object per detail row"""
+    buffer = io.StringIO()
+    buffer.write(json.dumps(header, default=format_value) + "\n")
+    yield _flush(buffer)
+
+    if rows is None:
+        return
+
+    for count, row in enumerate(rows, start=1):
+        buffer.write(json.dumps(format_row(row)) + "\n")
+        if count % settings.REPORT_EXPORT_BATCH_SIZE == 0:
+            yield _flush(buffer)
+
+    yield _flush(buffer)
+
+
+def report_chunks(format: str, header: Dict[str, Any], rows: Optional[Iterable] = None,
+                  columns=None) -> Iterator[bytes]:
+    """Serialize a report in an export format; columnar formats carry the header as schema metadata"""
+    if format in COLUMNAR_FORMATS:
+        return columnar_chunks(format, header, rows, columns)
+    if format == "csv":
+        return csv_chunks(header, rows)
+    return ndjson_chunks(header, rows)
+
+
+def gzip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Gzip a chunk stream incrementally"""
+    compressor = zlib.compressobj(wbits=31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def export_response(
+    user_id,
+    build_header: Callable[[Session], Dict[str, Any]],
+    details: Optional[Any],
+    format: str,
+    filename: str,
+    compress: bool = False
+) -> StreamingResponse:
+    """
+    Stream a report as CSV, NDJSON, Parquet or an Arrow IPC stream, optionally gzipped.
+
+    The body is produced after the endpoint returns, when the request's session has
+    already been closed, so the generator opens its own read session.
+    """
+    media_type, extension = EXPORT_FORMATS[format]
+
+    def body() -> Iterator[bytes]:
+        db = db_router.read_session(user_id)
+        try:
+            header = build_header(db)
+            if details is None:
+                yield from report_chunks(format, header)
+            else:
+                rows = stream_rows(db, details)
+                yield from report_chunks(format, header, rows, details.selected_columns)
+        finally:
+            db.close()
+
+    chunks = body()
+    filename = f"{filename}_{datetime.now().strftime('%Y%m%d')}.{extension}"
+    if compress:
+        chunks = gzip_chunks(chunks)
+        media_type = "application/gzip"
+        filename += ".gz"
+
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
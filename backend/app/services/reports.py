@@ -0,0 +1,315 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+from uuid import UUID
+import hashlib
+import json
+from sqlalchemy import select, func, and_, case
+from sqlalchemy.orm import Session
+from app.models.membership import Membership, MembershipStatus
+from app.models.payment import Payment, PaymentStatus
+from app.models.checkin import CheckIn
+from app.models.class_model import ClassSchedule, ClassBooking, BookingStatus
+from app.models.report import Report, ReportStatus
+from app.services.rollups import get_checkin_rows, get_revenue_rows
+from app.services.report_export import format_value
+from app.services.cache import analytics_cache, CHECK_INS, PAYMENTS, MEMBERSHIPS, CLASSES
+from app.core.time_windows import days_window, local_today
+from app.core.config import settings
+
+# Cache domains each report type depends on
+REPORT_DOMAINS = {
+    "membership": [MEMBERSHIPS],
+    "financial": [PAYMENTS],
+    "attendance": [CHECK_INS],
+    "performance": [CLASSES, MEMBERSHIPS],
+}
+
+
+def build_report_header(report_type: str, org_id: UUID, start_date: datetime, end_date: datetime, db: Session,
+                        tz: Optional[str] = None) -> Dict[str, Any]:
+    """Build a report's summary and breakdown sections (everything except detail rows)"""
+    if report_type == "membership":
+        return generate_membership_report(org_id, start_date, end_date, db)
+    elif report_type == "financial":
+        return generate_financial_report(org_id, start_date, end_date, db, tz)
+    elif report_type == "attendance":
+        return generate_attendance_report(org_id, start_date, end_date, db, tz)
+    return generate_performance_report(org_id, start_date, end_date, db)
+
+
+def build_report_details(report_type: str, org_id: UUID, start_date: datetime, end_date: datetime,
+                         tz: Optional[str] = None):
+    """(JSON key, SELECT) for a report's detail rows, or None if it has none"""
+    details = REPORT_DETAILS.get(report_type)
+    if details is None:
+        return None
+    return details[0], details[1](org_id, start_date, end_date, tz)
+
+
+def generate_membership_report(org_id: UUID, start_date: datetime, end_date: datetime, db: Session):
+    """Generate membership report summary"""
+    counts = db.execute(
+        select(
+            func.count().filter(Membership.status == MembershipStatus.ACTIVE).label("total_active"),
+            func.count().filter(
+                Membership.created_at.between(start_date, end_date)
+            ).label("new_memberships"),
+            func.count().filter(and_(
+                Membership.status == MembershipStatus.EXPIRED,
+                Membership.end_date.between(start_date, end_date)
+            )).label("expired_memberships"),
+            func.count().filter(and_(
+                Membership.status == MembershipStatus.CANCELLED,
+                Membership.cancellation_date.between(start_date.date(), end_date.date())
+            )).label("cancelled_memberships")
+        ).where(Membership.organization_id == org_id)
+    ).one()
+
+    return {
+        "report_type": "membership",
+        "start_date": start_date.isoformat(),
+        "end_date": end_date.isoformat(),
+        "summary": dict(counts._mapping)
+    }
+
+
+def membership_details(org_id: UUID, start_date: datetime, end_date: datetime, tz: Optional[str] = None):
+    """Active memberships, one row each"""
+    return select(
+        Membership.member_id,
+        Membership.plan_id,
+        Membership.start_date,
+        Membership.end_date,
+        Membership.auto_renew
+    ).where(
+        Membership.organization_id == org_id,
+        Membership.status == MembershipStatus.ACTIVE
+    )
+
+
+def generate_financial_report(org_id: UUID, start_date: datetime, end_date: datetime, db: Session,
+                              tz: Optional[str] = None):
+    """Generate financial report summary"""
+    completed = and_(
+        Payment.status == PaymentStatus.COMPLETED,
+        Payment.payment_date.between(start_date.date(), end_date.date())
+    )
+    pending = Payment.status == PaymentStatus.PENDING
+    overdue = and_(pending, Payment.due_date < local_today(tz))
+
+    totals = db.execute(
+        select(
+            func.coalesce(func.sum(Payment.amount).filter(completed), 0).label("total_revenue"),
+            func.count().filter(completed).label("total_payments"),
+            func.count().filter(pending).label("pending_payments"),
+            func.coalesce(func.sum(Payment.amount).filter(pending), 0).label("pending_amount"),
+            func.count().filter(overdue).label("overdue_payments"),
+            func.coalesce(func.sum(Payment.amount).filter(overdue), 0).label("overdue_amount")
+        ).where(Payment.organization_id == org_id)
+    ).one()
+
+    # Revenue by payment method (closed days from rollups)
+    revenue_by_method = {}
+    for _, method, amount, _ in get_revenue_rows(db, org_id, start_date.date(), end_date.date(), tz):
+        revenue_by_method[method] = revenue_by_method.get(method, 0) + amount
+
+    return {
+        "report_type": "financial",
+        "start_date": start_date.isoformat(),
+        "end_date": end_date.isoformat(),
+        "summary": {key: format_value(value) for key, value in totals._mapping.items()},
+        "revenue_by_method": [
+            {"method": format_value(method), "amount": float(amount)}
+            for method, amount in revenue_by_method.items()
+        ]
+    }
+
+
+def financial_details(org_id: UUID, start_date: datetime, end_date: datetime, tz: Optional[str] = None):
+    """Completed payments in the period, one row each"""
+    return select(
+        Payment.id.label("payment_id"),
+        Payment.member_id,
+        Payment.amount,
+        Payment.payment_method,
+        Payment.payment_date,
+        Payment.status
+    ).where(
+        Payment.organization_id == org_id,
+        Payment.status == PaymentStatus.COMPLETED,
+        Payment.payment_date.between(start_date.date(), end_date.date())
+    )
+
+
+def generate_attendance_report(org_id: UUID, start_date: datetime, end_date: datetime, db: Session,
+                               tz: Optional[str] = None):
+    """Generate attendance report summary"""
+    # Same org-local days as the daily breakdown, so the totals agree with it
+    window = days_window(start_date.date(), end_date.date(), tz)
+    total_checkins, unique_members = db.execute(
+        select(
+            func.count(),
+            func.count(func.distinct(CheckIn.member_id))
+        ).where(
+            CheckIn.organization_id == org_id,
+            window.clause(CheckIn.check_in_time)
+        )
+    ).one()
+
+    # Daily breakdown (closed days from rollups)
+    daily_checkins = {}
+    for day, _, count, _, _ in get_checkin_rows(db, org_id, start_date.date(), end_date.date(), tz):
+        daily_checkins[day] = daily_checkins.get(day, 0) + count
+
+    return {
+        "report_type": "attendance",
+        "start_date": start_date.isoformat(),
+        "end_date": end_date.isoformat(),
+        "summary": {
+            "total_checkins": total_checkins,
+            "unique_members": unique_members,
+            "average_daily_checkins": total_checkins / max((end_date - start_date).days, 1)
+        },
+        "daily_breakdown": [
+            {"date": date.isoformat(), "count": count}
+            for date, count in sorted(daily_checkins.items())
+        ]
+    }
+
+
+def attendance_details(org_id: UUID, start_date: datetime, end_date: datetime, tz: Optional[str] = None):
+    """Check-ins in the period, one row each"""
+    # Same org-local days as the summary, so the rows add up to its total
+    window = days_window(start_date.date(), end_date.date(), tz)
+    return select(
+        CheckIn.id.label("checkin_id"),
+        CheckIn.member_id,
+        CheckIn.check_in_time,
+        CheckIn.check_out_time,
+        CheckIn.method
+    ).where(
+        CheckIn.organization_id == org_id,
+        window.clause(CheckIn.check_in_time)
+    ).order_by(CheckIn.check_in_time)
+
+
+def generate_performance_report(org_id: UUID, start_date: datetime, end_date: datetime, db: Session):
+    """Generate performance report"""
+    # Class performance
+    class_bookings = db.query(
+        ClassSchedule.id,
+        func.count(ClassBooking.id).label('total_bookings'),
+        func.sum(case((ClassBooking.status == BookingStatus.ATTENDED, 1), else_=0)).label('attended'),
+        func.sum(case((ClassBooking.status == BookingStatus.NO_SHOW, 1), else_=0)).label('no_shows')
+    ).join(ClassBooking).filter(
+        ClassSchedule.organization_id == org_id,
+        ClassSchedule.scheduled_date.between(start_date.date(), end_date.date())
+    ).group_by(ClassSchedule.id).all()
+
+    # Membership retention
+    total_members_start = db.query(Membership).filter(
+        Membership.organization_id == org_id,
+        Membership.created_at < start_date
+    ).count()
+
+    cancelled_in_period = db.query(Membership).filter(
+        Membership.organization_id == org_id,
+        Membership.status == "cancelled",
+        Membership.cancellation_date.between(start_date.date(), end_date.date())
+    ).count()
+
+    retention_rate = ((total_members_start - cancelled_in_period) / total_members_start * 100) if total_members_start > 0 else 0
+
+    report_data = {
+        "report_type": "performance",
+        "start_date": start_date.isoformat(),
+        "end_date": end_date.isoformat(),
+        "summary": {
+            "class_performance": {
+                "total_classes": len(class_bookings),
+                "total_bookings": sum(cb.total_bookings for cb in class_bookings),
+                "total_attended": sum(cb.attended for cb in class_bookings),
+                "total_no_shows": sum(cb.no_shows for cb in class_bookings),
+                "attendance_rate": (sum(cb.attended for cb in class_bookings) / sum(cb.total_bookings for cb in class_bookings) * 100) if sum(cb.total_bookings for cb in class_bookings) > 0 else 0
+            },
+            "membership_retention": {
+                "members_at_start": total_members_start,
+                "cancelled_in_period": cancelled_in_period,
+                "retention_rate": retention_rate
+            }
+        }
+    }
+
+    return report_data
+
+
+# Detail rows per report type: (key in the JSON "details" object, statement builder)
+REPORT_DETAILS = {
+    "membership": ("active_memberships", membership_details),
+    "financial": ("payments", financial_details),
+    "attendance": ("checkins", attendance_details),
+}
+
+
+# ===== REPORT JOBS =====
+def report_params_hash(org_id: UUID, report_type: str, format: str, compress: bool, params: Dict[str, Any]) -> str:
+    """Stable hash of everything that determines a report artifact's content"""
+    normalized = json.dumps(
+        {"org": org_id, "type": report_type, "format": format, "compress": compress, **params},
+        sort_keys=True,
+        default=format_value
+    )
+    return hashlib.sha256(normalized.encode()).hexdigest()
+
+
+def find_reusable_report(db: Session, org_id: UUID, params_hash: str, generations: Optional[list]) -> Optional[Report]:
+    """
+    Find a queued, running or fresh completed job for the same parameters.
+
+    A job is reusable while it was queued less than REPORT_REUSE_SECONDS ago and none
+    of the report's data domains have been written to since (so a stuck job is not
+    reused forever either).
+    """
+    if generations is None:
+        return None
+
+    fresh_after = datetime.utcnow() - timedelta(seconds=settings.REPORT_REUSE_SECONDS)
+    candidates = db.query(Report).filter(
+        Report.organization_id == org_id,
+        Report.params_hash == params_hash,
+        Report.status.in_([ReportStatus.PENDING, ReportStatus.RUNNING, ReportStatus.COMPLETED]),
+        Report.created_at >= fresh_after
+    ).order_by(Report.created_at.desc()).limit(5).all()
+
+    for report in candidates:
+        if report.generations == generations:
+            return report
+    return None
+
+
+def create_report_job(db: Session, org_id: UUID, user_id: UUID, report_type: str, format: str, compress: bool,
+                      start_date: datetime, end_date: datetime, params: Dict[str, Any]) -> tuple:
+    """Return (report, created) for a job, reusing an equivalent one when possible"""
+    params_hash = report_params_hash(org_id, report_type, format, compress, params)
+    generations = analytics_cache.current_generations(org_id, REPORT_DOMAINS[report_type])
+
+    existing = find_reusable_report(db, org_id, params_hash, generations)
+    if existing:
+        return existing, False
+
+    report = Report(
+        organization_id=org_id,
+        requested_by=user_id,
+        report_type=report_type,
+        format=format,
+        compress=compress,
+        start_date=start_date,
+        end_date=end_date,
+        params_hash=params_hash,
+        generations=generations,
+        status=ReportStatus.PENDING
+    )
+    db.add(report)
+    db.commit()
+    db.refresh(report)
+    return report, True
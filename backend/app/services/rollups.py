@@ -0,0 +1,288 @@
+from datetime import date, datetime, timedelta
+from typing import List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy import select, insert, union_all, func, literal, extract, cast, BigInteger
+from sqlalchemy.orm import Session
+from app.core.time_windows import days_window, local_today
+from app.core.time_buckets import local_day, local_hour, MAX_UTC_OFFSET
+from app.models.checkin import CheckIn
+from app.models.organization import Organization
+from app.models.payment import Payment, PaymentStatus
+from app.models.membership import Membership, MembershipStatus
+from app.models.rollup import CheckInHourlyRollup, RevenueDailyRollup, MembershipDailyRollup
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def split_closed_days(
+    start_day: date,
+    end_day: date,
+    today: date
+) -> Tuple[Optional[Tuple[date, date]], bool]:
+    """
+    Split a day range into the part served by rollups and whether today is included.
+
+    Returns ((first_closed_day, last_closed_day) or None, include_today).
+    """
+    last_closed = min(end_day, today - timedelta(days=1))
+    closed = (start_day, last_closed) if start_day <= last_closed else None
+    include_today = start_day <= today <= end_day
+    return closed, include_today
+
+
+def latest_closed_day() -> date:
+    """
+    Latest day that has already ended somewhere in the world.
+
+    Refreshing up to this day guarantees every tenant's local yesterday is rolled up;
+    a day that is still open in some zones is rewritten again once it closes there.
+    """
+    return (datetime.utcnow() + MAX_UTC_OFFSET).date() - timedelta(days=1)
+
+
+# ===== LIVE AGGREGATES =====
+def checkin_aggregate(start_day: date, end_day: date, org_id: Optional[UUID] = None, tz: Optional[str] = None):
+    """
+    Aggregate raw check-ins into (organization_id, day, hour, counts, durations) rows.
+
+    Days and hours are bucketed in the organization's local time. When tz is not
+    given (multi-tenant refresh) each row is bucketed with its own organization's
+    timezone and the UTC scan range is widened to cover every zone.
+    """
+    if tz is None:
+        zone = Organization.timezone
+        window = days_window(start_day, end_day)
+        range_start, range_end = window.start - MAX_UTC_OFFSET, window.end + MAX_UTC_OFFSET
+    else:
+        zone = tz
+        window = days_window(start_day, end_day, tz)
+        range_start, range_end = window.start, window.end
+
+    day = local_day(CheckIn.check_in_time, zone)
+    hour = local_hour(CheckIn.check_in_time, zone)
+
+    stmt = select(
+        CheckIn.organization_id.label("organization_id"),
+        day.label("day"),
+        hour.label("hour"),
+        func.count().label("check_ins"),
+        func.count(CheckIn.check_out_time).label("completed_sessions"),
+        cast(func.coalesce(
+            func.sum(extract("epoch", CheckIn.check_out_time - CheckIn.check_in_time)), 0
+        ), BigInteger).label("session_seconds")
+    ).where(
+        CheckIn.check_in_time >= range_start,
+        CheckIn.check_in_time < range_end,
+        day >= start_day,
+        day <= end_day
+    ).group_by(CheckIn.organization_id, day, hour)
+
+    if tz is None:
+        stmt = stmt.join(Organization, Organization.id == CheckIn.organization_id)
+
+    if org_id:
+        stmt = stmt.where(CheckIn.organization_id == org_id)
+
+    return stmt
+
+
+def revenue_aggregate(start_day: date, end_day: date, org_id: Optional[UUID] = None):
+    """Aggregate completed payments into (organization_id, day, payment_method, totals) rows"""
+    stmt = select(
+        Payment.organization_id.label("organization_id"),
+        Payment.payment_date.label("day"),
+        Payment.payment_method.label("payment_method"),
+        func.sum(Payment.amount).label("total_amount"),
+        func.count().label("payment_count")
+    ).where(
+        Payment.status == PaymentStatus.COMPLETED,
+        Payment.payment_date >= start_day,
+        Payment.payment_date <= end_day
+    ).group_by(Payment.organization_id, Payment.payment_date, Payment.payment_method)
+
+    if org_id:
+        stmt = stmt.where(Payment.organization_id == org_id)
+
+    return stmt
+
+
+def membership_aggregate(start_day: date, end_day: date, org_id: Optional[UUID] = None):
+    """Aggregate membership transitions into (organization_id, day, counts) rows"""
+    def events(day_column, kind: str, *criteria):
+        stmt = select(
+            Membership.organization_id.label("organization_id"),
+            day_column.label("day"),
+            literal(kind).label("kind")
+        ).where(day_column >= start_day, day_column <= end_day, *criteria)
+        if org_id:
+            stmt = stmt.where(Membership.organization_id == org_id)
+        return stmt
+
+    transitions = union_all(
+        events(Membership.start_date, "started"),
+        events(Membership.freeze_start_date, "frozen"),
+        events(Membership.end_date, "expired", Membership.status == MembershipStatus.EXPIRED),
+        events(Membership.cancellation_date, "cancelled", Membership.status == MembershipStatus.CANCELLED)
+    ).subquery()
+
+    return select(
+        transitions.c.organization_id,
+        transitions.c.day,
+        func.count().filter(transitions.c.kind == "started").label("started"),
+        func.count().filter(transitions.c.kind == "frozen").label("frozen"),
+        func.count().filter(transitions.c.kind == "expired").label("expired"),
+        func.count().filter(transitions.c.kind == "cancelled").label("cancelled")
+    ).group_by(transitions.c.organization_id, transitions.c.day)
+
+
+# ===== REFRESH =====
+def _replace(db: Session, model, aggregate, columns: List[str], start_day: date, end_day: date,
+             org_id: Optional[UUID] = None) -> int:
+    """Delete and re-insert the rollup rows for a day range in one set-based pass"""
+    delete_query = db.query(model).filter(model.day >= start_day, model.day <= end_day)
+    if org_id:
+        delete_query = delete_query.filter(model.organization_id == org_id)
+    delete_query.delete(synchronize_session=False)
+
+    source = aggregate.subquery()
+    rows = select(
+        func.gen_random_uuid(),
+        func.now(),
+        func.now(),
+        *[source.c[name] for name in columns]
+    )
+    result = db.execute(
+        insert(model).from_select(["id", "created_at", "updated_at", *columns], rows)
+    )
+    return result.rowcount or 0
+
+
+def refresh_rollups(db: Session, start_day: date, end_day: date, org_id: Optional[UUID] = None) -> dict:
+    """Rebuild all rollup tables for the given closed days (optionally for one organization)"""
+    counts = {
+        "check_ins": _replace(
+            db, CheckInHourlyRollup, checkin_aggregate(start_day, end_day, org_id),
+            ["organization_id", "day", "hour", "check_ins", "completed_sessions", "session_seconds"],
+            start_day, end_day, org_id
+        ),
+        "revenue": _replace(
+            db, RevenueDailyRollup, revenue_aggregate(start_day, end_day, org_id),
+            ["organization_id", "day", "payment_method", "total_amount", "payment_count"],
+            start_day, end_day, org_id
+        ),
+        "memberships": _replace(
+            db, MembershipDailyRollup, membership_aggregate(start_day, end_day, org_id),
+            ["organization_id", "day", "started", "frozen", "expired", "cancelled"],
+            start_day, end_day, org_id
+        )
+    }
+    db.commit()
+
+    logger.info(f"Rollups refreshed for {start_day} - {end_day}: {counts}")
+    return counts
+
+
+# ===== READERS =====
+def get_checkin_rows(db: Session, org_id: UUID, start_day: date, end_day: date,
+                     tz: Optional[str] = None) -> list:
+    """
+    Hourly check-in rows for a range of org-local days.
+
+    Closed days come from checkin_hourly_rollups, today is aggregated from raw check-ins.
+    """
+    today = local_today(tz)
+    closed, include_today = split_closed_days(start_day, end_day, today)
+    rows = []
+
+    if closed:
+        rows.extend(db.execute(
+            select(
+                CheckInHourlyRollup.day,
+                CheckInHourlyRollup.hour,
+                CheckInHourlyRollup.check_ins,
+                CheckInHourlyRollup.completed_sessions,
+                CheckInHourlyRollup.session_seconds
+            ).where(
+                CheckInHourlyRollup.organization_id == org_id,
+                CheckInHourlyRollup.day >= closed[0],
+                CheckInHourlyRollup.day <= closed[1]
+            )
+        ).all())
+
+    if include_today:
+        live = checkin_aggregate(today, today, org_id, tz or "UTC").subquery()
+        rows.extend(db.execute(
+            select(live.c.day, live.c.hour, live.c.check_ins, live.c.completed_sessions, live.c.session_seconds)
+        ).all())
+
+    return rows
+
+
+def get_revenue_rows(db: Session, org_id: UUID, start_day: date, end_day: date,
+                     tz: Optional[str] = None) -> list:
+    """
+    Daily revenue rows per payment method for a range of org-local days.
+
+    Closed days come from revenue_daily_rollups, today is aggregated from raw payments.
+    """
+    today = local_today(tz)
+    closed, include_today = split_closed_days(start_day, end_day, today)
+    rows = []
+
+    if closed:
+        rows.extend(db.execute(
+            select(
+                RevenueDailyRollup.day,
+                RevenueDailyRollup.payment_method,
+                RevenueDailyRollup.total_amount,
+                RevenueDailyRollup.payment_count
+            ).where(
+                RevenueDailyRollup.organization_id == org_id,
+                RevenueDailyRollup.day >= closed[0],
+                RevenueDailyRollup.day <= closed[1]
+            )
+        ).all())
+
+    if include_today:
+        live = revenue_aggregate(today, today, org_id).subquery()
+        rows.extend(db.execute(
+            select(live.c.day, live.c.payment_method, live.c.total_amount, live.c.payment_count)
+        ).all())
+
+    return rows
+
+
+def get_membership_rows(db: Session, org_id: UUID, start_day: date, end_day: date,
+                        tz: Optional[str] = None) -> list:
+    """
+    Daily membership transition rows (day, started, frozen, expired, cancelled) for a range of days.
+
+    Closed days come from membership_daily_rollups, today is aggregated from raw memberships.
+    """
+    today = local_today(tz)
+    closed, include_today = split_closed_days(start_day, end_day, today)
+    rows = []
+
+    if closed:
+        rows.extend(db.execute(
+            select(
+                MembershipDailyRollup.day,
+                MembershipDailyRollup.started,
+                MembershipDailyRollup.frozen,
+                MembershipDailyRollup.expired,
+                MembershipDailyRollup.cancelled
+            ).where(
+                MembershipDailyRollup.organization_id == org_id,
+                MembershipDailyRollup.day >= closed[0],
+                MembershipDailyRollup.day <= closed[1]
+            )
+        ).all())
+
+    if include_today:
+        live = membership_aggregate(today, today, org_id).subquery()
+        rows.extend(db.execute(
+            select(live.c.day, live.c.started, live.c.frozen, live.c.expired, live.c.cancelled)
+        ).all())
+
+    return rows
@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta
+from typing import Optional
+from croniter import croniter
+import pytz
+from app.core.config import settings
+from app.core.time_windows import get_timezone, local_today, to_utc
+from app.db.session import db_router
+from app.models.report import Report, ScheduledReport
+
+
+def is_valid_cron(expression: str) -> bool:
+    """Whether expression is a standard 5-field cron expression"""
+    return len(expression.split()) == 5 and croniter.is_valid(expression)
+
+
+def next_run_at(expression: str, tz=None, after: Optional[datetime] = None) -> datetime:
+    """Naive UTC time of the next cron fire strictly after `after` (default now), evaluated in tz"""
+    zone = get_timezone(tz)
+    after = after or datetime.utcnow()
+    local_after = pytz.utc.localize(after).astimezone(zone)
+    local_next = croniter(expression, local_after).get_next(datetime)
+    return local_next.astimezone(pytz.utc).replace(tzinfo=None)
+
+
+def schedule_window(schedule: ScheduledReport, tz=None) -> tuple:
+    """(start, end) covering the last lookback_days whole local days before today"""
+    today = local_today(tz)
+    return to_utc(today - timedelta(days=schedule.lookback_days), tz), to_utc(today, tz)
+
+
+def dispatch_capacity() -> int:
+    """Scheduled reports to start per minute, scaled by the healthy read replicas they run on"""
+    replicas = sum(1 for replica in db_router.replicas if replica.healthy)
+    return settings.SCHEDULED_REPORTS_PER_MINUTE_PER_REPLICA * max(1, replicas)
+
+
+def delivery_email(schedule: ScheduledReport, report: Report) -> tuple:
+    """(subject, body) of the email announcing a scheduled report"""
+    link = f"{settings.PUBLIC_API_URL}{settings.API_V1_PREFIX}/reports/{report.id}/download"
+    subject = f"Scheduled report: {schedule.name}"
+    content = f"""
+Your scheduled {schedule.report_type} report "{schedule.name}" is ready.
+
+Period: {report.start_date.date()} to {report.end_date.date()}
+Rows: {report.row_count or 0}
+
+Download it here (available for {settings.REPORT_RETENTION_DAYS} days):
+{link}
+
+Best regards,
+{settings.APP_NAME}
+"""
+    return subject, content
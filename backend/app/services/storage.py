@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from typing import Optional, BinaryIO
+import shutil
 import boto3
 from botocore.exceptions import ClientError
 import cloudinary
@@ -35,6 +36,64 @@ class StorageService(ABC):
         """Get the public URL for a file"""
         pass
 
+    def open(self, file_url: str) -> BinaryIO:
+        """Open a stored file for streaming reads"""
+        raise NotImplementedError(f"{type(self).__name__} does not support reading files back")
+
+
+class LocalStorageService(StorageService):
+    """Local filesystem storage service implementation"""
+
+    URL_PREFIX = "local://"
+
+    def __init__(self, base_path: Optional[str] = None):
+        self.base_path = Path(base_path or settings.LOCAL_STORAGE_PATH).resolve()
+
+    def upload(
+        self,
+        file: BinaryIO,
+        file_name: str,
+        folder: Optional[str] = None,
+        content_type: Optional[str] = None
+    ) -> str:
+        """Copy a file into the storage directory"""
+        relative_path = f"{folder}/{file_name}" if folder else file_name
+        destination = self._resolve(relative_path)
+        destination.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(destination, "wb") as out:
+            shutil.copyfileobj(file, out)
+
+        url = self.get_url(relative_path)
+        logger.info(f"File stored locally: {url}")
+        return url
+
+    def delete(self, file_url: str) -> bool:
+        """Delete a file from the storage directory"""
+        try:
+            self._resolve(self._extract_path_from_url(file_url)).unlink()
+            return True
+        except FileNotFoundError:
+            return False
+
+    def get_url(self, file_path: str) -> str:
+        """Get the storage URL for a file"""
+        return f"{self.URL_PREFIX}{file_path}"
+
+    def open(self, file_url: str) -> BinaryIO:
+        """Open a stored file for reading"""
+        return open(self._resolve(self._extract_path_from_url(file_url)), "rb")
+
+    def _extract_path_from_url(self, url: str) -> str:
+        return url[len(self.URL_PREFIX):] if url.startswith(self.URL_PREFIX) else url
+
+    def _resolve(self, relative_path: str) -> Path:
+        """Resolve a path inside the storage directory, refusing anything that escapes it"""
+        path = (self.base_path / relative_path).resolve()
+        if self.base_path not in path.parents:
+            raise ValueError(f"Invalid storage path: {relative_path}")
+        return path
+
 
 class S3StorageService(StorageService):
     """AWS S3 storage service implementation"""
@@ -114,6 +173,17 @@ class S3StorageService(StorageService):
         base_url = f"https://{self.bucket_name}.s3.{settings.AWS_REGION}.amazonaws.com/"
         return url.replace(base_url, "")
 
+    def open(self, file_url: str) -> BinaryIO:
+        """Open an S3 object as a streaming body"""
+        key = self._extract_key_from_url(file_url)
+        try:
+            response = self.s3_client.get_object(Bucket=self.bucket_name, Key=key)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("NoSuchKey", "404"):
+                raise FileNotFoundError(key) from e
+            raise
+        return response["Body"]
+
     def generate_presigned_url(self, file_path: str, expiration: int = 3600) -> str:
         """Generate a presigned URL for temporary access"""
         try:
@@ -252,6 +322,8 @@ class StorageFactory:
             return S3StorageService()
         elif storage_type.lower() == "cloudinary":
             return CloudinaryStorageService()
+        elif storage_type.lower() == "local":
+            return LocalStorageService()
         else:
             raise ValueError(f"Unsupported storage type: {storage_type}")
 
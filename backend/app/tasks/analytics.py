@@ -7,6 +7,12 @@ from app.models.checkin import CheckIn
 from app.models.payment import Payment, PaymentStatus
 from app.models.membership import Membership, MembershipStatus
 from app.models.member import Member
+from app.models.risk import MemberRiskScore
+from app.services.rollups import refresh_rollups, latest_closed_day
+from app.services.cache import analytics_cache
+from app.services.churn import score_churn_risk
+from app.core.time_windows import days_window
+from app.core.config import settings
 import logging
 
 logger = logging.getLogger(__name__)
@@ -27,8 +33,7 @@ def update_weekly_analytics():
 
         # Total check-ins last week
         total_checkins = db.query(func.count(CheckIn.id)).filter(
-            func.date(CheckIn.check_in_time) >= week_ago,
-            func.date(CheckIn.check_in_time) < today
+            days_window(week_ago, today - timedelta(days=1)).clause(CheckIn.check_in_time)
         ).scalar() or 0
 
         metrics['total_checkins'] = total_checkins
@@ -68,6 +73,51 @@ def update_weekly_analytics():
         db.close()
 
 
+@shared_task(name="app.tasks.analytics.backfill_rollups")
+def backfill_rollups(days: int = 365, organization_id: str = None):
+    """Populate daily rollup tables for the last N closed days"""
+    db: Session = SessionLocal()
+
+    try:
+        last_closed_day = latest_closed_day()
+        first_day = last_closed_day - timedelta(days=days - 1)
+
+        # Rebuild in month-sized chunks so each transaction stays small
+        chunk_start = first_day
+        while chunk_start <= last_closed_day:
+            chunk_end = min(chunk_start + timedelta(days=settings.ROLLUP_BACKFILL_CHUNK_DAYS - 1), last_closed_day)
+            refresh_rollups(db, chunk_start, chunk_end, organization_id)
+            chunk_start = chunk_end + timedelta(days=1)
+
+        analytics_cache.invalidate_all()
+        logger.info(f"Rollup backfill completed for {first_day} - {last_closed_day}")
+
+    except Exception as e:
+        logger.error(f"Error in backfill_rollups task: {str(e)}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+@shared_task(name="app.tasks.analytics.update_daily_rollups")
+def update_daily_rollups():
+    """Refresh rollups for recently closed days to pick up late and backdated writes"""
+    db: Session = SessionLocal()
+
+    try:
+        last_closed_day = latest_closed_day()
+        first_day = last_closed_day - timedelta(days=settings.ROLLUP_REFRESH_DAYS - 1)
+
+        refresh_rollups(db, first_day, last_closed_day)
+        analytics_cache.invalidate_all()
+
+    except Exception as e:
+        logger.error(f"Error in update_daily_rollups task: {str(e)}")
+        db.rollback()
+    finally:
+        db.close()
+
+
 @shared_task(name="app.tasks.analytics.calculate_churn_rate")
 def calculate_churn_rate():
     """Calculate monthly churn rate"""
@@ -109,71 +159,21 @@ def calculate_churn_rate():
 
 @shared_task(name="app.tasks.analytics.predict_churn_risk")
 def predict_churn_risk():
-    """Predict which members are at risk of churning"""
+    """Score churn risk for every member with an active membership and keep the history"""
     db: Session = SessionLocal()
 
     try:
-        # Simple churn risk prediction based on:
-        # 1. Low attendance (< 2 visits per week)
-        # 2. No visit in last 14 days
-        # 3. Membership expiring soon
-
-        two_weeks_ago = date.today() - timedelta(days=14)
-        eight_weeks_ago = date.today() - timedelta(days=56)
-
-        # Get all active members
-        active_members = db.query(Member).join(Membership).filter(
-            Membership.status == MembershipStatus.ACTIVE
-        ).all()
-
-        at_risk_members = []
-
-        for member in active_members:
-            risk_score = 0
-
-            # Check attendance in last 8 weeks
-            checkins_count = db.query(func.count(CheckIn.id)).filter(
-                CheckIn.member_id == member.id,
-                func.date(CheckIn.check_in_time) >= eight_weeks_ago
-            ).scalar() or 0
-
-            avg_per_week = checkins_count / 8
-
-            if avg_per_week < 2:
-                risk_score += 30
-
-            # Check last visit
-            last_checkin = db.query(CheckIn).filter(
-                CheckIn.member_id == member.id
-            ).order_by(CheckIn.check_in_time.desc()).first()
-
-            if not last_checkin or last_checkin.check_in_time.date() < two_weeks_ago:
-                risk_score += 40
-
-            # Check membership expiry
-            active_membership = db.query(Membership).filter(
-                Membership.member_id == member.id,
-                Membership.status == MembershipStatus.ACTIVE
-            ).first()
-
-            if active_membership:
-                days_until_expiry = (active_membership.end_date - date.today()).days
-                if days_until_expiry <= 30 and not active_membership.auto_renew:
-                    risk_score += 30
-
-            if risk_score >= 50:
-                at_risk_members.append({
-                    'member_id': str(member.id),
-                    'risk_score': risk_score,
-                    'email': member.user.email
-                })
-
-        logger.info(f"Found {len(at_risk_members)} members at risk of churning")
+        scores = score_churn_risk(db)
+        at_risk = int(scores["at_risk"].sum()) if not scores.empty else 0
+        logger.info(f"Scored {len(scores)} members, {at_risk} at risk of churning")
 
-        # TODO: Store at-risk members in database for targeted campaigns
-        # TODO: Send notifications to gym staff about at-risk members
+        db.query(MemberRiskScore).filter(
+            MemberRiskScore.scored_on < date.today() - timedelta(days=settings.CHURN_SCORE_RETENTION_DAYS)
+        ).delete(synchronize_session=False)
+        db.commit()
 
     except Exception as e:
+        db.rollback()
         logger.error(f"Error in predict_churn_risk task: {str(e)}")
     finally:
         db.close()
@@ -0,0 +1,161 @@
+from celery import shared_task
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+from sqlalchemy import func, select, update
+from collections import defaultdict
+from app.db.session import SessionLocal
+from app.models.checkin import CheckIn
+from app.models.organization import Organization
+from app.services.occupancy import occupancy_counter, OccupancyCounter
+from app.services.eligibility import eligibility_cache
+from app.services.attendance import rebuild_attendance
+from app.services.cache import analytics_cache, CHECK_INS
+from app.core.time_buckets import local_day
+from app.core.time_windows import local_date, local_today
+from app.core.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name="app.tasks.checkins.reconcile_occupancy")
+def reconcile_occupancy():
+    """Rewrite today's occupancy counters from the check_ins table to correct drift"""
+    db: Session = SessionLocal()
+
+    try:
+        today = {org_id: local_today(tz) for org_id, tz in db.query(Organization.id, Organization.timezone).all()}
+
+        # Local midnight is never more than a day ago in UTC, whatever the timezone
+        day = local_day(CheckIn.check_in_time, Organization.timezone)
+        rows = db.query(
+            CheckIn.organization_id, CheckIn.location_id, day, func.count(CheckIn.id)
+        ).join(
+            Organization, Organization.id == CheckIn.organization_id
+        ).filter(
+            CheckIn.check_out_time == None,
+            CheckIn.check_in_time >= datetime.utcnow() - timedelta(days=1)
+        ).group_by(CheckIn.organization_id, CheckIn.location_id, day).all()
+
+        days = {(org_id, local): {} for org_id, local in today.items()}
+        for org_id, location_id, check_in_day, count in rows:
+            if today.get(org_id) == check_in_day:
+                days[(org_id, check_in_day)][OccupancyCounter.location_field(location_id)] = count
+
+        occupancy_counter.replace(days)
+        logger.info(f"Reconciled occupancy for {len(days)} organizations")
+
+    except Exception as e:
+        logger.error(f"Error in reconcile_occupancy task: {str(e)}")
+    finally:
+        db.close()
+
+
+def max_session_minutes(organization_settings) -> int:
+    """An organization's auto-checkout limit in minutes (0 disables auto-checkout)"""
+    value = (organization_settings or {}).get("max_session_minutes")
+    if value is None:
+        return settings.AUTO_CHECKOUT_MAX_SESSION_MINUTES
+    try:
+        return max(0, int(value))
+    except (TypeError, ValueError):
+        return settings.AUTO_CHECKOUT_MAX_SESSION_MINUTES
+
+
+@shared_task(name="app.tasks.checkins.auto_checkout_stale_check_ins")
+def auto_checkout_stale_check_ins():
+    """Close check-ins left open longer than the organization's max session length"""
+    db: Session = SessionLocal()
+
+    try:
+        timezones = {}
+        orgs_by_limit = defaultdict(list)
+        for org_id, tz, org_settings in db.query(Organization.id, Organization.timezone, Organization.settings).all():
+            timezones[org_id] = tz
+            limit = max_session_minutes(org_settings)
+            if limit:
+                orgs_by_limit[limit].append(org_id)
+
+        closed = 0
+        for limit, org_ids in orgs_by_limit.items():
+            session_length = timedelta(minutes=limit)
+
+            while True:
+                # Chunks keep each UPDATE's locks and WAL small; SKIP LOCKED steps
+                # around rows a concurrent checkout is touching
+                stale = select(CheckIn.id).where(
+                    CheckIn.organization_id.in_(org_ids),
+                    CheckIn.check_out_time == None,
+                    CheckIn.check_in_time < datetime.utcnow() - session_length
+                ).order_by(CheckIn.check_in_time).limit(
+                    settings.AUTO_CHECKOUT_BATCH_SIZE
+                ).with_for_update(skip_locked=True).scalar_subquery()
+
+                # Cap the visit at the session length instead of stretching it to now,
+                # so average session durations stay meaningful
+                rows = db.execute(
+                    update(CheckIn).where(CheckIn.id.in_(stale)).values(
+                        check_out_time=CheckIn.check_in_time + session_length,
+                        updated_at=datetime.utcnow()
+                    ).returning(
+                        CheckIn.organization_id, CheckIn.member_id, CheckIn.location_id, CheckIn.check_in_time
+                    ).execution_options(synchronize_session=False)
+                ).all()
+                db.commit()
+
+                if not rows:
+                    break
+                closed += len(rows)
+
+                by_org = defaultdict(list)
+                for org_id, member_id, location_id, check_in_time in rows:
+                    by_org[org_id].append((member_id, location_id, check_in_time))
+
+                for org_id, check_ins in by_org.items():
+                    tz = timezones.get(org_id)
+                    today = local_today(tz)
+                    # Only today's hash holds these check-ins; older days have already rolled off
+                    occupancy_counter.adjust(org_id, tz, [
+                        (check_in_time, location_id, -1)
+                        for _, location_id, check_in_time in check_ins
+                        if local_date(check_in_time, tz) == today
+                    ])
+                    analytics_cache.invalidate(org_id, CHECK_INS)
+
+                eligibility_cache.invalidate_members((org_id, member_id) for org_id, member_id, _, _ in rows)
+
+                if len(rows) < settings.AUTO_CHECKOUT_BATCH_SIZE:
+                    break
+
+        logger.info(f"Auto-checked out {closed} stale check-ins")
+
+    except Exception as e:
+        logger.error(f"Error in auto_checkout_stale_check_ins task: {str(e)}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+@shared_task(name="app.tasks.checkins.backfill_member_attendance")
+def backfill_member_attendance(organization_id: str = None):
+    """Recompute member attendance totals and streaks from full check-in history"""
+    db: Session = SessionLocal()
+
+    try:
+        query = db.query(Organization.id, Organization.timezone)
+        if organization_id:
+            query = query.filter(Organization.id == organization_id)
+        organizations = query.all()
+
+        # One organization per transaction keeps each rebuild's sort and locks bounded
+        for org_id, tz in organizations:
+            db.execute(rebuild_attendance(org_id, tz=tz))
+            db.commit()
+
+        logger.info(f"Member attendance rebuilt for {len(organizations)} organizations")
+
+    except Exception as e:
+        logger.error(f"Error in backfill_member_attendance task: {str(e)}")
+        db.rollback()
+    finally:
+        db.close()
@@ -0,0 +1,59 @@
+from celery import shared_task
+from datetime import timedelta
+from sqlalchemy.orm import Session
+from app.db.session import SessionLocal
+from app.db.partitions import (
+    PARTITIONED_TABLES, ensure_partitions, archivable_partitions, archive_partition,
+    scanned_partitions, expected_partitions
+)
+from app.services.rollups import checkin_aggregate, latest_closed_day
+from app.services.storage import StorageFactory
+from app.core.time_buckets import MAX_UTC_OFFSET
+from app.core.time_windows import days_window
+from app.core.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def check_rollup_pruning(db: Session) -> None:
+    """Raise if the hourly rollup refresh query scans partitions outside the range it covers"""
+    end_day = latest_closed_day()
+    start_day = end_day - timedelta(days=settings.ROLLUP_REFRESH_DAYS - 1)
+    window = days_window(start_day, end_day)
+
+    expected = expected_partitions("check_ins", window.start - MAX_UTC_OFFSET, window.end + MAX_UTC_OFFSET)
+    scanned = {
+        name for name in scanned_partitions(db, checkin_aggregate(start_day, end_day))
+        if name.startswith("check_ins_")
+    }
+    if not scanned <= expected:
+        raise RuntimeError(f"Rollup refresh scans unexpected check_ins partitions: {sorted(scanned - expected)}")
+
+
+@shared_task(name="app.tasks.maintenance.maintain_partitions")
+def maintain_partitions():
+    """Create upcoming monthly partitions and archive partitions past retention"""
+    db: Session = SessionLocal()
+
+    try:
+        for table in PARTITIONED_TABLES:
+            created = ensure_partitions(db, table, settings.PARTITION_MONTHS_AHEAD)
+            if created:
+                logger.info(f"Created partitions: {', '.join(created)}")
+
+            if settings.PARTITION_ARCHIVE_AFTER_MONTHS > 0:
+                storage = StorageFactory.get_storage(settings.PARTITION_ARCHIVE_STORAGE_BACKEND)
+                for name in archivable_partitions(db, table, settings.PARTITION_ARCHIVE_AFTER_MONTHS):
+                    archive_partition(db, table, name, storage, folder=f"archive/{table}")
+
+        check_rollup_pruning(db)
+        db.rollback()
+
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error in maintain_partitions task: {str(e)}")
+        # A missing partition or lost pruning degrades every check-in query; fail the task visibly
+        raise
+    finally:
+        db.close()
@@ -1,11 +1,15 @@
 from celery import shared_task
-from datetime import date, timedelta
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from datetime import date, datetime, timedelta
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import select, insert, update, func, literal
 from app.db.session import SessionLocal
+from app.models.member import Member
 from app.models.membership import Membership, MembershipStatus
 from app.models.checkin import CheckIn
+from app.models.notification import MemberReengagement, NotificationStatus
 from app.services.notification import NotificationManager
+from app.services.eligibility import eligibility_cache
+from app.core.config import settings
 import logging
 
 logger = logging.getLogger(__name__)
@@ -78,6 +82,9 @@ def check_expiring_memberships():
             logger.info(f"Membership {membership.id} marked as expired")
 
         db.commit()
+        eligibility_cache.invalidate_members(
+            (membership.organization_id, membership.member_id) for membership in expired_memberships
+        )
 
         logger.info("Expiring memberships check completed")
 
@@ -88,40 +95,65 @@ def check_expiring_memberships():
         db.close()
 
 
-@shared_task(name="app.tasks.memberships.check_inactive_members")
-def check_inactive_members():
-    """Check for inactive members and send re-engagement emails"""
-    db: Session = SessionLocal()
-    notification_manager = NotificationManager()
-
-    try:
-        # Define inactive as no check-in in the last 14 days
-        cutoff_date = date.today() - timedelta(days=14)
-
-        # Get active memberships
-        active_memberships = db.query(Membership).filter(
-            Membership.status == MembershipStatus.ACTIVE
-        ).all()
-
-        inactive_count = 0
-
-        for membership in active_memberships:
-            try:
-                # Check last check-in
-                last_checkin = db.query(CheckIn).filter(
-                    CheckIn.member_id == membership.member_id
-                ).order_by(CheckIn.check_in_time.desc()).first()
-
-                if not last_checkin or last_checkin.check_in_time.date() < cutoff_date:
-                    # Member is inactive
-                    member = membership.member
-
-                    # Send re-engagement email
-                    notification_manager.send_email(
-                        recipient=member.user.email,
-                        subject="We Miss You at FitFlow Pro!",
-                        content=f"""
-                        Hi {member.user.first_name},
+def claim_inactive_members(since: datetime, cooldown_start: datetime):
+    """
+    INSERT ... SELECT queuing a pending re-engagement for every inactive member.
+
+    A member is inactive if they hold an active membership and have no check-in since
+    `since`; members already queued since `cooldown_start` are skipped, so re-running
+    the task does not email anyone twice.
+    """
+    has_active_membership = select(Membership.id).where(
+        Membership.member_id == Member.id,
+        Membership.status == MembershipStatus.ACTIVE
+    ).exists()
+    checked_in_recently = select(CheckIn.id).where(
+        CheckIn.member_id == Member.id,
+        CheckIn.check_in_time >= since
+    ).exists()
+    recently_queued = select(MemberReengagement.id).where(
+        MemberReengagement.member_id == Member.id,
+        MemberReengagement.created_at >= cooldown_start
+    ).exists()
+
+    rows = select(
+        func.gen_random_uuid(),
+        func.now(),
+        func.now(),
+        Member.organization_id,
+        Member.id,
+        literal(NotificationStatus.PENDING, MemberReengagement.status.type)
+    ).where(has_active_membership, ~checked_in_recently, ~recently_queued)
+
+    return insert(MemberReengagement).from_select(
+        ["id", "created_at", "updated_at", "organization_id", "member_id", "status"], rows
+    ).returning(MemberReengagement.id)
+
+
+def reclaim_stale_reengagements(cooldown_start: datetime, stale_after: timedelta):
+    """
+    UPDATE ... RETURNING that takes over pending rows whose batch never finished.
+
+    Only rows untouched for `stale_after` qualify, so batches that are still queued
+    or running are left alone; bumping updated_at and skipping locked rows means two
+    concurrent runs never reclaim the same row.
+    """
+    stale = select(MemberReengagement.id).where(
+        MemberReengagement.status == NotificationStatus.PENDING,
+        MemberReengagement.created_at >= cooldown_start,
+        MemberReengagement.updated_at < func.now() - stale_after
+    ).with_for_update(skip_locked=True)
+
+    return update(MemberReengagement).where(
+        MemberReengagement.id.in_(stale.scalar_subquery())
+    ).values(updated_at=func.now()).returning(MemberReengagement.id)
+
+
+def reengagement_email(first_name: str) -> tuple:
+    """(subject, body) of the re-engagement email"""
+    subject = "We Miss You at FitFlow Pro!"
+    content = f"""
+                        Hi {first_name},
 
                         We noticed you haven't been to the gym in a while. We hope everything is okay!
 
@@ -136,19 +168,89 @@ def check_inactive_members():
                         See you soon!
                         The FitFlow Pro Team
                         """
-                    )
+    return subject, content
 
-                    inactive_count += 1
-                    logger.info(f"Re-engagement email sent to member {member.id}")
 
-            except Exception as e:
-                logger.error(f"Error processing member {membership.member_id}: {str(e)}")
-                continue
+@shared_task(name="app.tasks.memberships.check_inactive_members")
+def check_inactive_members():
+    """Queue re-engagement emails for inactive members and fan the sends out in batches"""
+    db: Session = SessionLocal()
+
+    try:
+        # Define inactive as no check-in in the last INACTIVE_MEMBER_DAYS days
+        today = datetime.combine(date.today(), datetime.min.time())
+        since = today - timedelta(days=settings.INACTIVE_MEMBER_DAYS)
+        cooldown_start = today - timedelta(days=settings.REENGAGEMENT_COOLDOWN_DAYS)
+
+        # Only rows this run inserted are dispatched, so a re-run never fans out a
+        # batch that is still queued or running
+        queued = db.execute(claim_inactive_members(since, cooldown_start)).scalars().all()
+        reclaimed = db.execute(reclaim_stale_reengagements(
+            cooldown_start, timedelta(minutes=settings.REENGAGEMENT_STALE_MINUTES)
+        )).scalars().all()
+        db.commit()
 
-        logger.info(f"Inactive members check completed. {inactive_count} re-engagement emails sent")
+        reengagement_ids = [str(reengagement_id) for reengagement_id in queued + reclaimed]
+        batches = 0
+        for start in range(0, len(reengagement_ids), settings.REENGAGEMENT_BATCH_SIZE):
+            send_reengagement_batch.delay(reengagement_ids[start:start + settings.REENGAGEMENT_BATCH_SIZE])
+            batches += 1
+
+        logger.info(
+            f"Inactive members check completed. {len(queued)} members queued, "
+            f"{len(reclaimed)} stale reclaimed, {batches} batches dispatched"
+        )
 
     except Exception as e:
         logger.error(f"Error in check_inactive_members task: {str(e)}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+@shared_task(name="app.tasks.memberships.send_reengagement_batch")
+def send_reengagement_batch(reengagement_ids: list):
+    """Send one batch of queued re-engagement emails and record the outcome"""
+    db: Session = SessionLocal()
+    notification_manager = NotificationManager()
+
+    try:
+        # Rows already sent (a retried or duplicated batch) are not sent again
+        reengagements = db.query(MemberReengagement).options(
+            joinedload(MemberReengagement.member).joinedload(Member.user)
+        ).filter(
+            MemberReengagement.id.in_(reengagement_ids),
+            MemberReengagement.status == NotificationStatus.PENDING
+        ).all()
+
+        sent, failed = [], []
+        for reengagement in reengagements:
+            try:
+                user = reengagement.member.user
+                subject, content = reengagement_email(user.first_name)
+                if notification_manager.send_email(recipient=user.email, subject=subject, content=content):
+                    sent.append(reengagement.id)
+                else:
+                    failed.append(reengagement.id)
+            except Exception as e:
+                logger.error(f"Error sending re-engagement email to member {reengagement.member_id}: {str(e)}")
+                failed.append(reengagement.id)
+
+        if sent:
+            db.execute(update(MemberReengagement).where(MemberReengagement.id.in_(sent)).values(
+                status=NotificationStatus.SENT, sent_at=datetime.utcnow()
+            ))
+        if failed:
+            db.execute(update(MemberReengagement).where(MemberReengagement.id.in_(failed)).values(
+                status=NotificationStatus.FAILED
+            ))
+        db.commit()
+
+        logger.info(f"Re-engagement batch done: {len(sent)} sent, {len(failed)} failed")
+
+    except Exception as e:
+        logger.error(f"Error in send_reengagement_batch task: {str(e)}")
+        db.rollback()
     finally:
         db.close()
 
@@ -182,6 +284,9 @@ def unfreeze_memberships():
                 continue
 
         db.commit()
+        eligibility_cache.invalidate_members(
+            (membership.organization_id, membership.member_id) for membership in frozen_memberships
+        )
 
         logger.info("Unfreeze memberships task completed")
 
@@ -1,10 +1,18 @@
 from celery import shared_task
+from collections import defaultdict
 from datetime import date, datetime, timedelta
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import select, update, tuple_, literal
+import calendar
 from app.db.session import SessionLocal
+from app.models.member import Member, birthday_month_day
+from app.models.organization import Organization
+from app.models.trainer import Trainer
 from app.models.payment import Payment, PaymentStatus
 from app.models.class_model import ClassSchedule, ClassBooking, ClassStatus, BookingStatus
 from app.services.notification import NotificationManager
+from app.core.time_windows import local_now, local_today
+from app.core.config import settings
 import logging
 
 logger = logging.getLogger(__name__)
@@ -67,80 +75,117 @@ def send_payment_reminders():
         db.close()
 
 
+def claim_class_reminders(org_ids: list, now: datetime, until: datetime):
+    """
+    UPDATE ... RETURNING that marks booked seats in classes starting in (now, until] as reminded.
+
+    now and until are wall-clock times in the organizations' timezone. The range is a
+    row comparison on (scheduled_date, start_time), so it probes
+    ix_class_schedules_date_start_time directly and also works across midnight.
+    Rows locked by a concurrent run are skipped instead of being claimed twice.
+    """
+    start = tuple_(ClassSchedule.scheduled_date, ClassSchedule.start_time)
+    due = select(ClassBooking.id).join(
+        ClassSchedule, ClassSchedule.id == ClassBooking.schedule_id
+    ).where(
+        ClassSchedule.organization_id.in_(org_ids),
+        ClassSchedule.status == ClassStatus.SCHEDULED,
+        start > tuple_(literal(now.date()), literal(now.time())),
+        start <= tuple_(literal(until.date()), literal(until.time())),
+        ClassBooking.status == BookingStatus.BOOKED,
+        ClassBooking.reminder_sent_at == None
+    ).with_for_update(of=ClassBooking, skip_locked=True)
+
+    return update(ClassBooking).where(ClassBooking.id.in_(due)).values(
+        reminder_sent_at=datetime.utcnow()
+    ).returning(ClassBooking.schedule_id, ClassBooking.id)
+
+
 @shared_task(name="app.tasks.notifications.send_class_reminders")
 def send_class_reminders():
-    """Send reminders for upcoming classes"""
+    """Claim bookings for classes starting within the reminder lead time and send them per class"""
     db: Session = SessionLocal()
-    notification_manager = NotificationManager()
 
     try:
-        # Get classes starting in the next hour
-        now = datetime.now()
-        one_hour_later = now + timedelta(hours=1)
-
-        upcoming_schedules = db.query(ClassSchedule).filter(
-            ClassSchedule.scheduled_date == date.today(),
-            ClassSchedule.status == ClassStatus.SCHEDULED
-        ).all()
-
-        logger.info(f"Found {len(upcoming_schedules)} scheduled classes today")
+        orgs_by_tz = defaultdict(list)
+        for org_id, tz in db.query(Organization.id, Organization.timezone).all():
+            orgs_by_tz[tz].append(org_id)
+
+        lead = timedelta(minutes=settings.CLASS_REMINDER_LEAD_MINUTES)
+        bookings_by_schedule = defaultdict(list)
+        for tz, org_ids in orgs_by_tz.items():
+            now = local_now(tz).replace(tzinfo=None, second=0, microsecond=0)
+            for schedule_id, booking_id in db.execute(claim_class_reminders(org_ids, now, now + lead)).all():
+                bookings_by_schedule[(schedule_id, tz)].append(str(booking_id))
+        db.commit()
+
+        size = settings.NOTIFICATION_BATCH_SIZE
+        for (_, tz), booking_ids in bookings_by_schedule.items():
+            for start in range(0, len(booking_ids), size):
+                send_class_reminder_batch.delay(booking_ids[start:start + size], tz)
+
+        logger.info(
+            f"Claimed {sum(map(len, bookings_by_schedule.values()))} class reminders "
+            f"for {len(bookings_by_schedule)} classes"
+        )
 
-        for schedule in upcoming_schedules:
-            try:
-                # Check if class starts in the next hour
-                class_datetime = datetime.combine(
-                    schedule.scheduled_date,
-                    schedule.start_time
-                )
+    except Exception as e:
+        logger.error(f"Error in send_class_reminders task: {str(e)}")
+        db.rollback()
+    finally:
+        db.close()
 
-                # Only send reminder if class is 30 minutes away
-                time_diff = class_datetime - now
-                if timedelta(minutes=25) <= time_diff <= timedelta(minutes=35):
-                    # Get all booked members
-                    bookings = db.query(ClassBooking).filter(
-                        ClassBooking.schedule_id == schedule.id,
-                        ClassBooking.status == BookingStatus.BOOKED
-                    ).all()
 
-                    for booking in bookings:
-                        try:
-                            member = booking.member
+@shared_task(name="app.tasks.notifications.send_class_reminder_batch")
+def send_class_reminder_batch(booking_ids: list, tz: str = None):
+    """Send reminders for claimed bookings of one class"""
+    db: Session = SessionLocal()
+    notification_manager = NotificationManager()
 
-                            # Send push notification if FCM token available
-                            # TODO: Get FCM token from member
-                            # notification_manager.send_push(...)
+    try:
+        bookings = db.query(ClassBooking).options(
+            joinedload(ClassBooking.member).joinedload(Member.user),
+            joinedload(ClassBooking.schedule).joinedload(ClassSchedule.class_obj),
+            joinedload(ClassBooking.schedule).joinedload(ClassSchedule.instructor).joinedload(Trainer.user)
+        ).filter(ClassBooking.id.in_(booking_ids)).all()
+
+        local = local_now(tz).replace(tzinfo=None)
+        for booking in bookings:
+            try:
+                member = booking.member
+                schedule = booking.schedule
+                class_start = datetime.combine(schedule.scheduled_date, schedule.start_time)
+                minutes = max(1, round((class_start - local).total_seconds() / 60))
 
-                            # Send email
-                            notification_manager.send_email(
-                                recipient=member.user.email,
-                                subject=f"Class Reminder: {schedule.class_obj.name}",
-                                content=f"""
-                                Hi {member.user.first_name},
+                # Send push notification if FCM token available
+                # TODO: Get FCM token from member
+                # notification_manager.send_push(...)
 
-                                Your class "{schedule.class_obj.name}" starts in 30 minutes!
+                # Send email
+                notification_manager.send_email(
+                    recipient=member.user.email,
+                    subject=f"Class Reminder: {schedule.class_obj.name}",
+                    content=f"""
+                    Hi {member.user.first_name},
 
-                                Time: {schedule.start_time}
-                                Location: {schedule.class_obj.room}
-                                Instructor: {schedule.instructor.user.first_name if schedule.instructor else 'TBA'}
+                    Your class "{schedule.class_obj.name}" starts in {minutes} minutes!
 
-                                See you there!
-                                """
-                            )
+                    Time: {schedule.start_time}
+                    Location: {schedule.class_obj.room}
+                    Instructor: {schedule.instructor.user.first_name if schedule.instructor else 'TBA'}
 
-                            logger.info(f"Class reminder sent to member {member.id}")
+                    See you there!
+                    """
+                )
 
-                        except Exception as e:
-                            logger.error(f"Error sending class reminder to member {booking.member_id}: {str(e)}")
-                            continue
+                logger.info(f"Class reminder sent to member {member.id}")
 
             except Exception as e:
-                logger.error(f"Error processing class schedule {schedule.id}: {str(e)}")
+                logger.error(f"Error sending class reminder to member {booking.member_id}: {str(e)}")
                 continue
 
-        logger.info("Class reminders sent successfully")
-
     except Exception as e:
-        logger.error(f"Error in send_class_reminders task: {str(e)}")
+        logger.error(f"Error in send_class_reminder_batch task: {str(e)}")
     finally:
         db.close()
 
@@ -152,8 +197,6 @@ def send_welcome_email(member_id: str):
     notification_manager = NotificationManager()
 
     try:
-        from app.models.member import Member
-
         member = db.query(Member).filter(Member.id == member_id).first()
 
         if not member:
@@ -193,30 +236,59 @@ def send_welcome_email(member_id: str):
         db.close()
 
 
+def birthday_days(day: date) -> list:
+    """Days of the month whose birthdays fall on day; Feb 29 birthdays fall on Feb 28 in other years"""
+    if day.month == 2 and day.day == 28 and not calendar.isleap(day.year):
+        return [28, 29]
+    return [day.day]
+
+
 @shared_task(name="app.tasks.notifications.send_birthday_wishes")
 def send_birthday_wishes():
-    """Send birthday wishes to members"""
+    """Find members whose birthday is today in their organization's timezone and send wishes in batches"""
     db: Session = SessionLocal()
-    notification_manager = NotificationManager()
 
     try:
-        from app.models.member import Member
+        # Organizations grouped by their local date (at most a couple of distinct days at once)
+        orgs_by_day = defaultdict(list)
+        for org_id, tz in db.query(Organization.id, Organization.timezone).all():
+            orgs_by_day[local_today(tz)].append(org_id)
+
+        month, day_of_month = birthday_month_day()
+        found = 0
+        for today, org_ids in orgs_by_day.items():
+            # Probes ix_members_birthday rather than scanning every member
+            member_ids = db.execute(
+                select(Member.id).where(
+                    Member.date_of_birth != None,
+                    month == today.month,
+                    day_of_month.in_(birthday_days(today)),
+                    Member.organization_id.in_(org_ids)
+                ).execution_options(yield_per=settings.NOTIFICATION_BATCH_SIZE)
+            ).scalars()
+
+            for chunk in member_ids.partitions():
+                send_birthday_batch.delay([str(member_id) for member_id in chunk])
+                found += len(chunk)
+
+        logger.info(f"Found {found} members with birthdays today")
 
-        today = date.today()
+    except Exception as e:
+        logger.error(f"Error in send_birthday_wishes task: {str(e)}")
+    finally:
+        db.close()
 
-        # Get members with birthday today
-        members = db.query(Member).filter(
-            Member.date_of_birth != None
-        ).all()
 
-        birthday_members = [
-            m for m in members
-            if m.date_of_birth.month == today.month and m.date_of_birth.day == today.day
-        ]
+@shared_task(name="app.tasks.notifications.send_birthday_batch")
+def send_birthday_batch(member_ids: list):
+    """Send birthday emails to one batch of members"""
+    db: Session = SessionLocal()
+    notification_manager = NotificationManager()
 
-        logger.info(f"Found {len(birthday_members)} members with birthdays today")
+    try:
+        members = db.query(Member).options(joinedload(Member.user)).filter(Member.id.in_(member_ids)).all()
 
-        for member in birthday_members:
+        for member in members:
             try:
                 notification_manager.send_email(
                     recipient=member.user.email,
@@ -241,9 +313,9 @@ def send_birthday_wishes():
                 logger.error(f"Error sending birthday email to member {member.id}: {str(e)}")
                 continue
 
-        logger.info("Birthday wishes sent successfully")
+        logger.info(f"Birthday wishes sent to {len(members)} members")
 
     except Exception as e:
-        logger.error(f"Error in send_birthday_wishes task: {str(e)}")
+        logger.error(f"Error in send_birthday_batch task: {str(e)}")
     finally:
         db.close()
@@ -1,11 +1,17 @@
-from celery import shared_task
-from datetime import date, timedelta
+from celery import chord, shared_task
+from datetime import date
+from uuid import UUID
 from sqlalchemy.orm import Session
+from sqlalchemy import select, update
 from app.db.session import SessionLocal
+from app.models.member import Member
 from app.models.payment import Payment, PaymentStatus
 from app.models.membership import Membership, MembershipStatus
-from app.services.payment_gateway import PaymentGatewayFactory
+from app.models.user import User
 from app.services.notification import NotificationManager
+from app.services.eligibility import eligibility_cache
+from app.services.renewals import due_renewals, pending_renewal, renewal_task_args, charge_renewals
+from app.core.config import settings
 import logging
 
 logger = logging.getLogger(__name__)
@@ -13,71 +19,24 @@ logger = logging.getLogger(__name__)
 
 @shared_task(name="app.tasks.payments.process_recurring_payments")
 def process_recurring_payments():
-    """Process recurring payments for active memberships"""
+    """Charge today's membership renewals in parallel chord batches"""
     db: Session = SessionLocal()
-    notification_manager = NotificationManager()
 
     try:
-        # Get all memberships due for renewal today
+        # Due memberships and their pending payments come back from one query
         today = date.today()
-        due_memberships = db.query(Membership).filter(
-            Membership.status == MembershipStatus.ACTIVE,
-            Membership.auto_renew == True,
-            Membership.end_date == today
-        ).all()
-
-        logger.info(f"Found {len(due_memberships)} memberships due for renewal")
-
-        for membership in due_memberships:
-            try:
-                # Get member and plan details
-                member = membership.member
-                plan = membership.plan
-
-                # Check for pending payment
-                pending_payment = db.query(Payment).filter(
-                    Payment.membership_id == membership.id,
-                    Payment.status == PaymentStatus.PENDING,
-                    Payment.due_date == today
-                ).first()
-
-                if pending_payment:
-                    # Attempt to charge payment
-                    payment_gateway = PaymentGatewayFactory.get_gateway("stripe")
-
-                    # TODO: Get customer's saved payment method
-                    # For now, create a payment record
-                    pending_payment.retry_count += 1
-
-                    # If max retries reached, send notification
-                    if pending_payment.retry_count >= 3:
-                        pending_payment.status = PaymentStatus.FAILED
-
-                        # Send failure notification
-                        notification_manager.send_email(
-                            recipient=member.user.email,
-                            subject="Payment Failed - Action Required",
-                            content=f"Your membership renewal payment has failed. Please update your payment method."
-                        )
-
-                        # Freeze membership
-                        membership.status = MembershipStatus.FROZEN
-                        logger.warning(f"Membership {membership.id} frozen due to failed payment")
-                    else:
-                        # Schedule retry
-                        retry_payment.apply_async(
-                            args=[str(pending_payment.id)],
-                            countdown=86400  # Retry after 24 hours
-                        )
-
-                    db.commit()
-
-            except Exception as e:
-                logger.error(f"Error processing payment for membership {membership.id}: {str(e)}")
-                db.rollback()
-                continue
-
-        logger.info("Recurring payments processing completed")
+        rows = db.execute(
+            due_renewals(today).execution_options(yield_per=settings.RECURRING_PAYMENT_BATCH_SIZE)
+        )
+        batches = [
+            charge_renewal_batch.s([renewal_task_args(row) for row in chunk])
+            for chunk in rows.partitions()
+        ]
+
+        if batches:
+            chord(batches)(finish_recurring_payments.s(today.isoformat()))
+
+        logger.info(f"Recurring payments dispatched in {len(batches)} batches")
 
     except Exception as e:
         logger.error(f"Error in process_recurring_payments task: {str(e)}")
@@ -85,39 +44,144 @@ def process_recurring_payments():
         db.close()
 
 
-@shared_task(name="app.tasks.payments.retry_payment")
-def retry_payment(payment_id: str):
-    """Retry a failed payment"""
+@shared_task(name="app.tasks.payments.charge_renewal_batch")
+def charge_renewal_batch(renewals: list):
+    """Charge one batch of renewals and write the outcomes back with bulk updates"""
     db: Session = SessionLocal()
+    notification_manager = NotificationManager()
+    counts = {"completed": 0, "retrying": 0, "failed": 0}
 
     try:
-        payment = db.query(Payment).filter(Payment.id == payment_id).first()
+        # Payments a redelivered batch already settled are not charged again
+        pending = {
+            str(payment_id) for payment_id in db.execute(
+                select(Payment.id).where(
+                    Payment.id.in_([renewal["payment_id"] for renewal in renewals]),
+                    Payment.status == PaymentStatus.PENDING
+                )
+            ).scalars()
+        }
+        db.rollback()
 
-        if not payment:
-            logger.error(f"Payment {payment_id} not found")
-            return
+        results = charge_renewals(
+            [renewal for renewal in renewals if renewal["payment_id"] in pending],
+            settings.RECURRING_PAYMENT_CONCURRENCY
+        )
+        completed = [result for result in results if result["succeeded"]]
+        failed = [
+            result for result in results
+            if not result["succeeded"] and result["attempt"] >= settings.RECURRING_PAYMENT_MAX_RETRIES
+        ]
+        retrying = [
+            result for result in results
+            if not result["succeeded"] and result["attempt"] < settings.RECURRING_PAYMENT_MAX_RETRIES
+        ]
 
-        if payment.status != PaymentStatus.PENDING:
-            logger.info(f"Payment {payment_id} is not pending, skipping retry")
-            return
+        today = date.today()
+        updates = [
+            {
+                "id": UUID(result["payment_id"]),
+                "status": PaymentStatus.COMPLETED,
+                "transaction_id": result["transaction_id"],
+                "payment_date": today,
+                "retry_count": result["attempt"]
+            }
+            for result in completed
+        ] + [
+            {"id": UUID(result["payment_id"]), "status": PaymentStatus.FAILED, "retry_count": result["attempt"]}
+            for result in failed
+        ] + [
+            {"id": UUID(result["payment_id"]), "retry_count": result["attempt"]}
+            for result in retrying
+        ]
+        if updates:
+            db.execute(update(Payment), updates)
+
+        if failed:
+            db.execute(
+                update(Membership).where(
+                    Membership.id.in_([UUID(result["membership_id"]) for result in failed])
+                ).values(status=MembershipStatus.FROZEN)
+            )
+        db.commit()
+
+        eligibility_cache.invalidate_members(
+            (result["organization_id"], result["member_id"]) for result in results
+        )
+
+        for result in retrying:
+            logger.info(f"Renewal payment {result['payment_id']} failed: {result['error']}")
+            retry_payment.apply_async(
+                args=[result["payment_id"]],
+                countdown=86400  # Retry after 24 hours
+            )
+
+        if failed:
+            emails = dict(db.execute(
+                select(Member.id, User.email).join(User, User.id == Member.user_id).where(
+                    Member.id.in_([UUID(result["member_id"]) for result in failed])
+                )
+            ).all())
+            for result in failed:
+                logger.warning(f"Membership {result['membership_id']} frozen due to failed payment")
+                email = emails.get(UUID(result["member_id"]))
+                if not email:
+                    continue
+                try:
+                    notification_manager.send_email(
+                        recipient=email,
+                        subject="Payment Failed - Action Required",
+                        content=f"Your membership renewal payment has failed. Please update your payment method."
+                    )
+                except Exception as e:
+                    logger.error(f"Error sending payment failure email for membership {result['membership_id']}: {str(e)}")
+
+        counts = {"completed": len(completed), "retrying": len(retrying), "failed": len(failed)}
+
+    except Exception as e:
+        logger.error(f"Error in charge_renewal_batch task: {str(e)}")
+        db.rollback()
+    finally:
+        db.close()
 
-        # Attempt payment
-        payment_gateway = PaymentGatewayFactory.get_gateway(payment.payment_gateway or "stripe")
+    return counts
 
-        # TODO: Implement actual payment retry logic
-        # This is a placeholder
 
-        payment.retry_count += 1
-        db.commit()
+@shared_task(name="app.tasks.payments.finish_recurring_payments")
+def finish_recurring_payments(batch_counts: list, day: str):
+    """Log the totals once every renewal batch has finished"""
+    totals = {
+        outcome: sum(counts.get(outcome, 0) for counts in batch_counts)
+        for outcome in ("completed", "retrying", "failed")
+    }
+    logger.info(
+        f"Recurring payments for {day} completed. {totals['completed']} charged, "
+        f"{totals['retrying']} scheduled for retry, {totals['failed']} failed"
+    )
+    return totals
 
-        logger.info(f"Payment {payment_id} retry completed")
 
+@shared_task(name="app.tasks.payments.retry_payment")
+def retry_payment(payment_id: str):
+    """Retry a failed renewal payment through the same charge and write-back as the batches"""
+    db: Session = SessionLocal()
+
+    try:
+        row = db.execute(pending_renewal(UUID(payment_id))).first()
+        if not row:
+            logger.info(f"Payment {payment_id} is no longer a pending renewal, skipping retry")
+            return
+        renewal = renewal_task_args(row)
     except Exception as e:
         logger.error(f"Error retrying payment {payment_id}: {str(e)}")
-        db.rollback()
+        return
     finally:
         db.close()
 
+    # A further failure is rescheduled, or freezes the membership once retries run out
+    counts = charge_renewal_batch([renewal])
+    logger.info(f"Payment {payment_id} retry (attempt {renewal['attempt']}): {counts}")
+
 
 @shared_task(name="app.tasks.payments.generate_invoice_pdf")
 def generate_invoice_pdf(invoice_id: str):
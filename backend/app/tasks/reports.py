@@ -0,0 +1,245 @@
+from celery import shared_task
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+from sqlalchemy import select, func
+import tempfile
+from app.db.session import SessionLocal, db_router
+from app.models.organization import Organization
+from app.models.report import Report, ReportStatus, ScheduledReport
+from app.services.reports import build_report_header, build_report_details, create_report_job
+from app.services.scheduled_reports import dispatch_capacity, next_run_at, schedule_window, delivery_email
+from app.services.notification import NotificationManager
+from app.services.report_export import EXPORT_FORMATS, report_chunks, gzip_chunks, stream_rows
+from app.services.storage import StorageFactory
+from app.core.config import settings
+from app.core.time_windows import local_today
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _write_artifact(report: Report, status_db: Session, out) -> int:
+    """Write the report to a file object, updating progress as rows stream; returns the row count"""
+    data_db = db_router.read_session()
+    try:
+        tz = report.organization.timezone
+        header = build_report_header(
+            report.report_type, report.organization_id, report.start_date, report.end_date, data_db, tz
+        )
+        details = build_report_details(
+            report.report_type, report.organization_id, report.start_date, report.end_date, tz
+        )
+
+        written = {"rows": 0}
+        rows = None
+        if details is not None:
+            statement = details[1]
+            total = data_db.execute(
+                select(func.count()).select_from(statement.order_by(None).subquery())
+            ).scalar() or 0
+
+            def counted(result):
+                for row in result:
+                    written["rows"] += 1
+                    if total and written["rows"] % settings.REPORT_EXPORT_BATCH_SIZE == 0:
+                        # Progress goes through its own session; committing on the data
+                        # session would close the server-side cursor
+                        report.progress = min(99, written["rows"] * 100 // total)
+                        status_db.commit()
+                    yield row
+
+            rows = counted(stream_rows(data_db, statement))
+
+        chunks = report_chunks(report.format, header, rows, details[1].selected_columns if details else None)
+        if report.compress:
+            chunks = gzip_chunks(chunks)
+        for chunk in chunks:
+            out.write(chunk)
+
+        return written["rows"]
+    finally:
+        data_db.close()
+
+
+@shared_task(name="app.tasks.reports.generate_report_artifact")
+def generate_report_artifact(report_id: str):
+    """Generate a queued report and store the artifact"""
+    db: Session = SessionLocal()
+
+    try:
+        report = db.query(Report).filter(Report.id == report_id).first()
+        if not report or report.status != ReportStatus.PENDING:
+            return
+
+        report.status = ReportStatus.RUNNING
+        report.started_at = datetime.utcnow()
+        report.progress = 0
+        db.commit()
+
+        media_type, extension = EXPORT_FORMATS[report.format]
+        file_name = f"{report.report_type}_report_{report.id}.{extension}"
+        if report.compress:
+            media_type = "application/gzip"
+            file_name += ".gz"
+
+        with tempfile.TemporaryFile() as out:
+            row_count = _write_artifact(report, db, out)
+            file_size = out.tell()
+            out.seek(0)
+
+            storage = StorageFactory.get_storage(settings.REPORT_STORAGE_BACKEND)
+            file_url = storage.upload(
+                out, file_name, folder=f"reports/{report.organization_id}", content_type=media_type
+            )
+
+        report.file_url = file_url
+        report.file_name = file_name
+        report.file_size = file_size
+        report.content_type = media_type
+        report.row_count = row_count
+        report.progress = 100
+        report.status = ReportStatus.COMPLETED
+        report.completed_at = datetime.utcnow()
+        report.expires_at = report.completed_at + timedelta(days=settings.REPORT_RETENTION_DAYS)
+        db.commit()
+
+        logger.info(f"Report {report_id} generated: {row_count} rows, {file_size} bytes")
+
+        deliver_scheduled_reports.delay(report_id)
+
+    except Exception as e:
+        logger.error(f"Error in generate_report_artifact task for {report_id}: {str(e)}")
+        db.rollback()
+        report = db.query(Report).filter(Report.id == report_id).first()
+        if report:
+            report.status = ReportStatus.FAILED
+            report.error = str(e)[:1000]
+            db.commit()
+    finally:
+        db.close()
+
+
+@shared_task(name="app.tasks.reports.purge_expired_reports")
+def purge_expired_reports():
+    """Delete report artifacts past their retention period"""
+    db: Session = SessionLocal()
+
+    try:
+        expired = db.query(Report).filter(
+            Report.expires_at != None,
+            Report.expires_at < datetime.utcnow()
+        ).all()
+
+        storage = StorageFactory.get_storage(settings.REPORT_STORAGE_BACKEND)
+        for report in expired:
+            if report.file_url:
+                storage.delete(report.file_url)
+            db.delete(report)
+
+        db.commit()
+        logger.info(f"Purged {len(expired)} expired reports")
+
+    except Exception as e:
+        logger.error(f"Error in purge_expired_reports task: {str(e)}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+@shared_task(name="app.tasks.reports.dispatch_scheduled_reports")
+def dispatch_scheduled_reports():
+    """Start due scheduled reports, staggered across the minute and capped per replica"""
+    db: Session = SessionLocal()
+
+    try:
+        capacity = dispatch_capacity()
+        now = datetime.utcnow()
+
+        # Claim due schedules by advancing next_run_at under SKIP LOCKED so overlapping
+        # dispatchers never start the same run; anything over capacity waits a minute
+        due = db.query(ScheduledReport).filter(
+            ScheduledReport.is_active == True,
+            ScheduledReport.next_run_at <= now
+        ).order_by(ScheduledReport.next_run_at).limit(capacity).with_for_update(skip_locked=True).all()
+
+        if not due:
+            return
+
+        timezones = dict(db.query(Organization.id, Organization.timezone).filter(
+            Organization.id.in_({schedule.organization_id for schedule in due})
+        ).all())
+
+        for schedule in due:
+            schedule.next_run_at = next_run_at(schedule.cron, timezones.get(schedule.organization_id), now)
+            schedule.last_run_at = now
+        db.commit()
+
+        logger.info(f"Dispatching {len(due)} scheduled reports (capacity {capacity}/min)")
+
+        for index, schedule in enumerate(due):
+            try:
+                tz = timezones.get(schedule.organization_id)
+                start_date, end_date = schedule_window(schedule, tz)
+                params = {"day": local_today(tz), "start_date": start_date, "end_date": end_date}
+
+                report, created = create_report_job(
+                    db, schedule.organization_id, schedule.created_by, schedule.report_type,
+                    schedule.format, schedule.compress, start_date, end_date, params
+                )
+                schedule.last_report_id = report.id
+                db.commit()
+
+                if created:
+                    generate_report_artifact.apply_async(
+                        (str(report.id),), countdown=index * 60 // capacity
+                    )
+                elif report.status == ReportStatus.COMPLETED:
+                    deliver_scheduled_reports.delay(str(report.id))
+
+            except Exception as e:
+                logger.error(f"Error dispatching scheduled report {schedule.id}: {str(e)}")
+                db.rollback()
+                continue
+
+    except Exception as e:
+        logger.error(f"Error in dispatch_scheduled_reports task: {str(e)}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+@shared_task(name="app.tasks.reports.deliver_scheduled_reports")
+def deliver_scheduled_reports(report_id: str):
+    """Email a completed report to the recipients of every schedule waiting on it"""
+    db: Session = SessionLocal()
+    notification_manager = NotificationManager()
+
+    try:
+        report = db.query(Report).filter(Report.id == report_id).first()
+        if not report or report.status != ReportStatus.COMPLETED:
+            return
+
+        schedules = db.query(ScheduledReport).filter(
+            ScheduledReport.last_report_id == report.id,
+            ScheduledReport.last_delivered_report_id.is_distinct_from(report.id)
+        ).all()
+
+        for schedule in schedules:
+            subject, content = delivery_email(schedule, report)
+            for recipient in schedule.recipients:
+                notification_manager.send_email(
+                    recipient=recipient,
+                    subject=subject,
+                    content=content
+                )
+            schedule.last_delivered_report_id = report.id
+            db.commit()
+
+        if schedules:
+            logger.info(f"Delivered report {report_id} for {len(schedules)} schedules")
+
+    except Exception as e:
+        logger.error(f"Error in deliver_scheduled_reports task for {report_id}: {str(e)}")
+        db.rollback()
+    finally:
+        db.close()
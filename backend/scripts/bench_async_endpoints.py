@@ -0,0 +1,185 @@
+"""
+Benchmark the async dashboard path against its sync equivalent under concurrent load.
+
+Seeds one throwaway organization with N members, active memberships and check-ins
+today, then drives the app in-process with --concurrency clients: the async
+/analytics/dashboard endpoint, and a sync twin registered only for the benchmark that
+computes the same metrics through get_read_db on Starlette's threadpool. The analytics
+cache is disabled so every request reaches the database. Run from backend/ against a
+development database migrated to head:
+
+    python -m scripts.bench_async_endpoints --requests 2000 --concurrency 50
+
+Reports requests/sec and p50/p99 latency per path. The seeded rows are deleted
+afterwards unless --keep is given.
+"""
+from datetime import datetime
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from uuid import uuid4
+import httpx
+from fastapi import Depends
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.deps import get_current_user, get_read_db
+from app.core.security import create_access_token
+from app.db.partitions import ensure_partitions
+from app.db.session import SessionLocal
+from app.main import app
+from app.models.user import User
+from app.services.dashboard_metrics import dashboard_metrics
+
+SEED_SQL = [
+    """
+    INSERT INTO organizations (id, created_at, updated_at, name, slug, contact_email, timezone, settings)
+    VALUES (:org_id, now(), now(), 'Async endpoints benchmark', :slug, 'bench@example.com', 'UTC', '{}')
+    """,
+    """
+    INSERT INTO users (id, created_at, updated_at, organization_id, email, password_hash, first_name, last_name,
+                       role, is_active, is_verified)
+    VALUES (:owner_id, now(), now(), :org_id, :slug || '-owner@example.com', 'x', 'Bench', 'Owner',
+            'GYM_OWNER', true, true)
+    """,
+    """
+    INSERT INTO membership_plans (id, created_at, updated_at, organization_id, name, price, duration_days,
+                                  duration_type, is_active)
+    VALUES (:plan_id, now(), now(), :org_id, 'Benchmark', 50, 30, 'MONTHLY', true)
+    """,
+    """
+    INSERT INTO users (id, created_at, updated_at, organization_id, email, password_hash, first_name, last_name,
+                       role, is_active, is_verified)
+    SELECT gen_random_uuid(), now(), now(), :org_id, :slug || '-' || n || '@example.com', 'x',
+           'Member', n::text, 'MEMBER', true, true
+    FROM generate_series(1, :members) AS n
+    """,
+    """
+    INSERT INTO members (id, created_at, updated_at, organization_id, user_id, member_id, status, joined_at)
+    SELECT gen_random_uuid(), now(), now(), :org_id, users.id, 'B-' || users.last_name, 'ACTIVE', current_date
+    FROM users WHERE users.organization_id = :org_id AND users.role = 'MEMBER'
+    """,
+    """
+    INSERT INTO memberships (id, created_at, updated_at, organization_id, member_id, plan_id, start_date,
+                             end_date, auto_renew, status)
+    SELECT gen_random_uuid(), now(), now(), :org_id, members.id, :plan_id, current_date - 10,
+           current_date + 20, true, 'ACTIVE'
+    FROM members WHERE members.organization_id = :org_id
+    """,
+    """
+    INSERT INTO check_ins (id, created_at, updated_at, organization_id, member_id, check_in_time, method)
+    SELECT gen_random_uuid(), now(), now(), :org_id, members.id,
+           date_trunc('day', now() at time zone 'utc') + random() * (now() at time zone 'utc'
+               - date_trunc('day', now() at time zone 'utc')), 'QR'
+    FROM members WHERE members.organization_id = :org_id
+    """,
+]
+
+CLEANUP_SQL = [
+    "DELETE FROM check_ins WHERE organization_id = :org_id",
+    "DELETE FROM memberships WHERE organization_id = :org_id",
+    "DELETE FROM members WHERE organization_id = :org_id",
+    "DELETE FROM users WHERE organization_id = :org_id",
+    "DELETE FROM membership_plans WHERE organization_id = :org_id",
+    "DELETE FROM organizations WHERE id = :org_id",
+]
+
+ASYNC_PATH = f"{settings.API_V1_PREFIX}/analytics/dashboard"
+SYNC_PATH = "/bench/sync-dashboard"
+
+
+def sync_dashboard(
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """The dashboard as it ran before the async path: sync session, threadpool"""
+    return dashboard_metrics.compute(db, current_user.organization_id, current_user.organization.timezone)
+
+
+def seed(db, org_id, owner_id, members: int) -> None:
+    ensure_partitions(db, "check_ins", months_ahead=1, today=datetime.utcnow())
+    params = {"org_id": org_id, "owner_id": owner_id, "plan_id": uuid4(), "slug": f"bench-{org_id.hex[:8]}",
+              "members": members}
+    for statement in SEED_SQL:
+        db.execute(text(statement), params)
+    db.execute(text("ANALYZE members; ANALYZE memberships; ANALYZE check_ins"))
+    db.commit()
+
+
+async def load(client: httpx.AsyncClient, path: str, requests: int, concurrency: int) -> tuple:
+    """(elapsed seconds, per-request latencies, failures) for requests spread over concurrency clients"""
+    latencies = []
+    failures = 0
+    remaining = iter(range(requests))
+
+    async def worker():
+        nonlocal failures
+        for _ in remaining:
+            started = time.perf_counter()
+            response = await client.get(path)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                failures += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - started, latencies, failures
+
+
+def percentile(values: list, fraction: float) -> float:
+    return statistics.quantiles(values, n=100)[int(fraction * 100) - 1] if len(values) > 1 else values[0]
+
+
+async def bench(args, owner_id) -> int:
+    token = create_access_token({"sub": str(owner_id)})
+    transport = httpx.ASGITransport(app=app)
+    failed = 0
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench", headers={"Authorization": f"Bearer {token}"}, timeout=60
+    ) as client:
+        for label, path in (("sync", SYNC_PATH), ("async", ASYNC_PATH)):
+            # Warm up connection pools before timing
+            await load(client, path, args.concurrency, args.concurrency)
+            elapsed, latencies, failures = await load(client, path, args.requests, args.concurrency)
+            failed += failures
+            print(
+                f"{label:5} {len(latencies) / elapsed:8.0f} req/s  "
+                f"p50 {percentile(latencies, 0.50) * 1000:7.1f}ms  "
+                f"p99 {percentile(latencies, 0.99) * 1000:7.1f}ms  "
+                f"{failures} failed"
+            )
+    return 1 if failed else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--members", type=int, default=10_000)
+    parser.add_argument("--requests", type=int, default=2_000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--keep", action="store_true", help="keep the seeded organization")
+    args = parser.parse_args()
+
+    settings.ANALYTICS_CACHE_ENABLED = False
+    app.add_api_route(SYNC_PATH, sync_dashboard, methods=["GET"])
+
+    org_id, owner_id = uuid4(), uuid4()
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        seed(db, org_id, owner_id, args.members)
+        print(f"Seeded {args.members} members in {time.perf_counter() - started:.1f}s (organization {org_id})")
+        print(f"{args.requests} requests per path, {args.concurrency} concurrent clients")
+        return asyncio.run(bench(args, owner_id))
+    finally:
+        if not args.keep:
+            db.rollback()
+            for statement in CLEANUP_SQL:
+                db.execute(text(statement), {"org_id": org_id})
+            db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,203 @@
+"""
+Benchmark QR check-in scans/sec with and without the eligibility cache.
+
+Seeds one throwaway organization with N members on active memberships, then drives
+POST /check-ins/qr-validate in-process with --concurrency turnstiles, scanning every
+member once per run. The first run has the cache disabled, so each scan loads the
+member, memberships and open check-in from the database; the second starts from a
+warm Redis cache with cold in-process LRUs, which is how the first scan of the day
+finds it. Check-ins, attendance and cache keys are reset between runs. Run from
+backend/ against a development database migrated to head and a running Redis:
+
+    python -m scripts.bench_checkin_scans --members 2000 --concurrency 20
+
+Reports scans/sec, p50/p99 latency and statements per scan. The seeded rows are
+deleted afterwards unless --keep is given.
+"""
+from datetime import datetime
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from uuid import uuid4
+import httpx
+from sqlalchemy import text
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.db.partitions import ensure_partitions
+from app.db.redis import get_redis
+from app.db.session import AsyncSessionLocal, SessionLocal
+from app.main import app
+from app.services.eligibility import KEY_PREFIX, LocalLRU, eligibility_cache, get_eligibility_async
+from app.services.occupancy import KEY_PREFIX as OCCUPANCY_PREFIX
+
+SEED_SQL = [
+    """
+    INSERT INTO organizations (id, created_at, updated_at, name, slug, contact_email, timezone, settings)
+    VALUES (:org_id, now(), now(), 'Check-in scans benchmark', :slug, 'bench@example.com', 'UTC', '{}')
+    """,
+    """
+    INSERT INTO users (id, created_at, updated_at, organization_id, email, password_hash, first_name, last_name,
+                       role, is_active, is_verified)
+    VALUES (:owner_id, now(), now(), :org_id, :slug || '-owner@example.com', 'x', 'Bench', 'Owner',
+            'GYM_OWNER', true, true)
+    """,
+    """
+    INSERT INTO membership_plans (id, created_at, updated_at, organization_id, name, price, duration_days,
+                                  duration_type, is_active)
+    VALUES (:plan_id, now(), now(), :org_id, 'Benchmark', 50, 30, 'MONTHLY', true)
+    """,
+    """
+    INSERT INTO users (id, created_at, updated_at, organization_id, email, password_hash, first_name, last_name,
+                       role, is_active, is_verified)
+    SELECT gen_random_uuid(), now(), now(), :org_id, :slug || '-' || n || '@example.com', 'x',
+           'Member', n::text, 'MEMBER', true, true
+    FROM generate_series(1, :members) AS n
+    """,
+    """
+    INSERT INTO members (id, created_at, updated_at, organization_id, user_id, member_id, qr_code, status,
+                         joined_at)
+    SELECT gen_random_uuid(), now(), now(), :org_id, users.id, 'B-' || users.last_name,
+           :slug || '-' || users.last_name, 'ACTIVE', current_date
+    FROM users WHERE users.organization_id = :org_id AND users.role = 'MEMBER'
+    """,
+    """
+    INSERT INTO memberships (id, created_at, updated_at, organization_id, member_id, plan_id, start_date,
+                             end_date, auto_renew, status)
+    SELECT gen_random_uuid(), now(), now(), :org_id, members.id, :plan_id, current_date - 10,
+           current_date + 20, true, 'ACTIVE'
+    FROM members WHERE members.organization_id = :org_id
+    """,
+]
+
+RESET_SQL = [
+    "DELETE FROM check_ins WHERE organization_id = :org_id",
+    "DELETE FROM member_attendance WHERE organization_id = :org_id",
+]
+
+CLEANUP_SQL = RESET_SQL + [
+    "DELETE FROM memberships WHERE organization_id = :org_id",
+    "DELETE FROM members WHERE organization_id = :org_id",
+    "DELETE FROM users WHERE organization_id = :org_id",
+    "DELETE FROM membership_plans WHERE organization_id = :org_id",
+    "DELETE FROM organizations WHERE id = :org_id",
+]
+
+SCAN_PATH = f"{settings.API_V1_PREFIX}/check-ins/qr-validate"
+
+
+def seed(db, org_id, owner_id, members: int) -> list:
+    ensure_partitions(db, "check_ins", months_ahead=1, today=datetime.utcnow())
+    params = {"org_id": org_id, "owner_id": owner_id, "plan_id": uuid4(), "slug": f"bench-{org_id.hex[:8]}",
+              "members": members}
+    for statement in SEED_SQL:
+        db.execute(text(statement), params)
+    db.execute(text("ANALYZE members; ANALYZE memberships"))
+    db.commit()
+    return list(db.execute(
+        text("SELECT qr_code FROM members WHERE organization_id = :org_id"), params
+    ).scalars())
+
+
+def reset(db, org_id) -> None:
+    """Forget every scan so the next run checks the same members in again"""
+    for statement in RESET_SQL:
+        db.execute(text(statement), {"org_id": org_id})
+    db.commit()
+    client = get_redis()
+    for prefix in (KEY_PREFIX, OCCUPANCY_PREFIX):
+        keys = list(client.scan_iter(f"{prefix}:*{org_id}*"))
+        if keys:
+            client.delete(*keys)
+    eligibility_cache.local = LocalLRU(settings.ELIGIBILITY_LOCAL_CACHE_SIZE, settings.ELIGIBILITY_LOCAL_TTL_SECONDS)
+
+
+async def warm(org_id, qr_codes: list) -> None:
+    """Load every member's entry into Redis, then drop this process's LRU copies"""
+    async with AsyncSessionLocal() as db:
+        for qr_code in qr_codes:
+            await get_eligibility_async(db, org_id, "UTC", qr_code=qr_code)
+    eligibility_cache.local = LocalLRU(settings.ELIGIBILITY_LOCAL_CACHE_SIZE, settings.ELIGIBILITY_LOCAL_TTL_SECONDS)
+
+
+async def scan_all(client: httpx.AsyncClient, qr_codes: list, concurrency: int) -> tuple:
+    """(elapsed seconds, per-scan latencies, statements per scan, failures) scanning each code once"""
+    latencies, queries = [], []
+    failures = 0
+    remaining = iter(qr_codes)
+
+    async def turnstile():
+        nonlocal failures
+        for qr_code in remaining:
+            started = time.perf_counter()
+            response = await client.post(SCAN_PATH, json={"qr_code": qr_code})
+            latencies.append(time.perf_counter() - started)
+            queries.append(int(response.headers.get("X-DB-Query-Count", 0)))
+            if response.status_code != 201:
+                failures += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(turnstile() for _ in range(concurrency)))
+    return time.perf_counter() - started, latencies, queries, failures
+
+
+def percentile(values: list, fraction: float) -> float:
+    return statistics.quantiles(values, n=100)[int(fraction * 100) - 1] if len(values) > 1 else values[0]
+
+
+async def bench(args, db, org_id, owner_id, qr_codes: list) -> int:
+    token = create_access_token({"sub": str(owner_id)})
+    transport = httpx.ASGITransport(app=app)
+    failed = 0
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench", headers={"Authorization": f"Bearer {token}"}, timeout=60
+    ) as client:
+        for label, cached in (("no cache", False), ("warm cache", True)):
+            reset(db, org_id)
+            settings.ELIGIBILITY_CACHE_ENABLED = cached
+            if cached:
+                await warm(org_id, qr_codes)
+            elapsed, latencies, queries, failures = await scan_all(client, qr_codes, args.concurrency)
+            failed += failures
+            print(
+                f"{label:10} {len(latencies) / elapsed:8.0f} scans/s  "
+                f"p50 {percentile(latencies, 0.50) * 1000:7.1f}ms  "
+                f"p99 {percentile(latencies, 0.99) * 1000:7.1f}ms  "
+                f"{statistics.mean(queries):4.1f} statements/scan  "
+                f"{failures} failed"
+            )
+    return 1 if failed else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--members", type=int, default=2_000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--keep", action="store_true", help="keep the seeded organization")
+    args = parser.parse_args()
+
+    # Statement counts come back as X-DB-Query-Count, which is only set in debug mode
+    settings.DEBUG = True
+    settings.QUERY_STATS_ENABLED = True
+
+    org_id, owner_id = uuid4(), uuid4()
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        qr_codes = seed(db, org_id, owner_id, args.members)
+        print(f"Seeded {args.members} members in {time.perf_counter() - started:.1f}s (organization {org_id})")
+        print(f"{len(qr_codes)} scans per run, {args.concurrency} concurrent turnstiles")
+        return asyncio.run(bench(args, db, org_id, owner_id, qr_codes))
+    finally:
+        if not args.keep:
+            db.rollback()
+            reset(db, org_id)
+            for statement in CLEANUP_SQL:
+                db.execute(text(statement), {"org_id": org_id})
+            db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""
+Benchmark columnar report exports against the JSON response on attendance detail rows.
+
+Seeds one throwaway organization with N check-ins over the last 60 days, then builds
+the attendance report's detail rows the way each path does: JSON through format_row
+and json.dumps (what /reports/generate?format=json returns), and Parquet and Arrow
+IPC through columnar_chunks. Each run streams the rows from the database; a
+fetch-only pass measures the query itself, and the build time reported for each
+format is what is left after subtracting it. Run from backend/
+against a development database migrated to head:
+
+    python -m scripts.bench_columnar_export --rows 1000000
+
+The seeded rows are deleted afterwards unless --keep is given.
+"""
+from datetime import datetime, timedelta
+import argparse
+import json
+import sys
+import time
+from uuid import uuid4
+from sqlalchemy import text
+from app.db.partitions import add_months, ensure_partitions, month_start
+from app.db.session import SessionLocal
+from app.services.columnar_export import columnar_chunks
+from app.services.report_export import format_row, stream_rows
+from app.services.reports import attendance_details
+
+DAYS = 60
+
+SEED_SQL = [
+    """
+    INSERT INTO organizations (id, created_at, updated_at, name, slug, contact_email, timezone, settings)
+    VALUES (:org_id, now(), now(), 'Columnar export benchmark', :slug, 'bench@example.com', 'UTC', '{}')
+    """,
+    """
+    INSERT INTO users (id, created_at, updated_at, organization_id, email, password_hash, first_name, last_name,
+                       role, is_active, is_verified)
+    SELECT gen_random_uuid(), now(), now(), :org_id, :slug || '-' || n || '@example.com', 'x',
+           'Member', n::text, 'MEMBER', true, true
+    FROM generate_series(1, :members) AS n
+    """,
+    """
+    INSERT INTO members (id, created_at, updated_at, organization_id, user_id, member_id, status, joined_at)
+    SELECT gen_random_uuid(), now(), now(), :org_id, users.id, 'B-' || users.last_name, 'ACTIVE', current_date
+    FROM users WHERE users.organization_id = :org_id
+    """,
+    # Spread over the window, most of them checked out again an hour or so later
+    """
+    INSERT INTO check_ins (id, created_at, updated_at, organization_id, member_id, check_in_time, check_out_time,
+                           method)
+    SELECT gen_random_uuid(), now(), now(), :org_id, members.id, visit.at,
+           CASE WHEN random() < 0.9 THEN visit.at + interval '75 minutes' END,
+           (ARRAY['QR', 'NFC', 'MANUAL', 'APP'])[1 + n % 4]::checkinmethod
+    FROM generate_series(1, :rows) AS n
+    JOIN (
+        SELECT id, row_number() OVER () - 1 AS position FROM members WHERE organization_id = :org_id
+    ) AS members ON members.position = n % :members
+    CROSS JOIN LATERAL (
+        SELECT (now() at time zone 'utc') - random() * (:days * interval '1 day') AS at
+    ) AS visit
+    """,
+]
+
+CLEANUP_SQL = [
+    "DELETE FROM check_ins WHERE organization_id = :org_id",
+    "DELETE FROM members WHERE organization_id = :org_id",
+    "DELETE FROM users WHERE organization_id = :org_id",
+    "DELETE FROM organizations WHERE id = :org_id",
+]
+
+
+def fetch_only(db, statement) -> int:
+    return sum(1 for _ in stream_rows(db, statement))
+
+
+def build_json(db, statement) -> int:
+    return len(json.dumps([format_row(row) for row in stream_rows(db, statement)]).encode())
+
+
+def build_columnar(format: str):
+    def build(db, statement) -> int:
+        chunks = columnar_chunks(format, {"report_type": "attendance"}, stream_rows(db, statement),
+                                 statement.selected_columns)
+        return sum(len(chunk) for chunk in chunks)
+    return build
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--members", type=int, default=5_000)
+    parser.add_argument("--keep", action="store_true", help="keep the seeded organization")
+    args = parser.parse_args()
+
+    org_id = uuid4()
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        now = datetime.utcnow()
+        ensure_partitions(db, "check_ins", months_ahead=3, today=add_months(month_start(now), -2))
+        params = {"org_id": org_id, "slug": f"bench-{org_id.hex[:8]}", "members": args.members,
+                  "rows": args.rows, "days": DAYS}
+        for statement in SEED_SQL:
+            db.execute(text(statement), params)
+        db.execute(text("ANALYZE members; ANALYZE check_ins"))
+        db.commit()
+        print(f"Seeded {args.rows} check-ins in {time.perf_counter() - started:.1f}s (organization {org_id})")
+
+        statement = attendance_details(org_id, now - timedelta(days=DAYS + 1), now, "UTC")
+        results = {}
+        for label, build in (
+            ("fetch only", fetch_only),
+            ("json", build_json),
+            ("parquet", build_columnar("parquet")),
+            ("arrow", build_columnar("arrow")),
+        ):
+            started = time.perf_counter()
+            size = build(db, statement)
+            results[label] = (time.perf_counter() - started, size)
+            db.rollback()
+
+        # Build time is the total less the fetch every path pays
+        fetch_seconds = results["fetch only"][0]
+        json_build = results["json"][0] - fetch_seconds
+        json_bytes = results["json"][1]
+        print(f"{'':10} {'total s':>8} {'build s':>8} {'MB':>7} {'vs json':>14}")
+        print(f"{'fetch only':10} {fetch_seconds:>8.2f}")
+        for label in ("json", "parquet", "arrow"):
+            seconds, size = results[label]
+            build = max(seconds - fetch_seconds, 1e-6)
+            print(
+                f"{label:10} {seconds:>8.2f} {build:>8.2f} {size / 1e6:>7.1f} "
+                f"{json_build / build:>5.1f}x faster {json_bytes / size:>5.1f}x smaller"
+            )
+        return 0
+    finally:
+        if not args.keep:
+            db.rollback()
+            for statement in CLEANUP_SQL:
+                db.execute(text(statement), {"org_id": org_id})
+            db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""
+Benchmark check_inactive_members against a seeded organization.
+
+Seeds one throwaway organization with N members, each holding an active membership,
+gives a share of them a recent check-in, then times the task with the Celery fan-out
+replaced by a counter (no emails are sent). A second run checks that re-running
+queues nothing. Run from backend/ against a development database migrated to head:
+
+    python -m scripts.bench_inactive_members --members 100000
+
+The seeded rows are deleted afterwards unless --keep is given. claim_inactive_members
+scans every organization, so numbers are only meaningful on an otherwise small database.
+"""
+from datetime import datetime, timedelta
+import argparse
+import sys
+import time
+from uuid import uuid4
+from sqlalchemy import text
+from app.db.session import SessionLocal
+from app.db.partitions import ensure_partitions
+from app.tasks import memberships as membership_tasks
+
+SEED_SQL = [
+    """
+    INSERT INTO organizations (id, created_at, updated_at, name, slug, contact_email, timezone, settings)
+    VALUES (:org_id, now(), now(), 'Inactive members benchmark', :slug, 'bench@example.com', 'UTC', '{}')
+    """,
+    """
+    INSERT INTO membership_plans (id, created_at, updated_at, organization_id, name, price, duration_days,
+                                  duration_type, is_active)
+    VALUES (:plan_id, now(), now(), :org_id, 'Benchmark', 50, 30, 'MONTHLY', true)
+    """,
+    """
+    INSERT INTO users (id, created_at, updated_at, organization_id, email, password_hash, first_name, last_name,
+                       role, is_active, is_verified)
+    SELECT gen_random_uuid(), now(), now(), :org_id, :slug || '-' || n || '@example.com', 'x',
+           'Member', n::text, 'MEMBER', true, true
+    FROM generate_series(1, :members) AS n
+    """,
+    """
+    INSERT INTO members (id, created_at, updated_at, organization_id, user_id, member_id, status, joined_at)
+    SELECT gen_random_uuid(), now(), now(), :org_id, users.id, 'B-' || users.last_name, 'ACTIVE', current_date
+    FROM users WHERE users.organization_id = :org_id
+    """,
+    """
+    INSERT INTO memberships (id, created_at, updated_at, organization_id, member_id, plan_id, start_date,
+                             end_date, auto_renew, status)
+    SELECT gen_random_uuid(), now(), now(), :org_id, members.id, :plan_id, current_date - 30,
+           current_date + 30, true, 'ACTIVE'
+    FROM members WHERE members.organization_id = :org_id
+    """,
+    # Members with a check-in in the last week are the active share; the rest are inactive
+    """
+    INSERT INTO check_ins (id, created_at, updated_at, organization_id, member_id, check_in_time, method)
+    SELECT gen_random_uuid(), now(), now(), :org_id, members.id,
+           now() at time zone 'utc' - (random() * interval '6 days'), 'QR'
+    FROM members WHERE members.organization_id = :org_id AND random() < :active_ratio
+    """,
+]
+
+CLEANUP_SQL = [
+    "DELETE FROM member_reengagements WHERE organization_id = :org_id",
+    "DELETE FROM member_attendance WHERE organization_id = :org_id",
+    "DELETE FROM check_ins WHERE organization_id = :org_id",
+    "DELETE FROM memberships WHERE organization_id = :org_id",
+    "DELETE FROM members WHERE organization_id = :org_id",
+    "DELETE FROM users WHERE organization_id = :org_id",
+    "DELETE FROM membership_plans WHERE organization_id = :org_id",
+    "DELETE FROM organizations WHERE id = :org_id",
+]
+
+
+def seed(db, org_id, members: int, active_ratio: float) -> None:
+    ensure_partitions(db, "check_ins", months_ahead=1, today=datetime.utcnow() - timedelta(days=7))
+    params = {
+        "org_id": org_id,
+        "plan_id": uuid4(),
+        "slug": f"bench-{org_id.hex[:8]}",
+        "members": members,
+        "active_ratio": active_ratio,
+    }
+    for statement in SEED_SQL:
+        db.execute(text(statement), params)
+    db.execute(text("ANALYZE users; ANALYZE members; ANALYZE memberships; ANALYZE check_ins"))
+    db.commit()
+
+
+def run_task() -> tuple:
+    """(seconds, ids dispatched) for one check_inactive_members run, with dispatch counted only"""
+    dispatched = []
+    original_delay = membership_tasks.send_reengagement_batch.delay
+    membership_tasks.send_reengagement_batch.delay = lambda ids: dispatched.extend(ids)
+    try:
+        started = time.perf_counter()
+        membership_tasks.check_inactive_members()
+        return time.perf_counter() - started, len(dispatched)
+    finally:
+        membership_tasks.send_reengagement_batch.delay = original_delay
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--members", type=int, default=100_000)
+    parser.add_argument("--active-ratio", type=float, default=0.7)
+    parser.add_argument("--keep", action="store_true", help="keep the seeded organization")
+    args = parser.parse_args()
+
+    org_id = uuid4()
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        seed(db, org_id, args.members, args.active_ratio)
+        print(f"Seeded {args.members} members in {time.perf_counter() - started:.1f}s (organization {org_id})")
+
+        elapsed, queued = run_task()
+        print(f"First run:  {elapsed:.2f}s, {queued} re-engagements dispatched")
+        elapsed, requeued = run_task()
+        print(f"Second run: {elapsed:.2f}s, {requeued} re-engagements dispatched")
+        return 0 if queued and not requeued else 1
+    finally:
+        if not args.keep:
+            db.rollback()
+            for statement in CLEANUP_SQL:
+                db.execute(text(statement), {"org_id": org_id})
+            db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
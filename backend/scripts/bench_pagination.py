@@ -0,0 +1,126 @@
+"""
+Benchmark keyset against offset pagination at increasing page depths.
+
+Seeds one throwaway organization with enough members to reach the deepest page, then
+times the member list query through paginate() at page 1, 1,000 and 10,000: once
+with the offset fallback (skip) and once with the cursor a client would hold for that
+page. Run from backend/ against a development database migrated to head:
+
+    python -m scripts.bench_pagination --page-size 20
+
+The seeded rows are deleted afterwards unless --keep is given.
+"""
+import argparse
+import statistics
+import sys
+import time
+from uuid import uuid4
+from sqlalchemy import text
+from app.core.pagination import encode_cursor, paginate
+from app.db.session import SessionLocal
+from app.models.member import Member
+
+PAGE_DEPTHS = [1, 1_000, 10_000]
+
+SEED_SQL = [
+    """
+    INSERT INTO organizations (id, created_at, updated_at, name, slug, contact_email, timezone, settings)
+    VALUES (:org_id, now(), now(), 'Pagination benchmark', :slug, 'bench@example.com', 'UTC', '{}')
+    """,
+    """
+    INSERT INTO users (id, created_at, updated_at, organization_id, email, password_hash, first_name, last_name,
+                       role, is_active, is_verified)
+    SELECT gen_random_uuid(), now(), now(), :org_id, :slug || '-' || n || '@example.com', 'x',
+           'Member', n::text, 'MEMBER', true, true
+    FROM generate_series(1, :members) AS n
+    """,
+    # One member per second going back in time, so created_at alone nearly orders the list
+    """
+    INSERT INTO members (id, created_at, updated_at, organization_id, user_id, member_id, status, joined_at)
+    SELECT gen_random_uuid(), now() - users.last_name::int * interval '1 second', now(), :org_id, users.id,
+           'B-' || users.last_name, 'ACTIVE', current_date
+    FROM users WHERE users.organization_id = :org_id
+    """,
+]
+
+CLEANUP_SQL = [
+    "DELETE FROM members WHERE organization_id = :org_id",
+    "DELETE FROM users WHERE organization_id = :org_id",
+    "DELETE FROM organizations WHERE id = :org_id",
+]
+
+
+def member_query(db, org_id):
+    return db.query(Member).filter(Member.organization_id == org_id)
+
+
+def cursor_for_page(db, org_id, page: int, page_size: int) -> str:
+    """The cursor a client paging from the start would hold when asking for this page"""
+    last = member_query(db, org_id).order_by(Member.created_at.desc(), Member.id.desc()).offset(
+        (page - 1) * page_size - 1
+    ).first()
+    return encode_cursor("members", [last.created_at, last.id])
+
+
+def timed(fn, repeat: int) -> float:
+    """Median seconds over repeat calls"""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--keep", action="store_true", help="keep the seeded organization")
+    args = parser.parse_args()
+
+    org_id = uuid4()
+    members = PAGE_DEPTHS[-1] * args.page_size
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        params = {"org_id": org_id, "slug": f"bench-{org_id.hex[:8]}", "members": members}
+        for statement in SEED_SQL:
+            db.execute(text(statement), params)
+        db.execute(text("ANALYZE users; ANALYZE members"))
+        db.commit()
+        print(f"Seeded {members} members in {time.perf_counter() - started:.1f}s (organization {org_id})")
+
+        mismatches = 0
+        print(f"{'page':>7} {'offset ms':>10} {'keyset ms':>10}")
+        for page in PAGE_DEPTHS:
+            skip = (page - 1) * args.page_size
+            cursor = cursor_for_page(db, org_id, page, args.page_size) if page > 1 else None
+
+            def by_offset():
+                return paginate(member_query(db, org_id), "members", Member.created_at, Member.id,
+                                args.page_size, skip=skip)
+
+            def by_cursor():
+                return paginate(member_query(db, org_id), "members", Member.created_at, Member.id,
+                                args.page_size, cursor=cursor)
+
+            if [m.id for m in by_offset()] != [m.id for m in by_cursor()]:
+                mismatches += 1
+            offset_seconds = timed(by_offset, args.repeat)
+            cursor_seconds = timed(by_cursor, args.repeat)
+            db.rollback()
+            print(f"{page:>7} {offset_seconds * 1000:>10.2f} {cursor_seconds * 1000:>10.2f}")
+
+        return 1 if mismatches else 0
+    finally:
+        if not args.keep:
+            db.rollback()
+            for statement in CLEANUP_SQL:
+                db.execute(text(statement), {"org_id": org_id})
+            db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
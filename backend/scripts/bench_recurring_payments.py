@@ -0,0 +1,220 @@
+"""
+Benchmark the recurring-payment pipeline against a fake gateway.
+
+Seeds one throwaway organization with N memberships renewing today, each with a
+pending payment carrying a saved customer and payment method, then runs the
+renewal batches the way the chord would: selection through due_renewals, then
+charge_renewal_batch per batch across --workers threads standing in for Celery
+workers. The gateway is a fake with fixed latency and a failure rate, so no real
+charges are made, and retries are counted instead of scheduled. Run from backend/
+against a development database migrated to head:
+
+    python -m scripts.bench_recurring_payments --renewals 50000
+
+--gateway-only skips the database and times charge_renewals alone. The seeded rows
+are deleted afterwards unless --keep is given.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+import argparse
+import random
+import sys
+import threading
+import time
+from uuid import uuid4
+from sqlalchemy import text
+from app.core.config import settings
+from app.models.payment import Payment
+from app.services import renewals
+from app.tasks import payments as payment_tasks
+
+SEED_SQL = [
+    """
+    INSERT INTO organizations (id, created_at, updated_at, name, slug, contact_email, timezone, settings)
+    VALUES (:org_id, now(), now(), 'Recurring payments benchmark', :slug, 'bench@example.com', 'UTC', '{}')
+    """,
+    """
+    INSERT INTO membership_plans (id, created_at, updated_at, organization_id, name, price, duration_days,
+                                  duration_type, is_active)
+    VALUES (:plan_id, now(), now(), :org_id, 'Benchmark', 50, 30, 'MONTHLY', true)
+    """,
+    """
+    INSERT INTO users (id, created_at, updated_at, organization_id, email, password_hash, first_name, last_name,
+                       role, is_active, is_verified)
+    SELECT gen_random_uuid(), now(), now(), :org_id, :slug || '-' || n || '@example.com', 'x',
+           'Member', n::text, 'MEMBER', true, true
+    FROM generate_series(1, :renewals) AS n
+    """,
+    """
+    INSERT INTO members (id, created_at, updated_at, organization_id, user_id, member_id, status, joined_at)
+    SELECT gen_random_uuid(), now(), now(), :org_id, users.id, 'B-' || users.last_name, 'ACTIVE', current_date
+    FROM users WHERE users.organization_id = :org_id
+    """,
+    """
+    INSERT INTO memberships (id, created_at, updated_at, organization_id, member_id, plan_id, start_date,
+                             end_date, auto_renew, status)
+    SELECT gen_random_uuid(), now(), now(), :org_id, members.id, :plan_id, current_date - 30,
+           current_date, true, 'ACTIVE'
+    FROM members WHERE members.organization_id = :org_id
+    """,
+    """
+    INSERT INTO payments (id, created_at, updated_at, organization_id, member_id, membership_id, amount,
+                          currency, payment_method, payment_gateway, status, payment_date, due_date,
+                          retry_count, metadata)
+    SELECT gen_random_uuid(), now(), now(), :org_id, memberships.member_id, memberships.id, 50, 'USD',
+           'CARD', 'stripe', 'PENDING', current_date, current_date, 0,
+           json_build_object('customer_id', 'cus_' || md5(memberships.id::text),
+                             'payment_method_id', 'pm_' || md5(memberships.member_id::text))
+    FROM memberships WHERE memberships.organization_id = :org_id
+    """,
+]
+
+CLEANUP_SQL = [
+    "DELETE FROM payments WHERE organization_id = :org_id",
+    "DELETE FROM memberships WHERE organization_id = :org_id",
+    "DELETE FROM members WHERE organization_id = :org_id",
+    "DELETE FROM users WHERE organization_id = :org_id",
+    "DELETE FROM membership_plans WHERE organization_id = :org_id",
+    "DELETE FROM organizations WHERE id = :org_id",
+]
+
+
+class FakeGateway:
+    """Stands in for a gateway client: fixed latency, random declines, one charge per idempotency key"""
+
+    def __init__(self, latency: float, failure_rate: float):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.charges = {}
+        self.lock = threading.Lock()
+
+    def create_payment_intent(self, amount, currency, customer_id, metadata=None,
+                              payment_method_id=None, idempotency_key=None):
+        time.sleep(self.latency)
+        with self.lock:
+            if idempotency_key not in self.charges:
+                status = "requires_payment_method" if random.random() < self.failure_rate else "succeeded"
+                self.charges[idempotency_key] = {"payment_intent_id": f"pi_{uuid4().hex}", "status": status}
+            return dict(self.charges[idempotency_key])
+
+
+def synthetic_renewals(count: int) -> list:
+    return [
+        {
+            "payment_id": str(uuid4()),
+            "membership_id": str(uuid4()),
+            "organization_id": str(uuid4()),
+            "member_id": str(uuid4()),
+            "amount": "50.00",
+            "currency": "USD",
+            "gateway": "stripe",
+            "attempt": 1,
+            "customer_id": f"cus_{n}",
+            "payment_method_id": f"pm_{n}",
+        }
+        for n in range(count)
+    ]
+
+
+def bench_gateway_only(args, gateway: FakeGateway) -> int:
+    batch = synthetic_renewals(args.renewals)
+    started = time.perf_counter()
+    results = renewals.charge_renewals(batch, settings.RECURRING_PAYMENT_CONCURRENCY)
+    elapsed = time.perf_counter() - started
+
+    succeeded = sum(result["succeeded"] for result in results)
+    print(
+        f"charge_renewals: {len(results)} renewals in {elapsed:.2f}s "
+        f"({len(results) / elapsed:.0f}/s), {succeeded} succeeded, {len(gateway.charges)} gateway charges"
+    )
+    return 0 if len(gateway.charges) == len(results) else 1
+
+
+def run_batches(db, org_id, workers: int) -> tuple:
+    """(selection seconds, charging seconds, batch count) for one pass over the organization's renewals"""
+    started = time.perf_counter()
+    rows = db.execute(
+        renewals.due_renewals(date.today()).where(Payment.organization_id == org_id).execution_options(
+            yield_per=settings.RECURRING_PAYMENT_BATCH_SIZE
+        )
+    )
+    batches = [[renewals.renewal_task_args(row) for row in chunk] for chunk in rows.partitions()]
+    db.rollback()
+    selected = time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(payment_tasks.charge_renewal_batch, batches))
+    return selected, time.perf_counter() - started, batches
+
+
+def bench_pipeline(args, gateway: FakeGateway) -> int:
+    from app.db.session import SessionLocal
+
+    retries = []
+    original_apply_async = payment_tasks.retry_payment.apply_async
+    payment_tasks.retry_payment.apply_async = lambda args, countdown: retries.append(args[0])
+
+    org_id = uuid4()
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        params = {"org_id": org_id, "plan_id": uuid4(), "slug": f"bench-{org_id.hex[:8]}", "renewals": args.renewals}
+        for statement in SEED_SQL:
+            db.execute(text(statement), params)
+        db.execute(text("ANALYZE memberships; ANALYZE payments"))
+        db.commit()
+        print(f"Seeded {args.renewals} renewals in {time.perf_counter() - started:.1f}s (organization {org_id})")
+
+        selected, charged, batches = run_batches(db, org_id, args.workers)
+        completed = db.execute(
+            text("SELECT count(*) FROM payments WHERE organization_id = :org_id AND status = 'COMPLETED'"),
+            {"org_id": org_id}
+        ).scalar()
+        db.rollback()
+        renewal_count = sum(len(batch) for batch in batches)
+        print(
+            f"Selection: {selected:.2f}s for {renewal_count} renewals in {len(batches)} batches\n"
+            f"Charging:  {charged:.2f}s with {args.workers} workers x "
+            f"{settings.RECURRING_PAYMENT_CONCURRENCY} concurrent calls "
+            f"({renewal_count / charged:.0f}/s), {completed} completed, {len(retries)} retries scheduled"
+        )
+
+        # A redelivered batch must not charge again
+        charges_before = len(gateway.charges)
+        for batch in batches[:1]:
+            payment_tasks.charge_renewal_batch(batch)
+        duplicate_charges = len(gateway.charges) - charges_before
+        print(f"Redelivered batch: {duplicate_charges} new gateway charges")
+        return 0 if completed + len(retries) == args.renewals and not duplicate_charges else 1
+    finally:
+        payment_tasks.retry_payment.apply_async = original_apply_async
+        if not args.keep:
+            db.rollback()
+            for statement in CLEANUP_SQL:
+                db.execute(text(statement), {"org_id": org_id})
+            db.commit()
+        db.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--renewals", type=int, default=50_000)
+    parser.add_argument("--workers", type=int, default=4, help="batches charged at once (Celery workers)")
+    parser.add_argument("--latency-ms", type=float, default=1.0, help="fake gateway latency per call")
+    parser.add_argument("--failure-rate", type=float, default=0.05)
+    parser.add_argument("--gateway-only", action="store_true", help="time charge_renewals without a database")
+    parser.add_argument("--keep", action="store_true", help="keep the seeded organization")
+    args = parser.parse_args()
+
+    gateway = FakeGateway(args.latency_ms / 1000, args.failure_rate)
+    original_gateway = renewals.get_shared_gateway
+    renewals.get_shared_gateway = lambda gateway_type: gateway
+    try:
+        return bench_gateway_only(args, gateway) if args.gateway_only else bench_pipeline(args, gateway)
+    finally:
+        renewals.get_shared_gateway = original_gateway
+
+
+if __name__ == "__main__":
+    sys.exit(main())
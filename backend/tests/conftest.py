@@ -0,0 +1,115 @@
+"""
+Shared fixtures.
+
+Tests that touch the database need a disposable PostgreSQL database:
+
+    TEST_DATABASE_URL=postgresql://localhost/fitflow_test pytest
+
+The schema is created from the models once per session (with check_ins partitions
+from three months back) and dropped afterwards, and
+every test runs in a transaction that is rolled back, so commits inside the code
+under test only release a savepoint. Without TEST_DATABASE_URL those tests are skipped.
+"""
+from datetime import date
+import os
+
+# Settings are read at import time, so configure them before anything imports app
+if os.environ.get("TEST_DATABASE_URL"):
+    os.environ["DATABASE_URL"] = os.environ["TEST_DATABASE_URL"]
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/fitflow_test")
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ.setdefault("JWT_SECRET_KEY", "test-jwt-secret-key")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379/15")
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.db.base import Base
+from app.db.partitions import PARTITIONED_TABLES, add_months, ensure_partitions, month_start
+from app.models import *  # noqa: F401,F403 - registers every table on Base.metadata
+from app.models.user import UserRole
+from tests import factories
+
+
+@pytest.fixture(scope="session")
+def engine():
+    if not os.environ.get("TEST_DATABASE_URL"):
+        pytest.skip("TEST_DATABASE_URL is not set")
+
+    from app.db.session import engine
+
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        for table in PARTITIONED_TABLES:
+            ensure_partitions(
+                session, table, settings.PARTITION_MONTHS_AHEAD + 3, today=add_months(month_start(date.today()), -3)
+            )
+    yield engine
+    Base.metadata.drop_all(engine)
+
+
+@pytest.fixture
+def db(engine):
+    """Session inside a transaction that is rolled back after the test"""
+    connection = engine.connect()
+    transaction = connection.begin()
+    session = Session(bind=connection, join_transaction_mode="create_savepoint")
+    try:
+        yield session
+    finally:
+        session.close()
+        transaction.rollback()
+        connection.close()
+
+
+@pytest.fixture
+def organization(db):
+    return factories.make_organization(db)
+
+
+@pytest.fixture
+def admin(db, organization):
+    return factories.make_user(db, organization, role=UserRole.GYM_OWNER)
+
+
+@pytest.fixture
+def client(db, admin):
+    """API client authenticated as the organization's owner, reading and writing through `db`"""
+    from app.main import app
+    from app.core.deps import get_read_db
+    from app.db.session import get_db
+
+    def override_db():
+        yield db
+
+    app.dependency_overrides[get_db] = override_db
+    app.dependency_overrides[get_read_db] = override_db
+    token = create_access_token({"sub": str(admin.id)})
+    try:
+        with TestClient(app, headers={"Authorization": f"Bearer {token}"}) as test_client:
+            yield test_client
+    finally:
+        app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def query_budget(client, monkeypatch):
+    """
+    Make a request through `client` and fail if it runs more than max_queries statements.
+
+    Reads the X-DB-Query-Count header QueryStatsMiddleware sets in debug mode:
+
+        query_budget("GET", "/api/v1/members", 3)
+    """
+    monkeypatch.setattr(settings, "DEBUG", True)
+    monkeypatch.setattr(settings, "QUERY_STATS_ENABLED", True)
+
+    def request(method: str, url: str, max_queries: int, **kwargs):
+        response = client.request(method, url, **kwargs)
+        count = int(response.headers["X-DB-Query-Count"])
+        assert count <= max_queries, f"{method} {url} ran {count} queries (budget {max_queries})"
+        return response
+    return request
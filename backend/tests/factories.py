@@ -0,0 +1,119 @@
+"""Small builders for test data; each flushes so ids are available right away"""
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from itertools import count
+from typing import Optional
+from app.core.security import get_password_hash
+from app.models.checkin import CheckIn, CheckInMethod
+from app.models.class_model import Class, ClassSchedule, ClassBooking, BookingStatus
+from app.models.member import Member, MemberStatus
+from app.models.membership import Membership, MembershipPlan, MembershipStatus, DurationType
+from app.models.organization import Organization
+from app.models.payment import Payment, PaymentMethod, PaymentStatus
+from app.models.user import User, UserRole
+
+_sequence = count(1)
+_PASSWORD_HASH = get_password_hash("password")
+
+
+def make_organization(db, **fields) -> Organization:
+    n = next(_sequence)
+    organization = Organization(
+        name=f"Gym {n}", slug=f"gym-{n}", contact_email=f"gym-{n}@example.com",
+        timezone="UTC", settings={}, **fields
+    )
+    db.add(organization)
+    db.flush()
+    return organization
+
+
+def make_user(db, organization: Organization, role: UserRole = UserRole.MEMBER, **fields) -> User:
+    n = next(_sequence)
+    user = User(
+        organization_id=organization.id, email=f"user-{n}@example.com", password_hash=_PASSWORD_HASH,
+        first_name="Test", last_name=f"User {n}", role=role, is_active=True, **fields
+    )
+    db.add(user)
+    db.flush()
+    return user
+
+
+def make_member(db, organization: Organization, **fields) -> Member:
+    n = next(_sequence)
+    user = make_user(db, organization)
+    fields.setdefault("joined_at", date.today())
+    member = Member(
+        organization_id=organization.id, user_id=user.id, member_id=f"M-{n:06d}",
+        qr_code=f"QR-{n:06d}", status=MemberStatus.ACTIVE, **fields
+    )
+    db.add(member)
+    db.flush()
+    return member
+
+
+def make_plan(db, organization: Organization, **fields) -> MembershipPlan:
+    plan = MembershipPlan(
+        organization_id=organization.id, name="Monthly", price=Decimal("50.00"), duration_days=30,
+        duration_type=DurationType.MONTHLY, **fields
+    )
+    db.add(plan)
+    db.flush()
+    return plan
+
+
+def make_membership(db, member: Member, plan: Optional[MembershipPlan] = None,
+                    status: MembershipStatus = MembershipStatus.ACTIVE, **fields) -> Membership:
+    plan = plan or make_plan(db, member.organization)
+    fields.setdefault("start_date", date.today() - timedelta(days=10))
+    fields.setdefault("end_date", date.today() + timedelta(days=20))
+    membership = Membership(
+        organization_id=member.organization_id, member_id=member.id, plan_id=plan.id, status=status, **fields
+    )
+    db.add(membership)
+    db.flush()
+    return membership
+
+
+def make_check_in(db, member: Member, check_in_time: Optional[datetime] = None, **fields) -> CheckIn:
+    fields.setdefault("method", CheckInMethod.QR)
+    check_in = CheckIn(
+        organization_id=member.organization_id, member_id=member.id,
+        check_in_time=check_in_time or datetime.utcnow(), **fields
+    )
+    db.add(check_in)
+    db.flush()
+    return check_in
+
+
+def make_payment(db, member: Member, amount: str = "50.00",
+                 status: PaymentStatus = PaymentStatus.COMPLETED, **fields) -> Payment:
+    fields.setdefault("payment_date", date.today())
+    payment = Payment(
+        organization_id=member.organization_id, member_id=member.id, amount=Decimal(amount),
+        payment_method=PaymentMethod.CARD, status=status, **fields
+    )
+    db.add(payment)
+    db.flush()
+    return payment
+
+
+def make_booking(db, member: Member, scheduled_date: Optional[date] = None, **fields) -> ClassBooking:
+    class_obj = Class(
+        organization_id=member.organization_id, name="Spin", category="cardio", duration_minutes=45, capacity=20
+    )
+    db.add(class_obj)
+    db.flush()
+    schedule = ClassSchedule(
+        organization_id=member.organization_id, class_id=class_obj.id,
+        scheduled_date=scheduled_date or date.today(), start_time=time(18, 0), end_time=time(18, 45)
+    )
+    db.add(schedule)
+    db.flush()
+    fields.setdefault("status", BookingStatus.BOOKED)
+    booking = ClassBooking(
+        organization_id=member.organization_id, schedule_id=schedule.id, member_id=member.id,
+        booked_at=datetime.utcnow(), **fields
+    )
+    db.add(booking)
+    db.flush()
+    return booking
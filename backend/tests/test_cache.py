@@ -0,0 +1,48 @@
+from datetime import date, datetime, time, timedelta
+import json
+from app.core.config import settings
+from app.services.cache import AnalyticsCache, KEY_PREFIX, analytics_cache
+from tests import factories
+
+
+def test_cached_analytics_keys_on_full_datetimes(client):
+    day = (date.today() - timedelta(days=3)).isoformat()
+    params = {"end_date": f"{date.today().isoformat()}T00:00:00"}
+
+    morning = client.get("/api/v1/analytics/attendance", params={**params, "start_date": f"{day}T06:00:00"})
+    evening = client.get("/api/v1/analytics/attendance", params={**params, "start_date": f"{day}T18:00:00"})
+
+    assert morning.json()["start_date"] == f"{day}T06:00:00"
+    assert evening.json()["start_date"] == f"{day}T18:00:00"
+
+
+def test_generated_report_caches_the_summary_only(client, db, organization):
+    member = factories.make_member(db, organization)
+    factories.make_check_in(db, member, datetime.combine(date.today() - timedelta(days=1), time(10)))
+
+    first = client.post("/api/v1/reports/generate", params={"report_type": "attendance"}).json()
+    second = client.post("/api/v1/reports/generate", params={"report_type": "attendance"}).json()
+
+    assert len(first["details"]["checkins"]) == len(second["details"]["checkins"]) == 1
+    entries = [
+        json.loads(analytics_cache.client.get(key))["value"]
+        for key in analytics_cache.client.scan_iter(f"{KEY_PREFIX}:cache:{organization.id}:reports:attendance:*")
+        if not key.endswith(":lock")
+    ]
+    assert len(entries) == 1
+    assert "details" not in entries[0]
+    assert entries[0]["summary"]["total_checkins"] == 1
+
+
+class UnreachableRedis:
+    def __getattr__(self, name):
+        raise AssertionError(f"Redis was called ({name}) with the cache disabled")
+
+
+def test_invalidation_is_skipped_when_the_cache_is_disabled(monkeypatch):
+    monkeypatch.setattr(settings, "ANALYTICS_CACHE_ENABLED", False)
+    cache = AnalyticsCache(client=UnreachableRedis())
+
+    cache.invalidate("org", "check_ins")
+    cache.invalidate_all()
+    assert cache.get_or_compute("org", "dashboard", ["check_ins"], {}, lambda: 42) == 42
@@ -0,0 +1,92 @@
+from datetime import datetime, timedelta
+import asyncio
+import httpx
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.db.redis import get_async_redis
+from app.db.session import get_async_db, get_async_database_url
+from app.models.user import UserRole
+from tests import factories
+
+BATCH_URL = f"{settings.API_V1_PREFIX}/check-ins/batch"
+
+
+async def _sync_batches(engine, make_batches) -> list:
+    """
+    Seed an eligible member (active membership) and a lapsed one (none), then POST each
+    batch make_batches(eligible_qr, lapsed_qr) returns through the app on an async
+    session whose transaction is rolled back afterwards.
+    """
+    from app.main import app
+
+    async_engine = create_async_engine(get_async_database_url(str(engine.url)), poolclass=NullPool)
+    connection = await async_engine.connect()
+    transaction = await connection.begin()
+    db = AsyncSession(bind=connection, join_transaction_mode="create_savepoint", expire_on_commit=False)
+
+    async def override_db():
+        yield db
+
+    app.dependency_overrides[get_async_db] = override_db
+    try:
+        def seed(session):
+            organization = factories.make_organization(session)
+            owner = factories.make_user(session, organization, role=UserRole.GYM_OWNER)
+            eligible = factories.make_member(session, organization)
+            factories.make_membership(session, eligible)
+            lapsed = factories.make_member(session, organization)
+            return owner.id, eligible.qr_code, lapsed.qr_code
+
+        owner_id, eligible_qr, lapsed_qr = await db.run_sync(seed)
+        token = create_access_token({"sub": str(owner_id)})
+        responses = []
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test",
+            headers={"Authorization": f"Bearer {token}"}
+        ) as client:
+            for batch in make_batches(eligible_qr, lapsed_qr):
+                responses.append(await client.post(BATCH_URL, json={"items": batch}))
+        return responses
+    finally:
+        app.dependency_overrides.clear()
+        await db.close()
+        await transaction.rollback()
+        await connection.close()
+        await async_engine.dispose()
+        # The shared client's connections belong to this test's event loop
+        await get_async_redis().connection_pool.disconnect()
+
+
+def test_batch_mixes_created_duplicate_and_rejected_items(engine):
+    scanned_at = (datetime.utcnow() - timedelta(minutes=5)).isoformat()
+
+    def batches(eligible_qr, lapsed_qr):
+        batch = [
+            {"idempotency_key": "scan-1", "qr_code": eligible_qr, "check_in_time": scanned_at},
+            {"idempotency_key": "scan-1", "qr_code": eligible_qr, "check_in_time": scanned_at},
+            {"idempotency_key": "scan-2", "qr_code": lapsed_qr, "check_in_time": scanned_at},
+            {"idempotency_key": "scan-3", "qr_code": "QR-UNKNOWN", "check_in_time": scanned_at},
+            {"idempotency_key": "scan-4", "check_in_time": scanned_at},
+        ]
+        return [batch, batch[:1]]
+
+    first, replay = asyncio.run(_sync_batches(engine, batches))
+
+    assert first.status_code == 200, first.text
+    body = first.json()
+    assert (body["created"], body["duplicates"], body["rejected"]) == (1, 1, 3)
+    results = body["results"]
+    assert [result["status"] for result in results] == ["created", "duplicate", "rejected", "rejected", "rejected"]
+    assert results[1]["check_in_id"] == results[0]["check_in_id"]
+    assert [(result["error_code"], result["detail"]) for result in results[2:]] == [
+        (403, "No active membership found for this member"),
+        (404, "Invalid QR code"),
+        (422, "member_id or qr_code is required"),
+    ]
+
+    # A replayed key comes back as a duplicate of the stored check-in
+    assert replay.status_code == 200, replay.text
+    assert replay.json()["results"][0]["status"] == "duplicate"
+    assert replay.json()["results"][0]["check_in_id"] == results[0]["check_in_id"]
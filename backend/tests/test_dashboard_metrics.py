@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta
+from sqlalchemy import func
+from app.db.query_stats import assert_query_budget
+from app.models.checkin import CheckIn
+from app.models.payment import PaymentStatus
+from app.services.dashboard_metrics import (
+    DashboardMetric, DashboardMetricsEngine, MetricSource, dashboard_metrics
+)
+from tests import factories
+
+
+def seed_dashboard(db, organization):
+    members = [factories.make_member(db, organization) for _ in range(3)]
+    now = datetime.utcnow()
+    for member in members:
+        factories.make_membership(db, member)
+        factories.make_check_in(db, member, now)
+    factories.make_check_in(db, members[0], now - timedelta(days=1), check_out_time=now - timedelta(hours=23))
+    factories.make_payment(db, members[0], "40.00")
+    factories.make_payment(db, members[1], "25.00", status=PaymentStatus.PENDING,
+                           due_date=now.date() - timedelta(days=2))
+    factories.make_booking(db, members[2])
+    return members
+
+
+def test_dashboard_runs_one_statement_per_source(db, organization):
+    seed_dashboard(db, organization)
+    sources = {metric.source for metric in dashboard_metrics._metrics.values()}
+
+    with assert_query_budget(len(sources), "dashboard") as stats:
+        metrics = dashboard_metrics.compute(db, organization.id, "UTC")
+
+    assert stats.count == len(sources)
+    assert metrics["checkins_today"] == 3
+    assert metrics["current_occupancy"] == 3
+    assert metrics["active_memberships"] == 3
+    assert metrics["revenue_today"] == 40.0
+    assert metrics["overdue_payments"] == 1
+    assert metrics["class_bookings_today"] == 1
+
+
+def test_new_metric_on_existing_source_adds_no_statement(db, organization):
+    seed_dashboard(db, organization)
+    engine = DashboardMetricsEngine()
+    engine.register_source(MetricSource(
+        "check_ins", select_from=lambda: CheckIn, scope=lambda ctx: [CheckIn.organization_id == ctx.org_id]
+    ))
+    engine.register(DashboardMetric("checkins_total", "check_ins", lambda ctx: func.count()))
+    engine.register(DashboardMetric(
+        "checkins_closed", "check_ins", lambda ctx: func.count().filter(CheckIn.check_out_time.isnot(None))
+    ))
+
+    with assert_query_budget(1, "dashboard"):
+        metrics = engine.compute(db, organization.id, "UTC")
+
+    assert metrics == {"checkins_total": 4, "checkins_closed": 1}
+
+
+def test_known_metrics_are_taken_as_given(db, organization):
+    seed_dashboard(db, organization)
+    sources = {metric.source for metric in dashboard_metrics._metrics.values()}
+
+    with assert_query_budget(len(sources), "dashboard"):
+        metrics = dashboard_metrics.compute(db, organization.id, "UTC", known={"current_occupancy": 7})
+
+    assert metrics["current_occupancy"] == 7
+    assert metrics["checkins_today"] == 3
@@ -0,0 +1,19 @@
+from app.db.session import get_db
+
+
+def primary_session_unavailable():
+    raise AssertionError("read-only endpoint opened a primary session")
+    yield
+
+
+def test_read_endpoints_authenticate_on_the_read_session(client):
+    client.app.dependency_overrides[get_db] = primary_session_unavailable
+
+    for path in ("/api/v1/analytics/attendance", "/api/v1/members", "/api/v1/reports/scheduled"):
+        assert client.get(path).status_code == 200, path
+
+
+def test_read_session_requires_a_valid_token(client):
+    response = client.get("/api/v1/members", headers={"Authorization": "Bearer not-a-token"})
+
+    assert response.status_code == 401
@@ -0,0 +1,25 @@
+from datetime import datetime
+from uuid import uuid4
+import asyncio
+from app.db.redis import get_async_redis
+from app.services.occupancy import occupancy_counter
+
+
+async def _read_before_and_after_check_in(org_id) -> tuple:
+    try:
+        before = await occupancy_counter.get_async(org_id, "UTC")
+        await occupancy_counter.adjust_async(org_id, "UTC", [(datetime.utcnow(), None, 1)])
+        after = await occupancy_counter.get_async(org_id, "UTC")
+        await get_async_redis().delete(occupancy_counter.key(org_id, datetime.utcnow().date()))
+        return before, after
+    finally:
+        # The shared client's connections belong to this test's event loop
+        await get_async_redis().connection_pool.disconnect()
+
+
+def test_missing_counters_read_as_unavailable():
+    before, after = asyncio.run(_read_before_and_after_check_in(uuid4()))
+
+    # No hash for today means callers fall back to counting check-ins
+    assert before is None
+    assert after == {"total": 1, "locations": {"unassigned": 1}}
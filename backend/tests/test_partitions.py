@@ -0,0 +1,33 @@
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import text
+from app.db.partitions import list_partitions, month_start, partition_name
+from app.models.checkin import CheckIn
+from app.tasks.maintenance import check_rollup_pruning
+from tests import factories
+
+
+def test_check_ins_are_routed_to_monthly_partitions(db, organization):
+    member = factories.make_member(db, organization)
+    now = datetime.utcnow()
+    check_in = factories.make_check_in(db, member, now)
+
+    assert db.get(CheckIn, check_in.id) is check_in
+    partition = partition_name("check_ins", month_start(now))
+    assert partition in list_partitions(db, "check_ins")
+    assert db.execute(text(f"SELECT count(*) FROM {partition} WHERE id = :id"), {"id": check_in.id}).scalar() == 1
+
+
+def test_rollup_refresh_scans_only_covering_partitions(db):
+    check_rollup_pruning(db)
+
+
+def test_pruning_check_fails_when_refresh_falls_back_to_default_partition(db):
+    # Without the partitions covering the refresh window, those rows land in (and are scanned from) the default
+    for day in (datetime.utcnow() - timedelta(days=5), datetime.utcnow() + timedelta(days=1)):
+        name = partition_name("check_ins", month_start(day))
+        if name in list_partitions(db, "check_ins"):
+            db.execute(text(f"ALTER TABLE check_ins DETACH PARTITION {name}"))
+
+    with pytest.raises(RuntimeError, match="check_ins_default"):
+        check_rollup_pruning(db)
@@ -0,0 +1,23 @@
+from datetime import datetime, timedelta
+from tests import factories
+
+
+def test_member_list_does_not_query_per_member(query_budget, db, organization):
+    for _ in range(25):
+        factories.make_member(db, organization)
+
+    response = query_budget("GET", "/api/v1/members", 3, params={"limit": 50})
+
+    assert response.status_code == 200
+    assert len(response.json()) == 25
+
+
+def test_check_in_history_does_not_query_per_check_in(query_budget, db, organization):
+    member = factories.make_member(db, organization)
+    for hours in range(20):
+        factories.make_check_in(db, member, datetime.utcnow() - timedelta(hours=hours + 1))
+
+    response = query_budget("GET", f"/api/v1/check-ins/member/{member.id}", 4)
+
+    assert response.status_code == 200
+    assert len(response.json()["check_ins"]) == 20
@@ -0,0 +1,33 @@
+from datetime import date, datetime, timedelta
+from sqlalchemy import text
+from app.db.query_plans import HOT_QUERIES, check_hot_queries
+from app.models.notification import Notification, NotificationStatus, NotificationType
+from app.models.payment import PaymentStatus
+from tests import factories
+
+
+def seed_hot_tables(db, organization):
+    """A row or two in every table a hot query reads, in the states the queries filter on"""
+    today = date.today()
+    member = factories.make_member(db, organization)
+    membership = factories.make_membership(db, member, end_date=today + timedelta(days=7))
+    factories.make_payment(db, member)
+    factories.make_payment(db, member, status=PaymentStatus.PENDING, membership_id=membership.id,
+                           due_date=today - timedelta(days=1))
+    factories.make_check_in(db, member)
+    factories.make_booking(db, member)
+    db.add(Notification(
+        organization_id=organization.id, user_id=member.user_id, type=list(NotificationType)[0],
+        title="Reminder", body="See you tomorrow", status=NotificationStatus.SENT, sent_at=datetime.utcnow()
+    ))
+    db.flush()
+
+
+def test_hot_queries_use_an_index(db, organization):
+    seed_hot_tables(db, organization)
+    # Tiny test tables would rightly be scanned, so take sequential scans off the table:
+    # the planner then only picks one for a query no index can serve
+    db.execute(text("SET LOCAL enable_seqscan = off"))
+
+    assert HOT_QUERIES
+    assert check_hot_queries(db, organization.id) == {}
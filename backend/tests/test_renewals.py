@@ -0,0 +1,60 @@
+from datetime import date, timedelta
+import pytest
+from app.models.payment import Payment, PaymentStatus
+from app.services import renewals
+from app.tasks import payments as payment_tasks
+from tests import factories
+
+
+class FakeGateway:
+    def __init__(self, status: str):
+        self.status = status
+        self.keys = []
+
+    def create_payment_intent(self, idempotency_key=None, **kwargs):
+        self.keys.append(idempotency_key)
+        return {"status": self.status, "payment_intent_id": f"pi_{len(self.keys)}"}
+
+
+@pytest.fixture
+def failed_renewal(db, organization, monkeypatch):
+    """A renewal whose first attempt yesterday was declined, committed so the tasks' sessions see it"""
+    member = factories.make_member(db, organization)
+    yesterday = date.today() - timedelta(days=1)
+    membership = factories.make_membership(db, member, end_date=yesterday, auto_renew=True)
+    payment = factories.make_payment(
+        db, member, status=PaymentStatus.PENDING, membership_id=membership.id, due_date=yesterday,
+        retry_count=1, payment_metadata={"customer_id": "cus_1", "payment_method_id": "pm_1"}
+    )
+    db.commit()
+    monkeypatch.setattr(payment_tasks, "SessionLocal", lambda: db)
+    # Its email and SMS clients need credentials; neither test reaches a failure notice
+    monkeypatch.setattr(payment_tasks, "NotificationManager", object)
+    return payment.id
+
+
+def test_retry_charges_the_saved_payment_method(db, failed_renewal, monkeypatch):
+    gateway = FakeGateway("succeeded")
+    monkeypatch.setattr(renewals, "get_shared_gateway", lambda name: gateway)
+
+    payment_tasks.retry_payment(str(failed_renewal))
+
+    # The tasks close the session, so read the payment back afresh
+    payment = db.get(Payment, failed_renewal)
+    assert gateway.keys == [f"{failed_renewal.hex}-2"]
+    assert payment.status == PaymentStatus.COMPLETED
+    assert payment.retry_count == 2
+    assert payment.transaction_id == "pi_1"
+
+
+def test_declined_retry_is_rescheduled(db, failed_renewal, monkeypatch):
+    monkeypatch.setattr(renewals, "get_shared_gateway", lambda name: FakeGateway("requires_action"))
+    scheduled = []
+    monkeypatch.setattr(payment_tasks.retry_payment, "apply_async", lambda args, countdown: scheduled.append(args))
+
+    payment_tasks.retry_payment(str(failed_renewal))
+
+    payment = db.get(Payment, failed_renewal)
+    assert payment.status == PaymentStatus.PENDING
+    assert payment.retry_count == 2
+    assert scheduled == [[str(failed_renewal)]]
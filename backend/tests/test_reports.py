@@ -0,0 +1,41 @@
+from datetime import date, datetime, timedelta
+from app.core.config import settings
+from app.models.class_model import BookingStatus
+from app.models.membership import MembershipStatus
+from app.services.reports import generate_performance_report
+from tests import factories
+
+
+def test_performance_report_counts_attendance_and_cancellations(db, organization):
+    members = [factories.make_member(db, organization) for _ in range(3)]
+    yesterday = date.today() - timedelta(days=1)
+    factories.make_booking(db, members[0], yesterday, status=BookingStatus.ATTENDED)
+    factories.make_booking(db, members[1], yesterday, status=BookingStatus.NO_SHOW)
+    factories.make_booking(db, members[2], yesterday, status=BookingStatus.ATTENDED)
+    for member in members[:2]:
+        factories.make_membership(db, member, created_at=datetime.utcnow() - timedelta(days=60))
+    factories.make_membership(
+        db, members[2], status=MembershipStatus.CANCELLED, cancellation_date=yesterday,
+        created_at=datetime.utcnow() - timedelta(days=60)
+    )
+
+    summary = generate_performance_report(
+        organization.id, datetime.utcnow() - timedelta(days=7), datetime.utcnow(), db
+    )["summary"]
+
+    assert summary["class_performance"]["total_bookings"] == 3
+    assert summary["class_performance"]["total_attended"] == 2
+    assert summary["class_performance"]["total_no_shows"] == 1
+    assert summary["membership_retention"]["cancelled_in_period"] == 1
+
+
+def test_inline_generation_rejects_long_ranges(client):
+    end = datetime(2026, 6, 30)
+    start = end - timedelta(days=settings.REPORT_INLINE_MAX_DAYS + 1)
+
+    response = client.post("/api/v1/reports/generate", params={
+        "report_type": "attendance", "start_date": start.isoformat(), "end_date": end.isoformat()
+    })
+
+    assert response.status_code == 400
+    assert "POST /reports" in response.json()["detail"]
@@ -0,0 +1,32 @@
+from datetime import date, datetime, time, timedelta
+from app.services.reports import attendance_details, generate_attendance_report
+from app.services.rollups import refresh_rollups
+from tests import factories
+
+
+def test_member_analytics_reads_membership_rollups(client, db, organization):
+    member = factories.make_member(db, organization)
+    factories.make_membership(db, member, start_date=date.today() - timedelta(days=10))
+    today_member = factories.make_member(db, organization)
+    factories.make_membership(db, today_member, start_date=date.today())
+    refresh_rollups(db, date.today() - timedelta(days=30), date.today() - timedelta(days=1), organization.id)
+
+    response = client.get("/api/v1/analytics/members")
+
+    assert response.status_code == 200
+    trend = response.json()["membership_trend"]
+    assert sum(month["started"] for month in trend) == 2
+
+
+def test_attendance_details_cover_the_summary_days(db, organization):
+    member = factories.make_member(db, organization)
+    day = date.today() - timedelta(days=2)
+    # Late on the last day: inside the org-local day, after the end_date timestamp
+    for moment in (datetime.combine(day, time(9)), datetime.combine(day, time(23, 30))):
+        factories.make_check_in(db, member, moment)
+    start, end = datetime.combine(day, time(0)), datetime.combine(day, time(12))
+
+    summary = generate_attendance_report(organization.id, start, end, db, "UTC")["summary"]
+    rows = db.execute(attendance_details(organization.id, start, end, "UTC")).all()
+
+    assert summary["total_checkins"] == len(rows) == 2
@@ -0,0 +1,44 @@
+from datetime import date, datetime, timedelta
+from sqlalchemy import func, select, text
+from app.core.time_windows import days_window, day_window, month_window, to_utc
+from app.db.query_plans import explain_plan, plan_nodes
+from app.models.checkin import CheckIn
+
+
+def test_day_window_is_local_midnight_to_midnight_in_utc():
+    window = day_window(date(2026, 3, 10), "Asia/Kolkata")
+
+    assert window.start == datetime(2026, 3, 9, 18, 30)
+    assert window.end == datetime(2026, 3, 10, 18, 30)
+    assert datetime(2026, 3, 10, 18, 29) in window
+    assert datetime(2026, 3, 10, 18, 30) not in window
+
+
+def test_windows_follow_daylight_saving_changes():
+    spring = day_window(date(2026, 3, 8), "America/New_York")
+    autumn = day_window(date(2026, 11, 1), "America/New_York")
+
+    assert spring.end - spring.start == timedelta(hours=23)
+    assert autumn.end - autumn.start == timedelta(hours=25)
+
+
+def test_month_window_covers_the_whole_local_month():
+    window = month_window(date(2026, 2, 14), "UTC")
+
+    assert (window.start, window.end) == (datetime(2026, 2, 1), datetime(2026, 3, 1))
+    assert days_window(date(2026, 2, 1), date(2026, 2, 28)).end == to_utc(date(2026, 3, 1))
+
+
+def index_conditions(db, statement) -> str:
+    return " ".join(node.get("Index Cond", "") for node in plan_nodes(explain_plan(db, statement)))
+
+
+def test_window_predicate_is_an_index_condition_on_check_in_time(db):
+    # Force the planner off sequential scans so the plan shows which predicates an index can serve
+    db.execute(text("SET LOCAL enable_seqscan = off"))
+    count = select(func.count()).select_from(CheckIn)
+    window = day_window(date.today(), "Asia/Kolkata")
+
+    assert "check_in_time >=" in index_conditions(db, count.where(window.clause(CheckIn.check_in_time)))
+    # The cast it replaced can only ever be a filter
+    assert "check_in_time" not in index_conditions(db, count.where(func.date(CheckIn.check_in_time) == date.today()))